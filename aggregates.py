@@ -0,0 +1,221 @@
+"""
+In-stream fact aggregates for data_generator.py.
+
+While a worker generates a day it folds the day's calls into two summaries:
+- by day x hour x queue : every call, keyed by the hour of call_timestamp
+- by day x agent        : answered calls, keyed by the answering agent
+
+Every cell holds the same measures: counts (calls, answered, transferred, held,
+surveyed), sums and maxima of wait / talk / hold seconds, histograms of wait / talk /
+hold and the survey rating distribution. Seconds, histograms and ratings cover
+answered calls only (unanswered calls carry zeros). The wait buckets end on the
+service_levels.csv target_seconds (20 / 30 / 45), so SLA attainment for a queue is
+the sum of its wait buckets up to the target over answered.
+
+A day of calls from ENGINE = "numpy" (a sinks.Columns batch) is folded column-wise with
+NumPy instead of row by row; the cells come out the same.
+
+Workers return their Aggregates with the task result; the parent merges them and
+writes summary_by_day_hour_queue.csv and summary_by_day_agent.csv. Cells are written
+in key order, so the files do not depend on the worker count.
+"""
+import os
+import csv
+from bisect import bisect_left
+
+# histogram upper bounds (seconds, inclusive); one more bucket catches everything above
+WAIT_BOUNDS = (10, 20, 30, 45, 60, 120, 300)
+TALK_BOUNDS = (60, 180, 300, 600, 1200, 1800)
+HOLD_BOUNDS = (0, 30, 60, 120, 300)
+RATINGS = (1, 2, 3, 4, 5)
+
+HOUR_QUEUE_FILE = "summary_by_day_hour_queue.csv"
+AGENT_FILE = "summary_by_day_agent.csv"
+
+
+def _buckets(name, bounds):
+    return [f"{name}_le_{b}" for b in bounds] + [f"{name}_gt_{bounds[-1]}"]
+
+
+MEASURES = (["calls", "answered", "transferred", "held", "surveyed",
+             "wait_seconds_sum", "wait_seconds_max", "talk_seconds_sum", "talk_seconds_max",
+             "hold_seconds_sum", "hold_seconds_max", "rating_sum"]
+            + _buckets("wait", WAIT_BOUNDS) + _buckets("talk", TALK_BOUNDS) + _buckets("hold", HOLD_BOUNDS)
+            + [f"rating_{r}" for r in RATINGS])
+_COL = {m: i for i, m in enumerate(MEASURES)}
+CALLS, ANSWERED, TRANSFERRED, HELD, SURVEYED = (_COL[m] for m in ("calls", "answered", "transferred", "held", "surveyed"))
+WAIT_SUM, WAIT_MAX, TALK_SUM, TALK_MAX, HOLD_SUM, HOLD_MAX, RATING_SUM = (
+    _COL[m] for m in ("wait_seconds_sum", "wait_seconds_max", "talk_seconds_sum", "talk_seconds_max",
+                      "hold_seconds_sum", "hold_seconds_max", "rating_sum"))
+WAIT_HIST = _COL[f"wait_le_{WAIT_BOUNDS[0]}"]
+TALK_HIST = _COL[f"talk_le_{TALK_BOUNDS[0]}"]
+HOLD_HIST = _COL[f"hold_le_{HOLD_BOUNDS[0]}"]
+RATING_HIST = _COL["rating_1"] - 1  # rating r -> RATING_HIST + r
+MAX_COLUMNS = (WAIT_MAX, TALK_MAX, HOLD_MAX)
+# survey_rating cell -> its histogram column
+RATING_COLUMN = {"": 0, **{str(r): RATING_HIST + r for r in RATINGS}}
+
+
+def _finish(cell):
+    # the day loop only fills sums, maxima and buckets; the counts follow from the buckets
+    answered = sum(cell[WAIT_HIST:WAIT_HIST + len(WAIT_BOUNDS) + 1])
+    cell[ANSWERED] = answered
+    cell[HELD] = answered - cell[HOLD_HIST]  # hold_le_0 = not held
+    cell[SURVEYED] = sum(cell[RATING_HIST + r] for r in RATINGS)
+    cell[RATING_SUM] = sum(r * cell[RATING_HIST + r] for r in RATINGS)
+    return cell
+
+
+def _combine(cells, key, cell):
+    cur = cells.get(key)
+    if cur is None:
+        cells[key] = cell
+        return
+    for i, v in enumerate(cell):
+        cur[i] = max(cur[i], v) if i in MAX_COLUMNS else cur[i] + v
+
+
+def _int_column(column):
+    """A column as an int64 NumPy array; blank cells ("", or 0 in sinks.Columns blanks) are 0."""
+    import numpy as np
+    values = np.asarray(column)
+    if values.dtype.kind in "iub":
+        return values.astype(np.int64, copy=False)
+    return np.where(values == "", "0", values).astype(np.int64)
+
+
+def _column_cells(keys, answered, wait, talk, hold, transferred, rating):
+    """
+    (distinct keys, cells) of one day from NumPy columns, one cell row per key in key order,
+    filled as add_calls fills them: every call counts, the other measures cover answered calls.
+    """
+    import numpy as np
+    uniq, group = np.unique(keys, return_inverse=True)
+    cells = np.zeros((len(uniq), len(MEASURES)), dtype=np.int64)
+    cells[:, CALLS] = np.bincount(group, minlength=len(uniq))
+    g = group[answered]
+    for values, total, top, hist, bounds in ((wait[answered], WAIT_SUM, WAIT_MAX, WAIT_HIST, WAIT_BOUNDS),
+                                             (talk[answered], TALK_SUM, TALK_MAX, TALK_HIST, TALK_BOUNDS),
+                                             (hold[answered], HOLD_SUM, HOLD_MAX, HOLD_HIST, HOLD_BOUNDS)):
+        np.add.at(cells, (g, total), values)
+        np.maximum.at(cells, (g, top), values)
+        # bisect_left over the bounds, as in add_calls
+        np.add.at(cells, (g, hist + np.searchsorted(bounds, values, side="left")), 1)
+    r = rating[answered]
+    rated = r > 0
+    np.add.at(cells, (g[rated], RATING_HIST + r[rated]), 1)
+    np.add.at(cells, (g, TRANSFERRED), transferred[answered])
+    return uniq.tolist(), cells.tolist()
+
+
+class Aggregates:
+    """day x hour x queue and day x agent cells ({key: [measure, ...]}) of the calls seen so far."""
+
+    def __init__(self):
+        self.by_hour_queue = {}
+        self.by_agent = {}
+
+    def add_calls(self, day, calls):
+        """Fold one day of call rows (as generate_day returns them, either engine) into the cells."""
+        if hasattr(calls, "columns"):
+            return self.add_columns(day, calls.columns)
+        width = len(MEASURES)
+        rating_column = RATING_COLUMN
+        # keyed by the raw cells while in the loop; converted once per day below
+        hour_queue, agents = {}, {}
+        for row in calls:
+            key = (row[1][11:13], row[2])
+            cell = hour_queue.get(key)
+            if cell is None:
+                cell = hour_queue[key] = [0] * width
+            cell[CALLS] += 1
+            if not row[5]:
+                continue
+            agent = agents.get(row[9])
+            if agent is None:
+                agent = agents[row[9]] = [0] * width
+            wait, talk, hold = row[6], row[7], row[8]
+            wait_bucket = WAIT_HIST + bisect_left(WAIT_BOUNDS, wait)
+            talk_bucket = TALK_HIST + bisect_left(TALK_BOUNDS, talk)
+            hold_bucket = HOLD_HIST + bisect_left(HOLD_BOUNDS, hold)
+            rating = rating_column[row[15]]
+            for c in (cell, agent):
+                c[WAIT_SUM] += wait
+                c[TALK_SUM] += talk
+                c[HOLD_SUM] += hold
+                if wait > c[WAIT_MAX]:
+                    c[WAIT_MAX] = wait
+                if talk > c[TALK_MAX]:
+                    c[TALK_MAX] = talk
+                if hold > c[HOLD_MAX]:
+                    c[HOLD_MAX] = hold
+                c[wait_bucket] += 1
+                c[talk_bucket] += 1
+                c[hold_bucket] += 1
+                if rating:
+                    c[rating] += 1
+            if row[10] != "":
+                cell[TRANSFERRED] += 1
+                agent[TRANSFERRED] += 1
+
+        d = day.isoformat()
+        for (hour, queue), cell in hour_queue.items():
+            _combine(self.by_hour_queue, (d, int(hour), int(queue)), _finish(cell))
+        for agent_id, cell in agents.items():
+            _finish(cell)
+            cell[CALLS] = cell[ANSWERED]
+            _combine(self.by_agent, (d, int(agent_id)), cell)
+
+    def add_columns(self, day, columns):
+        """add_calls for a day of calls as columns (calls_by_month column order), folded with NumPy."""
+        import numpy as np
+        ts = np.asarray(columns[1], dtype="U19")
+        # hour of each "YYYY-MM-DDTHH:MM:SS": characters 11 and 12 as UCS-4 code points
+        digits = ts.view(np.uint32).reshape(len(ts), 19)[:, 11:13].astype(np.int64) - ord("0")
+        hour = digits[:, 0] * 10 + digits[:, 1]
+        queue = _int_column(columns[2])
+        answered = _int_column(columns[5]) != 0
+        wait, talk, hold = (_int_column(columns[i]) for i in (6, 7, 8))
+        transferred = (_int_column(columns[10]) != 0).astype(np.int64)
+        rating = _int_column(columns[15])
+
+        d = day.isoformat()
+        keys, cells = _column_cells((hour << 32) | queue, answered, wait, talk, hold, transferred, rating)
+        for key, cell in zip(keys, cells):
+            _combine(self.by_hour_queue, (d, key >> 32, key & 0xFFFFFFFF), _finish(cell))
+        agent = _int_column(columns[9])[answered]
+        everyone = np.ones(len(agent), dtype=bool)
+        keys, cells = _column_cells(agent, everyone, wait[answered], talk[answered], hold[answered],
+                                    transferred[answered], rating[answered])
+        for agent_id, cell in zip(keys, cells):
+            _finish(cell)
+            cell[CALLS] = cell[ANSWERED]
+            _combine(self.by_agent, (d, agent_id), cell)
+
+    def merge(self, other):
+        """Add another worker's cells; days usually do not overlap, but shared keys are combined."""
+        for mine, theirs in ((self.by_hour_queue, other.by_hour_queue), (self.by_agent, other.by_agent)):
+            for key, cell in theirs.items():
+                _combine(mine, key, list(cell))
+        return self
+
+    def write(self, directory):
+        """Writes both summaries into directory; returns their paths."""
+        paths = [os.path.join(directory, HOUR_QUEUE_FILE), os.path.join(directory, AGENT_FILE)]
+        for path, key_cols, cells in ((paths[0], ["date", "hour", "queue_id"], self.by_hour_queue),
+                                      (paths[1], ["date", "agent_id"], self.by_agent)):
+            with open(path, "w", newline='', encoding='utf-8') as f:
+                w = csv.writer(f)
+                w.writerow(key_cols + MEASURES)
+                for key in sorted(cells):
+                    w.writerow(list(key) + cells[key])
+        return paths
+
+
+def merge_all(parts):
+    """One Aggregates from the workers' parts (None entries are skipped)."""
+    out = Aggregates()
+    for part in parts:
+        if part is not None:
+            out.merge(part)
+    return out
@@ -0,0 +1,260 @@
+"""
+Benchmark harness for data_generator.py.
+
+Every cell of the matrix (engine x backend x worker count) runs reduced-size,
+seeded generations in fresh subprocesses and records, per table, rows/sec and
+bytes/sec over the stage time the generator reports in run_report.json, plus
+total wall time, CPU seconds and CPU utilization of the run (the generator and
+its worker processes, start-up included) and peak RSS (largest single process).
+
+Stages are run separately so their tables get their own timings:
+- customers, shifts : one reference table per run, timed by its writer
+- facts             : calls, tickets, recordings, ivr_paths, call_events; these are
+                      generated together, so they share the fact pool's wall time
+
+A backend is an output format with an optional compression, e.g. csv, csv+gzip,
+csv+zstd, parquet, load.
+
+Usage:
+    python benchmark.py                                   # default matrix -> benchmark_results.json
+    python benchmark.py --workers 1,4 --backends csv,parquet --engines python,numpy
+    python benchmark.py --save-baseline baseline.json     # store a baseline
+    python benchmark.py --compare baseline.json           # flag regressions, exit 1 if any
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+from sinks import TABLES as FACT_TABLES, month_files, open_text
+
+GENERATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_generator.py")
+RUN_REPORT = "run_report.json"  # data_generator.RUN_REPORT, written into the output directory
+
+# reduced-size defaults: three months so that several month workers run in parallel
+SCALE_FACTOR = 0.05
+START_DATE = "2025-01-01"
+END_DATE = "2025-03-31"
+SEED = 42
+REPEAT = 1
+
+WORKERS = (1, 4)
+BACKENDS = ("csv", "csv+gzip", "parquet")
+ENGINES = ("python",)
+
+STAGES = {
+    "customers": ("customers",),
+    "shifts": ("shifts",),
+    "facts": tuple(FACT_TABLES),
+}
+
+# relative slowdown (rows/sec) or growth (peak RSS) reported as a regression
+THRESHOLD = 0.10
+
+
+def parse_backend(backend):
+    fmt, _, compression = backend.partition("+")
+    return fmt, compression or "none"
+
+
+def _wait(proc):
+    """Wait for a child; rusage covers the child and its reaped worker processes (POSIX only)."""
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        return usage.ru_utime + usage.ru_stime, rss
+    proc.wait()
+    return None, None
+
+
+def count_rows(path, fmt):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    with open_text(path) as f:
+        return sum(1 for _ in f) - 1
+
+
+def table_files(base_dir, table, fmt, compression):
+    if table not in FACT_TABLES:
+        return [os.path.join(base_dir, f"{table}.csv")]
+    if fmt == "load":
+        from bulk_load import FACT_TABLES as LOAD_TABLES, load_table_files
+        return load_table_files(base_dir, LOAD_TABLES[table]) if table in LOAD_TABLES else []
+    return month_files(base_dir, table, fmt, compression)
+
+
+def stage_seconds(run_report, table):
+    """
+    The generator's own time for a table from its run report: the reference table's writer,
+    or the wall time of the fact pool (the fact tables are generated together). Interpreter
+    start-up, imports and the other tables are not included.
+    """
+    if table in FACT_TABLES:
+        return sum(p["wall_seconds"] for p in run_report["pools"].values()) or None
+    stage = run_report["reference_stages"].get(table)
+    return stage["seconds"] if stage else None
+
+
+def run_stage(stage, engine, backend, workers, args):
+    """Run one generation into a temp dir; returns the measurements of the stage."""
+    fmt, compression = parse_backend(backend)
+    tables = STAGES[stage]
+    best = None
+    for _ in range(args.repeat):
+        out = tempfile.mkdtemp(prefix="dg_bench_")
+        try:
+            cmd = [sys.executable, GENERATOR, "-o", out, "-s", str(args.scale_factor),
+                   "--start-date", args.start_date, "--end-date", args.end_date,
+                   "--tables", ",".join(tables), "--seed", str(args.seed), "--workers", str(workers),
+                   "--engine", engine, "--format", fmt, "--compression", compression]
+            # stderr goes to a file: a pipe nobody reads during wait4 blocks the child once it is full
+            with tempfile.TemporaryFile() as stderr:
+                t0 = time.perf_counter()
+                proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=stderr)
+                cpu, rss = _wait(proc)
+                wall = time.perf_counter() - t0
+                if proc.returncode != 0:
+                    stderr.seek(0)
+                    raise RuntimeError(f"{' '.join(cmd)} failed:\n{stderr.read().decode(errors='replace')}")
+            with open(os.path.join(out, RUN_REPORT), encoding="utf-8") as f:
+                run_report = json.load(f)
+
+            per_table = {}
+            for t in tables:
+                files = table_files(out, t, fmt, compression)
+                if not files:
+                    continue  # e.g. call_events has no DDL table in the load format
+                rows = sum(count_rows(p, fmt) for p in files)
+                size = sum(os.path.getsize(p) for p in files)
+                seconds = stage_seconds(run_report, t) or wall
+                per_table[t] = {"rows": rows, "bytes": size, "seconds": seconds,
+                                "rows_per_sec": rows / seconds, "bytes_per_sec": size / seconds}
+        finally:
+            shutil.rmtree(out, ignore_errors=True)
+
+        result = {
+            "stage": stage, "engine": engine, "backend": backend, "workers": workers,
+            # the whole subprocess (start-up, imports, every table): a total, not a throughput base
+            "wall_seconds": wall, "cpu_seconds": cpu, "peak_rss_bytes": rss,
+            # average busy cores over the run
+            "cpu_utilization": cpu / wall if cpu is not None else None,
+            "tables": per_table,
+        }
+        if best is None or wall < best["wall_seconds"]:
+            best = result
+    return best
+
+
+def run_matrix(args):
+    results = []
+    for engine in args.engines:
+        for backend in args.backends:
+            for workers in args.workers:
+                for stage in args.stages:
+                    r = run_stage(stage, engine, backend, workers, args)
+                    results.append(r)
+                    rows = sum(t["rows"] for t in r["tables"].values())
+                    # the fact tables share one stage time, the reference stages have one table each
+                    seconds = max((t["seconds"] for t in r["tables"].values()), default=0.0)
+                    rss = f"{r['peak_rss_bytes'] / 2**20:,.0f} MB" if r["peak_rss_bytes"] else "n/a"
+                    print(f"[bench] {engine:<6} {backend:<10} workers={workers:<2} {stage:<9} "
+                          f"{r['wall_seconds']:7.2f} s total  {seconds:7.2f} s stage  "
+                          f"{rows / seconds if seconds else 0.0:>12,.0f} rows/s  rss {rss}")
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "config": {"scale_factor": args.scale_factor, "start_date": args.start_date, "end_date": args.end_date,
+                   "seed": args.seed, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def _metrics(report):
+    """(engine, backend, workers, table or "stage <name>") -> metrics compared between runs."""
+    out = {}
+    for r in report["results"]:
+        key = (r["engine"], r["backend"], r["workers"])
+        for t, m in r["tables"].items():
+            # bytes/sec moves with rows/sec for a fixed seed, so only rows/sec is compared
+            out[key + (t,)] = {"rows_per_sec": m["rows_per_sec"]}
+        if r["peak_rss_bytes"]:
+            out[key + (f"stage {r['stage']}",)] = {"peak_rss_bytes": r["peak_rss_bytes"]}
+    return out
+
+
+def compare(report, baseline, threshold=THRESHOLD):
+    """Regressions of report against baseline: slower throughput or higher peak RSS than threshold allows."""
+    if baseline.get("config") != report.get("config"):
+        print("[bench] warning: baseline was recorded with a different config", baseline.get("config"))
+    current, base = _metrics(report), _metrics(baseline)
+    regressions = []
+    for key in sorted(set(current) & set(base), key=str):
+        for metric, value in current[key].items():
+            old = base[key].get(metric)
+            if not old:
+                continue
+            change = value / old - 1
+            worse = change > threshold if metric == "peak_rss_bytes" else change < -threshold
+            if worse:
+                regressions.append({"engine": key[0], "backend": key[1], "workers": key[2], "table": key[3],
+                                    "metric": metric, "baseline": old, "current": value, "change": change})
+    return regressions
+
+
+def parse_args(argv=None):
+    import argparse
+    split = lambda s: tuple(x.strip() for x in s.split(",") if x.strip())
+    p = argparse.ArgumentParser(description="Benchmark data_generator.py throughput.")
+    p.add_argument("-s", "--scale-factor", type=float, default=SCALE_FACTOR)
+    p.add_argument("--start-date", default=START_DATE)
+    p.add_argument("--end-date", default=END_DATE)
+    p.add_argument("--seed", type=int, default=SEED)
+    p.add_argument("--repeat", type=int, default=REPEAT, help="runs per cell, the fastest is kept")
+    p.add_argument("--workers", type=lambda s: tuple(int(w) for w in split(s)), default=WORKERS,
+                   help="comma separated worker counts (default: %(default)s)")
+    p.add_argument("--backends", type=split, default=BACKENDS,
+                   help="comma separated <format>[+<compression>] (default: %(default)s)")
+    p.add_argument("--engines", type=split, default=ENGINES)
+    p.add_argument("--stages", type=split, default=tuple(STAGES), help=f"any of {', '.join(STAGES)}")
+    p.add_argument("-o", "--output", default="benchmark_results.json", help="results file")
+    p.add_argument("--save-baseline", metavar="PATH", help="also store the results as a baseline")
+    p.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored baseline")
+    p.add_argument("--threshold", type=float, default=THRESHOLD,
+                   help="relative change reported as a regression (default: %(default)s)")
+    args = p.parse_args(argv)
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        p.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_matrix(args)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.threshold)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[bench] results -> {path}")
+    if args.compare:
+        for r in report["regressions"]:
+            print(f"[REGRESSION] {r['engine']} {r['backend']} workers={r['workers']} {r['table']} "
+                  f"{r['metric']}: {r['baseline']:,.0f} -> {r['current']:,.0f} ({r['change']:+.1%})")
+        if report["regressions"]:
+            return 1
+        print(f"[bench] no regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Bulk-load support aligned to SQL Script/DDL Code.sql.
+
+- parse_ddl() reads the CREATE TABLE statements, so column order, types, primary
+  keys and foreign keys come straight from the DDL.
+- LoadMonthSink (OUTPUT_FORMAT = "load") writes the fact tables in exact table
+  column order under out_dir/load/<Table>/<Month>.csv. write_load_layout() adds the
+  dimension tables, one bcp format file per table and a bulk_insert.sql script.
+  call_events has no table in the DDL and no load file: data_generator.py warns and
+  leaves it out of --format load runs.
+- load_dataset() streams the generated CSVs into any DB-API connection with batched
+  executemany, FK-safe table order and primary-key indexes created after the load.
+
+    import sqlite3, bulk_load
+    conn = sqlite3.connect("call_center.db")
+    bulk_load.load_dataset(conn, out_dir, batch_size=50000)
+"""
+import io
+import os
+import re
+import csv
+from operator import itemgetter
+from time import perf_counter
+
+from sinks import (COMPRESSIONS, TABLE_LAYOUT, Columns, month_files, month_sort_key, open_for_append, open_text,
+                   sync_sizes, write_rows)
+
+DDL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "SQL Script", "DDL Code.sql")
+LOAD_DIR = "load"
+
+# DDL table -> generated source: a dimension CSV file name or a fact table (see sinks.TABLE_LAYOUT)
+SOURCES = {
+    "Customers": "customers.csv",
+    "Agents": "agents.csv",
+    "Queues": "queues.csv",
+    "Skills": "skills.csv",
+    "Agent_Skills": "agent_skills.csv",
+    "Calls": "calls",
+    "Shifts": "shifts.csv",
+    "Recordings": "recordings",
+    "Tickets": "tickets",
+    "IVR_Menu_Nodes": "ivr_menu_nodes.csv",
+    "IVR_Paths": "ivr_paths",
+    "Service_Levels": "service_levels.csv",
+    "Skill_Proficiency_History": "skill_history.csv",
+    "Agent_Workload": "agent_workload.csv",
+}
+FACT_TABLES = {src: table for table, src in SOURCES.items() if src in TABLE_LAYOUT}
+
+# DDL column -> generated column where the names differ by more than case / a trailing "_"
+RENAMES = {
+    ("Customers", "phone_number"): "phone",
+    ("Agent_Skills", "proficiency_level"): "proficiency",
+    ("Calls", "call_time"): "call_timestamp",
+    ("Shifts", "shift_start"): "start_time",
+    ("Shifts", "shift_end"): "end_time",
+    ("Service_Levels", "target_time_seconds"): "target_seconds",
+    ("Skill_Proficiency_History", "proficiency_level"): "proficiency",
+}
+
+_CREATE_RE = re.compile(r"CREATE TABLE (\w+)\s*\((.*?)\n\);", re.S)
+_COLUMN_RE = re.compile(r"^(\w+)\s+(\w+(?:\s*\([^)]*\))?)(.*)$")
+_FK_RE = re.compile(r"FOREIGN KEY\s*\((\w+)\)\s*REFERENCES\s+(\w+)\s*\((\w+)\)", re.I)
+_PK_RE = re.compile(r"PRIMARY KEY\s*\(([^)]*)\)", re.I)
+
+
+def parse_ddl(path=DDL_PATH):
+    """
+    Return {table: {"columns": [(name, type)], "primary_key": [...], "foreign_keys": [(col, ref_table)],
+    "not_null": [...]}}.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = re.sub(r"/\*.*?\*/", "", f.read(), flags=re.S)
+    tables = {}
+    for name, body in _CREATE_RE.findall(text):
+        info = {"columns": [], "primary_key": [], "foreign_keys": [], "not_null": []}
+        for line in body.splitlines():
+            line = line.split("--", 1)[0].strip().rstrip(",").strip()
+            if not line:
+                continue
+            # a missing comma can leave a FOREIGN KEY on the same line as a column
+            fk = _FK_RE.search(line)
+            if fk:
+                info["foreign_keys"].append((fk.group(1), fk.group(2)))
+                line = line[:fk.start()].strip()
+            pk = _PK_RE.match(line)
+            if pk:
+                info["primary_key"] = [c.strip() for c in pk.group(1).split(",")]
+                continue
+            m = _COLUMN_RE.match(line)
+            if m:
+                info["columns"].append((m.group(1), m.group(2).replace(" ", "")))
+                if "PRIMARY KEY" in m.group(3).upper():
+                    info["primary_key"] = [m.group(1)]
+                if "NOT NULL" in m.group(3).upper() or "PRIMARY KEY" in m.group(3).upper():
+                    info["not_null"].append(m.group(1))
+        info["not_null"] += [c for c in info["primary_key"] if c not in info["not_null"]]
+        tables[name] = info
+    return tables
+
+
+def load_order(ddl):
+    """Tables ordered so every FK target is loaded before the tables referencing it."""
+    ordered, seen = [], set()
+
+    def visit(t):
+        if t in seen:
+            return
+        seen.add(t)
+        for _, ref in ddl[t]["foreign_keys"]:
+            if ref != t and ref in ddl:
+                visit(ref)
+        ordered.append(t)
+
+    for t in ddl:
+        visit(t)
+    return ordered
+
+
+def column_indexes(table, ddl_columns, header):
+    """Positions in a generated header row for each DDL column, in DDL order."""
+    lookup = {h.lower(): i for i, h in enumerate(header)}
+    idx = []
+    for col in ddl_columns:
+        src = RENAMES.get((table, col), col)
+        for key in (col.lower(), src.lower(), col.lower().rstrip("_")):
+            if key in lookup:
+                idx.append(lookup[key])
+                break
+        else:
+            raise KeyError(f"{table}.{col} has no matching column in {header}")
+    return idx
+
+
+def _reorder(idx):
+    get = itemgetter(*idx)
+    return lambda row: get(row) if len(idx) > 1 else (get(row),)
+
+
+# -------------------------
+# "load" output format
+# -------------------------
+def load_month_paths(base_dir, month_name):
+    return {t: os.path.join(base_dir, LOAD_DIR, FACT_TABLES[t], f"{month_name}.csv")
+            for t in TABLE_LAYOUT if t in FACT_TABLES}
+
+
+class LoadMonthSink:
+    """Fact rows in exact DDL column order with DDL header names, ready for BULK INSERT."""
+
+    def __init__(self, paths, ddl=None, offsets=None):
+        ddl = ddl or parse_ddl()
+        self.tables = list(paths)
+        self.timings = {"format": 0.0, "write": 0.0}
+        self.days = 0
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.files = {}
+        self.indexes = {}
+        self.reorder = {}
+        for t, path in paths.items():
+            table = FACT_TABLES[t]
+            cols = [c for c, _ in ddl[table]["columns"]]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open_for_append(path, offsets[t] if offsets else None)
+            self.files[t] = f
+            if not offsets:
+                csv.writer(f).writerow(cols)
+            self.indexes[t] = column_indexes(table, cols, TABLE_LAYOUT[t][1])
+            self.reorder[t] = _reorder(self.indexes[t])
+
+    def write_day(self, tables):
+        for t, f in self.files.items():
+            t0 = perf_counter()
+            rows = tables[t]
+            rows = rows.select(self.indexes[t]) if isinstance(rows, Columns) else map(self.reorder[t], rows)
+            write_rows(self.writer, self.buffer, rows)
+            text = self.buffer.getvalue()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            t1 = perf_counter()
+            f.write(text)
+            f.flush()
+            self.timings["format"] += t1 - t0
+            self.timings["write"] += perf_counter() - t1
+        self.days += 1
+
+    def checkpoint(self):
+        t0 = perf_counter()
+        sizes = sync_sizes(self.files)
+        self.timings["write"] += perf_counter() - t0
+        return self.days, sizes
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_table_files(base_dir, table):
+    """Month files of a fact table written with OUTPUT_FORMAT = "load", in chronological order."""
+    table_dir = os.path.join(base_dir, LOAD_DIR, table)
+    if not os.path.isdir(table_dir):
+        return []
+    labels = [f[:-len(".csv")] for f in os.listdir(table_dir) if f.endswith(".csv")]
+    return [os.path.join(table_dir, f"{label}.csv") for label in sorted(labels, key=month_sort_key)]
+
+
+def _format_file(columns):
+    # bcp non-XML format file: every field is character data, comma separated, CRLF rows (csv.writer)
+    lines = ["14.0", str(len(columns))]
+    for i, (name, _) in enumerate(columns, start=1):
+        term = "\\r\\n" if i == len(columns) else ","
+        lines.append(f'{i:<4}SQLCHAR   0   0   "{term}"   {i:<4}{name:<28}""')
+    return "\n".join(lines) + "\n"
+
+
+def write_load_layout(base_dir, ddl=None):
+    """Write dimension load files, bcp format files and bulk_insert.sql under base_dir/load."""
+    ddl = ddl or parse_ddl()
+    load_dir = os.path.join(base_dir, LOAD_DIR)
+    fmt_dir = os.path.join(load_dir, "format")
+    os.makedirs(fmt_dir, exist_ok=True)
+    statements = ["USE CALL_CENTER_DB;", "GO", ""]
+    for table in load_order(ddl):
+        src = SOURCES.get(table)
+        if src is None:
+            continue
+        columns = ddl[table]["columns"]
+        fmt_path = os.path.join(fmt_dir, f"{table}.fmt")
+        with open(fmt_path, "w", encoding="utf-8") as f:
+            f.write(_format_file(columns))
+
+        if src in TABLE_LAYOUT:
+            files = load_table_files(base_dir, table)
+        else:
+            source_path = os.path.join(base_dir, src)
+            if not os.path.exists(source_path):
+                print(f"[load] skipping {table}: {source_path} not found")
+                continue
+            os.makedirs(os.path.join(load_dir, table), exist_ok=True)
+            target = os.path.join(load_dir, table, f"{table}.csv")
+            cols = [c for c, _ in columns]
+            with open(source_path, newline='', encoding='utf-8') as fin, \
+                 open(target, "w", newline='', encoding='utf-8') as fout:
+                reader = csv.reader(fin)
+                reorder = _reorder(column_indexes(table, cols, next(reader)))
+                w = csv.writer(fout)
+                w.writerow(cols)
+                w.writerows(map(reorder, reader))
+            files = [target]
+
+        for path in files:
+            statements.append(
+                f"BULK INSERT {table} FROM '{os.path.abspath(path)}'\n"
+                f"WITH (FORMAT = 'CSV', FIRSTROW = 2, FORMATFILE = '{os.path.abspath(fmt_path)}', TABLOCK, BATCHSIZE = 100000);"
+            )
+        statements.append("GO")
+    with open(os.path.join(load_dir, "bulk_insert.sql"), "w", encoding="utf-8") as f:
+        f.write("\n".join(statements) + "\n")
+
+
+# -------------------------
+# Batched DB-API loader
+# -------------------------
+def _portable_type(sql_type):
+    # VARCHAR(MAX) is SQL Server only
+    return re.sub(r"\(\s*MAX\s*\)", "", sql_type, flags=re.I)
+
+
+def create_tables(conn, ddl, tables):
+    """CREATE TABLE without primary keys; those are added by create_indexes() after the load."""
+    cur = conn.cursor()
+    for table in tables:
+        info = ddl[table]
+        parts = [f"{c} {_portable_type(t)}" for c, t in info["columns"]]
+        parts += [f"FOREIGN KEY ({c}) REFERENCES {ref}" for c, ref in info["foreign_keys"]]
+        cur.execute(f"CREATE TABLE {table} (\n    " + ",\n    ".join(parts) + "\n)")
+    conn.commit()
+
+
+def create_indexes(conn, ddl, tables):
+    cur = conn.cursor()
+    for table in tables:
+        info = ddl[table]
+        if info["primary_key"]:
+            cur.execute(f"CREATE UNIQUE INDEX pk_{table} ON {table} ({', '.join(info['primary_key'])})")
+        for col, _ in info["foreign_keys"]:
+            cur.execute(f"CREATE INDEX ix_{table}_{col} ON {table} ({col})")
+    conn.commit()
+
+
+def source_files(base_dir, table):
+    src = SOURCES[table]
+    if src not in TABLE_LAYOUT:
+        path = os.path.join(base_dir, src)
+        return [path] if os.path.exists(path) else []
+    for compression in COMPRESSIONS:
+        files = month_files(base_dir, src, compression=compression)
+        if files:
+            return files
+    # fall back to files generated with OUTPUT_FORMAT = "load"
+    return load_table_files(base_dir, table)
+
+
+def iter_table_rows(base_dir, table, ddl):
+    """Rows of one DDL table in DDL column order, "" converted to NULL and INT columns to int."""
+    columns = ddl[table]["columns"]
+    is_int = [t.upper() in ("INT", "BIGINT") for _, t in columns]
+    cols = [c for c, _ in columns]
+    for path in source_files(base_dir, table):
+        with open_text(path) as f:
+            reader = csv.reader(f)
+            reorder = _reorder(column_indexes(table, cols, next(reader)))
+            for row in reader:
+                yield tuple(
+                    None if v == "" else (int(v) if as_int else v)
+                    for v, as_int in zip(reorder(row), is_int)
+                )
+
+
+def load_dataset(conn, base_dir, batch_size=10000, create=True, paramstyle="qmark", tables=None):
+    """
+    Load every generated table into a DB-API connection in FK-safe order.
+    create=True creates the tables first (no PKs) and builds PK/FK indexes at the end;
+    use create=False to load into tables created from DDL Code.sql.
+    Returns {table: rows loaded}.
+    """
+    ddl = parse_ddl()
+    order = [t for t in load_order(ddl) if t in SOURCES and (tables is None or t in tables)]
+    order = [t for t in order if source_files(base_dir, t)]
+    if create:
+        create_tables(conn, ddl, order)
+
+    counts = {}
+    cur = conn.cursor()
+    for table in order:
+        n_cols = len(ddl[table]["columns"])
+        marks = ", ".join(["?"] * n_cols if paramstyle == "qmark" else ["%s"] * n_cols)
+        sql = f"INSERT INTO {table} VALUES ({marks})"
+        total = 0
+        batch = []
+        for row in iter_table_rows(base_dir, table, ddl):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cur.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cur.executemany(sql, batch)
+            total += len(batch)
+        conn.commit()
+        counts[table] = total
+        print(f"[load] {table}: {total} rows")
+
+    if create:
+        create_indexes(conn, ddl, order)
+    return counts
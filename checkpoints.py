@@ -0,0 +1,181 @@
+"""
+Checkpoints for crash-resumable runs of data_generator.py (--resume).
+
+- run_manifest.json (out_dir): config hash and seed of the run, the reference tables
+  that are finished (bytes, sha256) and, once the facts are done, every month's files
+  with rows, id ranges, bytes and sha256
+- checkpoints/<month>.json: kept by the month worker; rewritten (temp file + rename)
+  after every day that is on disk, with the day's call id range, rows and id range per
+  table and the file sizes at the end of the last day. When the month's files are
+  closed it records their final sizes and sha256.
+
+Output is deterministic per seed, so a resumed month that cuts its files back to the
+last checkpointed day and continues from the next one writes the same bytes as an
+uninterrupted run.
+"""
+import os
+import json
+import pickle
+import hashlib
+
+MANIFEST_FILE = "run_manifest.json"
+CHECKPOINT_DIR = "checkpoints"
+# settings that do not change the output; a run may be resumed with different values
+RESUME_IGNORED_KEYS = ("out_dir", "MAX_WORKERS", "EXECUTION_MODE", "COMPRESSION_THREADS", "WRITER_QUEUE_DEPTH",
+                       "PROFILE_INTERVAL")
+
+
+def config_hash(config):
+    cfg = {k: v for k, v in config.items() if k not in RESUME_IGNORED_KEYS}
+    return hashlib.sha256(json.dumps(cfg, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def read_json(path):
+    """Parsed JSON, or None if the file is missing or was cut short."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_entry(path):
+    return {"bytes": os.path.getsize(path), "sha256": file_sha256(path)}
+
+
+def file_matches(path, entry, verify=True):
+    """path still has the recorded size (and, with verify, checksum)."""
+    if entry is None or not os.path.exists(path) or os.path.getsize(path) != entry["bytes"]:
+        return False
+    return not verify or file_sha256(path) == entry["sha256"]
+
+
+def day_entry(day, first_call_id, calls_per_day, tables):
+    """One day of a month checkpoint: call id range, rows and first / last id per table."""
+    return {
+        "day": day.isoformat(),
+        "first_call_id": first_call_id,
+        "last_call_id": first_call_id + calls_per_day - 1,
+        "tables": {t: {"rows": len(rows), "first_id": int(rows[0][0]) if rows else None,
+                       "last_id": int(rows[-1][0]) if rows else None}
+                   for t, rows in tables.items()},
+    }
+
+
+class MonthCheckpoint:
+    """The checkpoint file of one month worker."""
+
+    def __init__(self, path, month, run_hash, data=None):
+        self.path = path
+        self.data = data or {"month": month, "config_hash": run_hash, "days": [], "sizes": None, "files": None}
+        # days generated in this session that the sink has not reported on disk yet
+        self.pending = []
+        self.synced = 0
+
+    @classmethod
+    def open(cls, path, month, run_hash, resume):
+        """The month's checkpoint when resuming and it belongs to this config, else a new one."""
+        data = read_json(path) if resume else None
+        if data is not None and data.get("config_hash") != run_hash:
+            data = None
+        return cls(path, month, run_hash, data)
+
+    @property
+    def days(self):
+        return self.data["days"]
+
+    def is_complete(self, paths, verify=True):
+        files = self.data["files"]
+        return files is not None and set(files) == set(paths) and all(
+            file_matches(p, files[t], verify) for t, p in paths.items())
+
+    def resume_sizes(self, paths):
+        """File sizes to continue from, or None to start the month over (nothing usable on disk)."""
+        sizes = self.data["sizes"]
+        if not self.days or sizes is None or set(sizes) != set(paths):
+            return None
+        if any(not os.path.exists(p) or os.path.getsize(p) < sizes[t] for t, p in paths.items()):
+            return None
+        return sizes
+
+    def restart(self):
+        self.data.update(days=[], sizes=None, files=None)
+        self.save()
+
+    def add_day(self, entry, on_disk):
+        """entry: day_entry() of the day just written; on_disk: the sink's checkpoint()."""
+        self.pending.append(entry)
+        days, sizes = on_disk
+        if sizes is None or days <= self.synced:
+            return
+        done = days - self.synced
+        self.days.extend(self.pending[:done])
+        del self.pending[:done]
+        self.synced = days
+        self.data["sizes"] = sizes
+        self.save()
+
+    def finish(self, paths, aggregates=None):
+        """Called after the sink is closed: every day is on disk; record sizes and checksums."""
+        self.days.extend(self.pending)
+        self.pending = []
+        self.data["files"] = {t: file_entry(p) for t, p in paths.items()}
+        self.data["sizes"] = {t: e["bytes"] for t, e in self.data["files"].items()}
+        if aggregates is not None:
+            with open(self.aggregates_path(), "wb") as f:
+                pickle.dump(aggregates, f)
+        self.save()
+
+    def aggregates_path(self):
+        return os.path.splitext(self.path)[0] + ".aggregates.pickle"
+
+    def load_aggregates(self):
+        try:
+            with open(self.aggregates_path(), "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def save(self):
+        write_json(self.path, self.data)
+
+    def summary(self):
+        """Rows, id ranges, bytes and sha256 per table, for the run manifest."""
+        tables = {}
+        for day in self.days:
+            for t, e in day["tables"].items():
+                s = tables.setdefault(t, {"rows": 0, "first_id": None, "last_id": None})
+                s["rows"] += e["rows"]
+                if e["first_id"] is not None:
+                    s["first_id"] = e["first_id"] if s["first_id"] is None else min(s["first_id"], e["first_id"])
+                    s["last_id"] = e["last_id"] if s["last_id"] is None else max(s["last_id"], e["last_id"])
+        for t, f in (self.data["files"] or {}).items():
+            tables.setdefault(t, {}).update(f)
+        return {"days": len(self.days),
+                "first_call_id": self.days[0]["first_call_id"] if self.days else None,
+                "last_call_id": self.days[-1]["last_call_id"] if self.days else None,
+                "tables": tables}
+
+
+def new_manifest(run_hash, seed, config):
+    return {"config_hash": run_hash, "seed": seed,
+            "config": {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v)
+                       for k, v in config.items()},
+            "status": "running", "reference_tables": {}, "months": {}}
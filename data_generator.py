@@ -1,43 +1,106 @@
 """
 Unified fake data generator for a call-center schema.
 - Writes base tables (agents, customers, skills, queues, etc.)
-- Streams a full-year of calls (13,687,500 rows) into per-month CSVs
+- Streams a full-year of calls (13,687,500 rows at scale factor 1) into per-month CSVs
 - Writes tickets (1 ticket per call) into per-month CSVs
+- Per-month files can be written as CSV (default) or Parquet, see OUTPUT_FORMAT / sinks.py
+- CSV can be written as gzip / zstd streams compressed on background threads, see COMPRESSION
+- Disk writes overlap generation: each worker hands its days to a writer thread through a
+  bounded queue (WRITER_QUEUE_DEPTH days), see sinks.AsyncSink
+- Importable: iter_calls(month=3), iter_tickets(day=...), iter_batches(...) yield rows in memory;
+  --stream TABLE=PATH pipes CSV into a FIFO / stdout while generating
+- Importing writes nothing and stays light: Faker, NumPy and the process pool machinery
+  load on first use, and worker processes start from the run config (current_config)
+- Live progress and a JSON run report (run_report.json), optional sampling profiler, see metrics.py
+- Crash-resumable: run_manifest.json plus a per-month checkpoint after every day;
+  --resume skips finished work and continues months from their last day, see checkpoints.py
+- Multi-node: --shard i/N generates a contiguous share of whole months with the ids of a
+  single-node run; shards.py checks and merges the shards' manifests
+- Pre-aggregated call summaries by day x hour x queue and day x agent, computed while
+  generating (summary_by_day_hour_queue.csv, summary_by_day_agent.csv), see aggregates.py
 - Generates extended tables (shifts, sampled recordings, IVR, SLAs, skill history, agent_workload, wrap codes, dispositions)
-- Uses Faker for realistic names
-- Multithreaded: generates each month in its own worker via ThreadPoolExecutor
+- Uses Faker for realistic names (or Faker-built name pools for very large dimensions, see dimensions.py)
+- Parallel: generates each month in its own worker via ProcessPoolExecutor (or ThreadPoolExecutor)
+- Two day engines: ENGINE = "python" (stdlib random) or "numpy" (vectorized, numpy_engine.py)
+- TIME_ORDERED: sorted arrivals per day, so call_id is monotonic with call_timestamp
+- AGENT_ASSIGNMENT = "roster": calls go to agents on shift, weighted by skill for the queue
+- IVR_MODEL = "tree": complete root-to-leaf IVR paths from the menu tree (ivr.py); the leaf
+  routes the call to a queue with the skill its action transfers to
+- Deterministic: every day draws from its own RNG seeded from RANDOM_SEED, so output
+  is byte-identical for a given seed whatever the worker count or execution mode
 
-OUT DIR (user-provided) :
-out_dir = r'C:\\Users\\Mohamed Mohsin\\python tests\\MnHna\\CS\\data'
+OUT DIR: ./data (relative to the working directory) unless -o / --out-dir is given
+
+Usage:
+    python data_generator.py                                  # full year, scale factor 1
+    python data_generator.py --tiny -o ./data_ci              # 1/1000 dataset in seconds
+    python data_generator.py -s 0.1 --start-date 2025-03-01 --end-date 2025-03-31 --tables calls,tickets
+    python data_generator.py --estimate                       # rows / MB / seconds per table, writes nothing
+    python data_generator.py --append                         # next day after the high-water mark -> daily/<date>/
+    python data_generator.py --append --start-date 2026-01-05 --end-date 2026-01-07
+    python data_generator.py --compression zstd               # *.csv.zst, read back with zstdcat
+    python data_generator.py --stream calls=- | bcp ...       # rows straight into a loader, no files
+    python data_generator.py --resume                         # after a crash: continue from the checkpoints
+    python data_generator.py --ivr-model tree --ivr-path-prob 1   # every call walks the IVR menu tree
+    python data_generator.py -o ./shard2 --shard 2/4          # then: python shards.py -o ./merged ./shard*
 """
+import io
 import os
+import sys
 import csv
+import json
+import hashlib
 import random
+import shutil
 import calendar
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
 from datetime import datetime, timedelta, time, date
-from faker import Faker
+from time import perf_counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from aggregates import Aggregates, merge_all
+from ivr import IVR_NODES, IvrTree, write_nodes
+from shards import parse_shard, plan_entry, shard_months
+from checkpoints import (CHECKPOINT_DIR, MANIFEST_FILE, MonthCheckpoint, config_hash, day_entry, file_entry,
+                         file_matches, new_manifest, read_json, write_json)
+from metrics import PROFILE_DIR, ProgressMonitor, RunReport, SamplingProfiler, day_stats, emit, run_task, set_event_queue
+from sinks import (COMPRESSIONS, OUTPUT_FORMATS, TABLES as FACT_TABLES, day_paths, ensure_output_dirs, month_paths,
+                   open_month_sink, open_stream_sink, open_text)
 
 # -------------------------
 # CONFIG
 # -------------------------
-out_dir = r'C:\\Users\\Mohamed Mohsin\\python tests\\MnHna\\CS\\data'
-os.makedirs(out_dir, exist_ok=True)
+# Every value here can be overridden from the command line (see main / --help).
+out_dir = os.path.join(".", "data")  # relative to the working directory
+
+# Scale factor 1 = the original dataset: 37,500 calls/day (13,687,500 calls over 2025),
+# 5,000 customers, 150 agents. Fact and dimension sizes scale linearly (TPC style).
+BASE_CALLS_PER_DAY = 37500
+BASE_CUSTOMERS = 5000
+BASE_AGENTS = 150
+SCALE_FACTOR = 1.0
 
-# Year and call counts
+# Date range and sizes
 YEAR = 2025
-NUM_AGENTS = 150
-NUM_CUSTOMERS = 5000
-TOTAL_CALLS = 13687500           # user requested
-DAYS_IN_YEAR = 365               # 2025 is not leap
-CALLS_PER_DAY = TOTAL_CALLS // DAYS_IN_YEAR  # should be 37500
-assert CALLS_PER_DAY * DAYS_IN_YEAR == TOTAL_CALLS, "TOTAL_CALLS must evenly divide 365"
+START_DATE = date(YEAR, 1, 1)
+END_DATE = date(YEAR, 12, 31)
+NUM_AGENTS = BASE_AGENTS
+NUM_CUSTOMERS = BASE_CUSTOMERS
+CALLS_PER_DAY = BASE_CALLS_PER_DAY
 
 # Sampling probabilities for auxiliary logs (tunable)
 RECORDING_PROB = 0.4     # probability to produce a recording row for an answered call
-IVR_PATH_PROB = 0.025    # probability a call has IVR path rows (sample)
+IVR_PATH_PROB = 0.025    # probability a call has IVR path rows (sample); IVR_MODEL = "tree" is cheap enough for 1.0
 CALL_EVENTS_PROB = 0.05  # probability to produce call_events for a call (sample)
 
+# Globally unique IDs for the per-call tables, derived from call_id at generation time:
+# ticket_id and recording_id equal call_id (at most one per call); IVR paths and call
+# events get a reserved block of slots per call -> id = (call_id - 1) * SLOTS + slot.
+# IDs stay unique and month-ordered across parallel workers with no rewrite pass.
+IVR_ID_SLOTS = 2     # node 1, then node 2/3 (IVR_MODEL = "tree": the depth of the tree)
+EVENT_ID_SLOTS = 5   # queued, answered, hold, resumed, ended
+
 # Schema sizes
 NUM_SKILLS = 5
 NUM_QUEUES = 6
@@ -46,12 +109,71 @@ NUM_WRAP_CODES = 20
 NUM_DISPOSITIONS = 12
 
 RANDOM_SEED = 42
-random.seed(RANDOM_SEED)
-fake = Faker()
-Faker.seed(RANDOM_SEED)
 
 # Concurrency
 MAX_WORKERS = 4  # adjust according to CPU / disk
+EXECUTION_MODE = "process"  # "process" (one core per month) or "thread" (GIL-bound)
+
+# Day engine and output backend for the per-month fact files (see sinks.py)
+ENGINE = "python"  # "python" (stdlib random, row at a time) or "numpy" (vectorized, see numpy_engine.py)
+# True: each day's calls arrive in time order, so call/ticket ids and the IVR / event rows and ids follow
+# the timestamps (clustered / partitioned loads need no sort); False keeps the original random order
+TIME_ORDERED = False
+# "uniform": any agent answers any call; "roster": only agents on shift at the call's hour answer,
+# weighted by their proficiency in the queue's primary skill; calls outside all shifts go unanswered
+AGENT_ASSIGNMENT = "uniform"
+# "sampled": answered calls get node 1, then node 2/3 for 60%, queue drawn independently; "tree": calls
+# (answered or not) walk the menu tree of ivr.py from the root to a leaf, and the leaf picks the queue
+IVR_MODEL = "sampled"
+DIMENSION_ENGINE = "faker"  # "faker" (row at a time) or "pools" (vectorized name pools, see dimensions.py)
+OUTPUT_FORMAT = "csv"  # "csv", "parquet" (typed, compressed, one row group per day) or "load" (DDL column order + bulk_insert.sql)
+COMPRESSION = "none"  # csv only: "none", "gzip" or "zstd" (one compressed frame per table per day)
+COMPRESSION_LEVEL = None  # None = gzip 6 / zstd 3
+COMPRESSION_THREADS = 2  # compression threads per month worker
+# days of rows queued for each worker's writer thread (see sinks.AsyncSink); 0 = write on the generating thread
+WRITER_QUEUE_DEPTH = 2
+
+# Metrics (see metrics.py)
+RUN_REPORT = "run_report.json"  # written to out_dir after every run
+PROGRESS_INTERVAL = 5.0  # seconds between [PROGRESS] lines; 0 = off
+PROFILE_INTERVAL = None  # seconds between stack samples of each worker's day loop; None = off
+# True: month / day workers fold their calls into day x hour x queue and day x agent summaries
+AGGREGATES = True
+
+# Tables to write (reference tables by name, fact tables as in sinks.TABLES)
+REFERENCE_TABLE_NAMES = ("skills", "queues", "campaigns", "wrap_codes", "dispositions", "ivr_menu_nodes", "agents",
+                         "agent_skills", "customers", "shifts", "service_levels", "skill_history", "agent_workload")
+ALL_TABLES = REFERENCE_TABLE_NAMES + tuple(FACT_TABLES)
+TABLES = ALL_TABLES
+
+# Module-level settings that make up a run; worker processes receive them via apply_config
+CONFIG_KEYS = ("out_dir", "SCALE_FACTOR", "YEAR", "START_DATE", "END_DATE", "NUM_AGENTS", "NUM_CUSTOMERS",
+               "CALLS_PER_DAY", "RANDOM_SEED", "MAX_WORKERS", "EXECUTION_MODE", "ENGINE", "TIME_ORDERED", "AGENT_ASSIGNMENT",
+               "IVR_MODEL", "IVR_PATH_PROB", "DIMENSION_ENGINE",
+               "OUTPUT_FORMAT", "COMPRESSION", "COMPRESSION_LEVEL", "COMPRESSION_THREADS", "PROFILE_INTERVAL", "AGGREGATES",
+               "WRITER_QUEUE_DEPTH", "TABLES")
+
+def scale_config(scale_factor):
+    return {
+        "SCALE_FACTOR": scale_factor,
+        "CALLS_PER_DAY": max(1, round(BASE_CALLS_PER_DAY * scale_factor)),
+        "NUM_CUSTOMERS": max(10, round(BASE_CUSTOMERS * scale_factor)),
+        "NUM_AGENTS": max(2, round(BASE_AGENTS * scale_factor)),  # transfers need a second agent
+    }
+
+def current_config():
+    return {k: globals()[k] for k in CONFIG_KEYS}
+
+def apply_config(cfg):
+    """Install a run configuration into this module (also used as the worker-process initializer)."""
+    globals().update(cfg)
+    build_pools()
+
+def init_worker(cfg, events):
+    """Worker-process initializer: the run config plus the queue for live progress events."""
+    apply_config(cfg)
+    if events is not None:
+        set_event_queue(events)
 
 # Helpers
 def ensure_dir(p):
@@ -64,227 +186,342 @@ def daterange(start_date, end_date):
         yield d
         d += timedelta(days=1)
 
+def stable_seed(key):
+    # stable across processes/platforms (unlike hash()), so any worker rebuilds the same stream
+    digest = hashlib.sha256(f"{RANDOM_SEED}:{key}".encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+def day_seed(d):
+    return stable_seed(d.isoformat())
+
+def day_rng(d):
+    return random.Random(day_seed(d))
+
+def stage_rng(name):
+    # each reference table has its own stream, so selecting a subset of tables does not change the others
+    return random.Random(stable_seed(name))
+
+_fake = None
+
+def stage_faker(name):
+    global _fake
+    if _fake is None:
+        # imported on first use: fact workers and --append never need Faker
+        from faker import Faker
+        _fake = Faker()
+    _fake.seed_instance(stable_seed(name))
+    return _fake
+
+def table_path(name):
+    return os.path.join(out_dir, f"{name}.csv")
+
 # -------------------------
-# 1) Small reference tables: skills, queues, campaigns, wrap_codes, dispositions
+# 1) Reference tables (written once by the parent process)
 # -------------------------
-print("Writing reference tables...")
-
-# Skills - meaningful names
-skills_list = [
+SKILLS = [
     "Technical Support",
     "Sales",
     "Billing",
     "High Value Customer Handling",
     "Retention"
 ]
-skills_csv = os.path.join(out_dir, "skills.csv")
-with open(skills_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["skill_id", "skill_name"])
-    for sid, sname in enumerate(skills_list, start=1):
-        w.writerow([sid, sname])
-
-# Queues
-queues = []
-for qid in range(1, NUM_QUEUES+1):
-    primary_skill = random.randint(1, NUM_SKILLS)
-    queues.append((qid, f"Queue_{qid}", f"Queue {qid} description", primary_skill))
-queues_csv = os.path.join(out_dir, "queues.csv")
-with open(queues_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["queue_id", "queue_name", "description", "primary_skill_id"])
-    for row in queues:
-        w.writerow(row)
-
-# Campaigns
-campaigns_csv = os.path.join(out_dir, "campaigns.csv")
-with open(campaigns_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["campaign_id", "campaign_name", "start_date", "end_date"])
-    for cid in range(1, NUM_CAMPAIGNS+1):
-        start = (datetime(YEAR-1, random.randint(1,12), random.randint(1,28))).date()
-        end = None
-        if random.random() < 0.6:
-            end = (start + timedelta(days=random.randint(30, 365))).isoformat()
-        w.writerow([cid, f"Campaign_{cid}", start.isoformat(), end])
-
-# Wrap codes
-wrap_codes_csv = os.path.join(out_dir, "wrap_codes.csv")
-with open(wrap_codes_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["wrap_code_id", "wrap_code", "description"])
-    for i in range(1, NUM_WRAP_CODES+1):
-        w.writerow([i, f"WRAP_{i}", f"Wrap reason {i}"])
-
-# Dispositions
-dispositions_list = ["Resolved","Escalated","Voicemail","Dropped","No Answer","Callback Requested",
-                     "Survey Complete","Complaint","Refund","Information","Follow-up","Busy"]
-dispositions_csv = os.path.join(out_dir, "dispositions.csv")
-with open(dispositions_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["disposition_id", "disposition"])
-    for i, d in enumerate(dispositions_list, start=1):
-        w.writerow([i, d])
+DISPOSITIONS = ["Resolved","Escalated","Voicemail","Dropped","No Answer","Callback Requested",
+                "Survey Complete","Complaint","Refund","Information","Follow-up","Busy"]
+COUNTRIES = ["US","CA","GB","AU","EG","FR","ES","DE"]
+
+def write_skills():
+    # Skills - meaningful names
+    with open(table_path("skills"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["skill_id", "skill_name"])
+        for sid, sname in enumerate(SKILLS, start=1):
+            w.writerow([sid, sname])
+
+def queue_primary_skills():
+    # {queue_id: primary_skill_id}; replays the "queues" stream, so workers agree with queues.csv
+    rng = stage_rng("queues")
+    return {qid: rng.randint(1, NUM_SKILLS) for qid in range(1, NUM_QUEUES+1)}
+
+def write_queues():
+    with open(table_path("queues"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["queue_id", "queue_name", "description", "primary_skill_id"])
+        for qid, primary_skill in queue_primary_skills().items():
+            w.writerow((qid, f"Queue_{qid}", f"Queue {qid} description", primary_skill))
+
+def write_campaigns():
+    rng = stage_rng("campaigns")
+    with open(table_path("campaigns"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["campaign_id", "campaign_name", "start_date", "end_date"])
+        for cid in range(1, NUM_CAMPAIGNS+1):
+            start = (datetime(YEAR-1, rng.randint(1,12), rng.randint(1,28))).date()
+            end = None
+            if rng.random() < 0.6:
+                end = (start + timedelta(days=rng.randint(30, 365))).isoformat()
+            w.writerow([cid, f"Campaign_{cid}", start.isoformat(), end])
+
+def write_wrap_codes():
+    with open(table_path("wrap_codes"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["wrap_code_id", "wrap_code", "description"])
+        for i in range(1, NUM_WRAP_CODES+1):
+            w.writerow([i, f"WRAP_{i}", f"Wrap reason {i}"])
+
+def write_dispositions():
+    with open(table_path("dispositions"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["disposition_id", "disposition"])
+        for i, d in enumerate(DISPOSITIONS, start=1):
+            w.writerow([i, d])
+
+def write_ivr_menu_nodes():
+    write_nodes(table_path("ivr_menu_nodes"))
 
 # -------------------------
 # 2) Agents and AgentSkills
 # -------------------------
-print("Generating agents and agent_skills...")
+def dimension_workers():
+    return MAX_WORKERS if EXECUTION_MODE == "process" else 1
 
-agents_csv = os.path.join(out_dir, "agents.csv")
-with open(agents_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["agent_id", "first_name", "last_name", "username", "phone", "email", "hire_date", "status"])
-    for aid in range(1, NUM_AGENTS+1):
-        fn = fake.first_name()
-        ln = fake.last_name()
-        username = (fn[0] + ln).lower() + str(aid % 100)
-        phone = fake.phone_number()
-        email = f"{fn.lower()}.{ln.lower()}{aid}@example.com"
-        hire_date = (datetime(2016,1,1) + timedelta(days=random.randint(0, 365*9))).date().isoformat()
-        status = random.choices(["Active","On Leave","Training","Inactive"], weights=[0.8,0.05,0.1,0.05])[0]
-        w.writerow([aid, fn, ln, username, phone, email, hire_date, status])
-
-agent_skills_csv = os.path.join(out_dir, "agent_skills.csv")
-with open(agent_skills_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["agent_id", "skill_id", "proficiency"])
+def write_agents():
+    if DIMENSION_ENGINE == "pools":
+        from dimensions import write_agents_pools
+        return write_agents_pools(table_path("agents"), NUM_AGENTS, stable_seed("agents"), dimension_workers())
+    rng = stage_rng("agents")
+    fk = stage_faker("agents")
+    with open(table_path("agents"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["agent_id", "first_name", "last_name", "username", "phone", "email", "hire_date", "status"])
+        for aid in range(1, NUM_AGENTS+1):
+            fn = fk.first_name()
+            ln = fk.last_name()
+            username = (fn[0] + ln).lower() + str(aid % 100)
+            phone = fk.phone_number()
+            email = f"{fn.lower()}.{ln.lower()}{aid}@example.com"
+            hire_date = (datetime(2016,1,1) + timedelta(days=rng.randint(0, 365*9))).date().isoformat()
+            status = rng.choices(["Active","On Leave","Training","Inactive"], weights=[0.8,0.05,0.1,0.05])[0]
+            w.writerow([aid, fn, ln, username, phone, email, hire_date, status])
+
+def agent_skill_rows():
+    # (agent_id, skill_id, proficiency) rows of agent_skills.csv
+    rng = stage_rng("agent_skills")
     for aid in range(1, NUM_AGENTS+1):
-        num = random.choices([1,2,3], weights=[0.6,0.3,0.1])[0]
-        chosen = random.sample(range(1, NUM_SKILLS+1), num)
+        num = rng.choices([1,2,3], weights=[0.6,0.3,0.1])[0]
+        chosen = rng.sample(range(1, NUM_SKILLS+1), num)
         for s in chosen:
-            w.writerow([aid, s, random.randint(1,5)])
+            yield aid, s, rng.randint(1,5)
+
+def write_agent_skills():
+    with open(table_path("agent_skills"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["agent_id", "skill_id", "proficiency"])
+        w.writerows(agent_skill_rows())
 
 # -------------------------
 # 3) Customers (big)
 # -------------------------
-print("Generating customers (this may take a moment)...")
-customers_csv = os.path.join(out_dir, "customers.csv")
-countries = ["US","CA","GB","AU","EG","FR","ES","DE"]
-
-with open(customers_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["customer_id", "first_name", "last_name", "email", "phone", "created_date", "country"])
-    for cid in range(1, NUM_CUSTOMERS+1):
-        fn = fake.first_name()
-        ln = fake.last_name()
-        email = fake.free_email()
-        phone = fake.phone_number()
-        created = (datetime(YEAR-5,1,1) + timedelta(days=random.randint(0, 365*5))).date().isoformat()
-        country = random.choice(countries)
-        w.writerow([cid, fn, ln, email, phone, created, country])
-
-# -------------------------
-# 4) Shifts (generate schedule for whole year)
-# -------------------------
-print("Generating shifts for the year (one row per agent per day pattern)...")
-shifts_csv = os.path.join(out_dir, "shifts.csv")
-with open(shifts_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["shift_id", "agent_id", "shift_date", "start_time", "end_time", "shift_type"])
-    sid = 1
-    for aid in range(1, NUM_AGENTS+1):
-        offset = aid % 7
-        for d in daterange(date(YEAR,1,1), date(YEAR,12,31)):
-            # define a 5-on/2-off rotating pattern
-            if (d.toordinal() + offset) % 7 in (0,1,2,3,4):
-                st = "09:00:00"
-                et = "17:00:00"
-                stype = "Morning"
-            else:
-                st = "17:00:00"
-                et = "23:00:00"
-                stype = "Evening"
-            w.writerow([sid, aid, d.isoformat(), st, et, stype])
-            sid += 1
+def write_customers():
+    if DIMENSION_ENGINE == "pools":
+        # tens of millions of rows: sampled name pools in parallel id chunks instead of Faker per row
+        from dimensions import write_customers_pools
+        return write_customers_pools(table_path("customers"), NUM_CUSTOMERS, stable_seed("customers"), YEAR,
+                                     dimension_workers())
+    rng = stage_rng("customers")
+    fk = stage_faker("customers")
+    with open(table_path("customers"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["customer_id", "first_name", "last_name", "email", "phone", "created_date", "country"])
+        for cid in range(1, NUM_CUSTOMERS+1):
+            fn = fk.first_name()
+            ln = fk.last_name()
+            email = fk.free_email()
+            phone = fk.phone_number()
+            created = (datetime(YEAR-5,1,1) + timedelta(days=rng.randint(0, 365*5))).date().isoformat()
+            country = rng.choice(COUNTRIES)
+            w.writerow([cid, fn, ln, email, phone, created, country])
+
+# -------------------------
+# 4) Shifts (generate schedule for the whole date range)
+# -------------------------
+SHIFT_TYPES = {"Morning": ("09:00:00", "17:00:00"), "Evening": ("17:00:00", "23:00:00")}
+
+def shift_type(agent_id, ordinal):
+    # define a 5-on/2-off rotating pattern; it repeats every 7 days (see build_roster)
+    return "Morning" if (ordinal + agent_id % 7) % 7 in (0,1,2,3,4) else "Evening"
+
+def write_shifts():
+    with open(table_path("shifts"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["shift_id", "agent_id", "shift_date", "start_time", "end_time", "shift_type"])
+        sid = 1
+        for aid in range(1, NUM_AGENTS+1):
+            for d in daterange(START_DATE, END_DATE):
+                stype = shift_type(aid, d.toordinal())
+                st, et = SHIFT_TYPES[stype]
+                w.writerow([sid, aid, d.isoformat(), st, et, stype])
+                sid += 1
 
 # -------------------------
 # 5) Service Levels (SLA)
 # -------------------------
-print("Generating Service Levels (SLA)...")
-service_levels_csv = os.path.join(out_dir, "service_levels.csv")
-with open(service_levels_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["sla_id", "queue_id", "target_percentage", "target_seconds", "effective_date", "expiry_date"])
-    sid = 1
-    for qid in range(1, NUM_QUEUES+1):
-        w.writerow([sid, qid, random.choice([75.00,80.00,85.00,90.00]), random.choice([20,30,45]), f"{YEAR}-01-01", ""])
-        sid += 1
+def write_service_levels():
+    rng = stage_rng("service_levels")
+    with open(table_path("service_levels"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["sla_id", "queue_id", "target_percentage", "target_seconds", "effective_date", "expiry_date"])
+        sid = 1
+        for qid in range(1, NUM_QUEUES+1):
+            w.writerow([sid, qid, rng.choice([75.00,80.00,85.00,90.00]), rng.choice([20,30,45]), f"{YEAR}-01-01", ""])
+            sid += 1
 
 # -------------------------
 # 6) SkillHistory (sampled)
 # -------------------------
-print("Generating skill history (sampled)...")
-skill_history_csv = os.path.join(out_dir, "skill_history.csv")
-with open(skill_history_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["history_id", "agent_id", "skill_id", "proficiency", "effective_date", "end_date"])
-    hid = 1
-    sampled_agents = random.sample(range(1, NUM_AGENTS+1), k=int(NUM_AGENTS*0.3))
-    for aid in sampled_agents:
-        num = random.choice([1,2,3])
-        base = datetime(YEAR-3,1,1)
-        for _ in range(num):
-            sid = random.randint(1, NUM_SKILLS)
-            prof = random.randint(1,5)
-            eff = (base + timedelta(days=random.randint(0, 365))).date().isoformat()
-            w.writerow([hid, aid, sid, prof, eff, ""])
-            hid += 1
+def write_skill_history():
+    rng = stage_rng("skill_history")
+    with open(table_path("skill_history"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["history_id", "agent_id", "skill_id", "proficiency", "effective_date", "end_date"])
+        hid = 1
+        sampled_agents = rng.sample(range(1, NUM_AGENTS+1), k=int(NUM_AGENTS*0.3))
+        for aid in sampled_agents:
+            num = rng.choice([1,2,3])
+            base = datetime(YEAR-3,1,1)
+            for _ in range(num):
+                sid = rng.randint(1, NUM_SKILLS)
+                prof = rng.randint(1,5)
+                eff = (base + timedelta(days=rng.randint(0, 365))).date().isoformat()
+                w.writerow([hid, aid, sid, prof, eff, ""])
+                hid += 1
 
 # -------------------------
 # 7) AgentWorkload (sampled)
 # -------------------------
-print("Generating agent workload (sampled)...")
-agent_workload_csv = os.path.join(out_dir, "agent_workload.csv")
-with open(agent_workload_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["workload_id", "agent_id", "date", "max_concurrent_calls", "assigned_calls"])
-    wid = 1
-    sampled = random.sample(range(1, NUM_AGENTS+1), k=int(NUM_AGENTS*0.25))
-    for aid in sampled:
-        for d in daterange(date(YEAR,1,1), date(YEAR,1,7)):
-            w.writerow([wid, aid, d.isoformat(), random.choice([1,2,3]), random.randint(0,5)])
-            wid += 1
+def write_agent_workload():
+    rng = stage_rng("agent_workload")
+    with open(table_path("agent_workload"), "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["workload_id", "agent_id", "date", "max_concurrent_calls", "assigned_calls"])
+        wid = 1
+        sampled = rng.sample(range(1, NUM_AGENTS+1), k=int(NUM_AGENTS*0.25))
+        for aid in sampled:
+            for d in daterange(START_DATE, min(END_DATE, START_DATE + timedelta(days=6))):
+                w.writerow([wid, aid, d.isoformat(), rng.choice([1,2,3]), rng.randint(0,5)])
+                wid += 1
+
+# name -> (writer, what its row count scales with; used by --estimate)
+REFERENCE_TABLES = {
+    "skills": (write_skills, None),
+    "queues": (write_queues, None),
+    "campaigns": (write_campaigns, None),
+    "wrap_codes": (write_wrap_codes, None),
+    "dispositions": (write_dispositions, None),
+    "ivr_menu_nodes": (write_ivr_menu_nodes, None),
+    "agents": (write_agents, "agents"),
+    "agent_skills": (write_agent_skills, "agents"),
+    "customers": (write_customers, "customers"),
+    "shifts": (write_shifts, "agent_days"),
+    "service_levels": (write_service_levels, None),
+    "skill_history": (write_skill_history, "agents"),
+    "agent_workload": (write_agent_workload, "agents"),
+}
+
+def write_reference_tables(report=None, manifest=None):
+    print("Writing reference tables...")
+    done = manifest["reference_tables"] if manifest is not None else {}
+    for name, (writer, _) in REFERENCE_TABLES.items():
+        if name in TABLES:
+            if name in done and file_matches(table_path(name), done[name]):
+                print(f"  {name}.csv (done)")
+                continue
+            print(f"  {name}.csv")
+            with report.stage(name, table_path(name)) if report else nullcontext():
+                writer()
+            if manifest is not None:
+                done[name] = file_entry(table_path(name))
+                write_json(manifest_path(), manifest)
 
 # -------------------------
 # Prepare month-by-month generation plan
 # -------------------------
-print("Preparing monthly generation plan...")
-months_info = []
-cumulative = 0
-for m in range(1, 13):
-    days_in_month = calendar.monthrange(YEAR, m)[1]
-    calls_in_month = CALLS_PER_DAY * days_in_month
-    start_id = cumulative + 1
-    end_id = cumulative + calls_in_month
-    months_info.append({
-        "month": m,
-        "month_name": datetime(YEAR, m, 1).strftime("%B"),
-        "days_in_month": days_in_month,
-        "calls_in_month": calls_in_month,
-        "start_call_id": start_id,
-        "end_call_id": end_id
-    })
-    cumulative = end_id
-
-# sanity
-assert cumulative == TOTAL_CALLS, "Monthly totals do not sum to TOTAL_CALLS"
-
-# Create per-month dirs
-calls_month_dir = os.path.join(out_dir, "calls_by_month")
-tickets_month_dir = os.path.join(out_dir, "tickets_by_month")
-aux_month_dir = os.path.join(out_dir, "aux_by_month")
-ensure_dir(calls_month_dir)
-ensure_dir(tickets_month_dir)
-ensure_dir(aux_month_dir)
-
-# small sets for joins
-agent_ids = list(range(1, NUM_AGENTS+1))
-customer_ids = list(range(1, NUM_CUSTOMERS+1))
-queue_ids = [q[0] for q in queues]
-campaign_ids = list(range(1, NUM_CAMPAIGNS+1))
-wrap_code_ids = list(range(1, NUM_WRAP_CODES+1))
-disposition_ids = list(range(1, NUM_DISPOSITIONS+1))
+def build_months_info():
+    # one entry per (year, month) touched by START_DATE..END_DATE; call ids run on from START_DATE
+    months_info = []
+    multi_year = START_DATE.year != END_DATE.year
+    cumulative = 0
+    d = START_DATE
+    while d <= END_DATE:
+        last = min(END_DATE, date(d.year, d.month, calendar.monthrange(d.year, d.month)[1]))
+        days_in_month = (last - d).days + 1
+        calls_in_month = CALLS_PER_DAY * days_in_month
+        name = d.strftime("%B")
+        months_info.append({
+            "month": d.month,
+            "year": d.year,
+            "month_name": f"{d.year}_{name}" if multi_year else name,
+            "first_day": d,
+            "last_day": last,
+            "days_in_month": days_in_month,
+            "calls_in_month": calls_in_month,
+            "start_call_id": cumulative + 1,
+            "end_call_id": cumulative + calls_in_month
+        })
+        cumulative += calls_in_month
+        d = last + timedelta(days=1)
+    return months_info
+
+def build_roster():
+    """
+    On-duty index for AGENT_ASSIGNMENT = "roster": roster[date ordinal % 7][hour][queue_id] lists
+    the agents on shift at that hour, each repeated by its weight for the queue (1, or 1 + its
+    proficiency in the queue's primary skill), so one choice() is a weighted O(1) draw. None
+    where nobody is on shift. The shift pattern repeats weekly, so 7 day classes cover any
+    date range, and all hours of a shift share the same per-queue lists.
+    """
+    primary = queue_primary_skills()
+    proficiency = {(aid, sid): prof for aid, sid, prof in agent_skill_rows()}
+    shift_hours = {t: range(int(st[:2]), int(et[:2])) for t, (st, et) in SHIFT_TYPES.items()}
+    roster = []
+    for day_class in range(7):
+        by_shift = {t: [None] + [[] for _ in range(NUM_QUEUES)] for t in SHIFT_TYPES}
+        for aid in range(1, NUM_AGENTS+1):
+            # agents are added in id order, so a list holds two or more agents iff first != last
+            per_queue = by_shift[shift_type(aid, day_class)]
+            for qid in range(1, NUM_QUEUES+1):
+                per_queue[qid].extend([aid] * (1 + proficiency.get((aid, primary[qid]), 0)))
+        hours = [None] * 24
+        for t, per_queue in by_shift.items():
+            if not per_queue[1]:
+                continue  # nobody works this shift today (very small agent counts)
+            for h in shift_hours[t]:
+                hours[h] = per_queue
+        roster.append(hours)
+    return roster
+
+# small sets for joins (rebuilt by apply_config)
+def build_pools():
+    global agent_ids, customer_ids, queue_ids, campaign_ids, wrap_code_ids, disposition_ids
+    global campaign_choices, other_agent_slots, small_id_strs, roster, ivr_tree, ivr_id_slots
+    # ranges, not lists: choice() draws the same from both, and workers do not build
+    # an O(customers) list at start-up
+    agent_ids = range(1, NUM_AGENTS+1)
+    customer_ids = range(1, NUM_CUSTOMERS+1)
+    queue_ids = range(1, NUM_QUEUES+1)
+    campaign_ids = range(1, NUM_CAMPAIGNS+1)
+    wrap_code_ids = range(1, NUM_WRAP_CODES+1)
+    disposition_ids = range(1, NUM_DISPOSITIONS+1)
+    # choice() on these draws exactly like the lists they replace in the hot loop
+    campaign_choices = list(campaign_ids) + [None]*3
+    other_agent_slots = range(1, NUM_AGENTS)
+    # id -> str for the small id domains (queues, campaigns, agents, codes, ratings)
+    small_id_strs = [str(i) for i in range(max(NUM_AGENTS, NUM_QUEUES, NUM_CAMPAIGNS, NUM_WRAP_CODES,
+                                               NUM_DISPOSITIONS, 5) + 1)]
+    roster = build_roster() if AGENT_ASSIGNMENT == "roster" else None
+    ivr_tree = IvrTree(IVR_NODES, queue_primary_skills(), SKILLS) if IVR_MODEL == "tree" else None
+    ivr_id_slots = ivr_tree.depth if ivr_tree is not None else IVR_ID_SLOTS
+
+build_pools()
 
 # hour distribution to bias peak hours
 hour_weights = [0.5]*6 + [1.0]*6 + [1.5]*6 + [1.2]*6  # total 24
@@ -292,206 +529,947 @@ hour_choices = []
 for h, wght in enumerate(hour_weights):
     reps = max(1, int(wght * 10))
     hour_choices.extend([h]*reps)
+# cumulative share of the day's calls at each hour boundary (25 values, 0.0 .. 1.0)
+hour_cdf = [hour_choices.count(h) / len(hour_choices) for h in range(24)]
+hour_cdf = [sum(hour_cdf[:h]) for h in range(24)] + [1.0]
+
+def sorted_arrivals(rng, n):
+    """
+    n call times (second of day) in ascending order from the hourly arrival rate: an
+    inhomogeneous Poisson process conditioned on n arrivals. Normalized cumulative
+    exponential gaps are the order statistics of n uniforms, so no sort is needed;
+    the inverse CDF of the piecewise-constant rate keeps them ordered.
+    """
+    gaps = [rng.expovariate(1.0) for _ in range(n + 1)]
+    total = sum(gaps)
+    out = []
+    acc = 0.0
+    h = 0
+    for gap in gaps[:n]:
+        acc += gap
+        u = acc / total
+        while u >= hour_cdf[h + 1] and h < 23:
+            h += 1
+        frac = (u - hour_cdf[h]) / (hour_cdf[h + 1] - hour_cdf[h])
+        out.append(h * 3600 + min(3599, int(frac * 3600)))
+    return out
+
+def renumber_in_time_order(rows, ts_col, first_id):
+    """Sort a day's rows by timestamp (ties keep id order) and give them consecutive ids from first_id."""
+    rows.sort(key=lambda r: (r[ts_col], r[0]))
+    for i, row in enumerate(rows, first_id):
+        row[0] = i
+
+# -------------------------
+# Formatting caches for the Python engine
+# -------------------------
+SECONDS_PER_DAY = 86400
+# "HH:MM:SS" for every second of the day; built by time_of_day() on first use
+TIME_OF_DAY = None
+# days with at least this many calls get the full 86,400-entry table; smaller ones join on demand
+DAY_STAMP_TABLE_MIN_CALLS = 2000
+
+TICKET_STATUSES = ["Open","In Progress","Resolved","Closed","Escalated"]
+TICKET_PRIORITIES = ["Low","Medium","High","Critical"]
+LOW_TICKET_PRIORITIES = ["Low","Medium"]
+TRANSCRIPTION_STATUSES = ["Pending","Completed","Failed"]
+DTMF_KEYS = ["1","2"]
+IVR_SECOND_NODES = [2,3]
+
+def time_of_day():
+    global TIME_OF_DAY
+    if TIME_OF_DAY is None:
+        two_digits = [f"{i:02d}" for i in range(60)]
+        TIME_OF_DAY = [f"{h}:{m}:{s}" for h in two_digits[:24] for m in two_digits for s in two_digits]
+    return TIME_OF_DAY
+
+class _DayStamps:
+    __slots__ = ("prefix", "times")
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.times = time_of_day()
+
+    def __getitem__(self, sec):
+        return self.prefix + self.times[sec]
+
+def day_timestamps(current_day):
+    """ISO timestamps of current_day indexed by second of day, as datetime.isoformat() writes them."""
+    prefix = current_day.isoformat() + "T"
+    if CALLS_PER_DAY >= DAY_STAMP_TABLE_MIN_CALLS:
+        return [prefix + t for t in time_of_day()]
+    return _DayStamps(prefix)
+
+# -------------------------
+# Per-day generation engines
+# -------------------------
+def generation_params():
+    # everything an engine needs, as plain values so it pickles cheaply into worker processes
+    return {
+        "calls_per_day": CALLS_PER_DAY,
+        "num_agents": NUM_AGENTS,
+        "num_customers": NUM_CUSTOMERS,
+        "num_queues": NUM_QUEUES,
+        "num_campaigns": NUM_CAMPAIGNS,
+        "num_wrap_codes": NUM_WRAP_CODES,
+        "num_dispositions": NUM_DISPOSITIONS,
+        "recording_prob": RECORDING_PROB,
+        "ivr_path_prob": IVR_PATH_PROB,
+        "call_events_prob": CALL_EVENTS_PROB,
+        "hour_choices": hour_choices,
+        "hour_cdf": hour_cdf,
+        "time_ordered": TIME_ORDERED,
+        "roster": roster,
+        "ivr_tree": ivr_tree,
+        "ivr_id_slots": ivr_id_slots,
+        "event_id_slots": EVENT_ID_SLOTS,
+    }
+
+def generate_day_python(current_day, first_call_id):
+    """Generate one day of calls plus their tickets/recordings/IVR/events as row lists."""
+    rng = day_rng(current_day)
+    choice, randint, rand = rng.choice, rng.randint, rng.random
+    calls, tickets, recordings, ivr_paths, call_events = [], [], [], [], []
+    call_rows = calls.append
+    ticket_rows = tickets.append
+    rec_rows = recordings.append
+    ivr_rows = ivr_paths.append
+    ev_rows = call_events.append
+
+    # formatting caches: ISO strings by second of day, strings of small ids
+    stamps = day_timestamps(current_day)
+    day_start = datetime.combine(current_day, time())
+    rec_prefix = f"/recordings/{current_day.isoformat()}/call_"
+    ids = small_id_strs
+
+    def iso(sec):
+        # events can run past midnight
+        return stamps[sec] if sec < SECONDS_PER_DAY else (day_start + timedelta(seconds=sec)).isoformat()
+
+    arrivals = sorted_arrivals(rng, CALLS_PER_DAY) if TIME_ORDERED else None
+    # AGENT_ASSIGNMENT = "roster": hour -> queue_id -> weighted on-duty agents (None = nobody on shift)
+    day_roster = roster[current_day.toordinal() % 7] if roster is not None else None
+    on_duty = None
+    # IVR_MODEL = "tree": the day's menu paths in one batch, (queue_id, hops) per call
+    ivr_draws = ivr_tree.draw(rng, CALLS_PER_DAY) if ivr_tree is not None else None
+
+    for i, call_local_id in enumerate(range(first_call_id, first_call_id + CALLS_PER_DAY)):
+        cid = str(call_local_id)
+        ivr_base = (call_local_id - 1) * ivr_id_slots
+        event_base = (call_local_id - 1) * EVENT_ID_SLOTS
+
+        if arrivals is None:
+            # timestamp (biased hours)
+            hour = choice(hour_choices)
+            minute = randint(0,59)
+            second = randint(0,59)
+            sec = hour * 3600 + minute * 60 + second
+        else:
+            sec = arrivals[i]
+        call_ts = stamps[sec]
+
+        if ivr_draws is not None and rand() < IVR_PATH_PROB:
+            # the caller walks the menu tree; the leaf routes the call to its queue
+            queue_id, hops = ivr_draws[i]
+            for path_id, (node_id, digit, offset) in enumerate(hops, ivr_base + 1):
+                t = sec + offset
+                ivr_rows([path_id, cid, node_id, digit, stamps[t] if t < SECONDS_PER_DAY else iso(t)])
+        else:
+            queue_id = choice(queue_ids)
+        campaign_id = choice(campaign_choices)  # some calls not from campaigns
+        customer_id = choice(customer_ids)
+
+        answered_prob = 0.88 if queue_id % 2 == 0 else 0.82
+        answered = 1 if rand() < answered_prob else 0
+        if day_roster is not None and answered:
+            by_queue = day_roster[sec // 3600]
+            if by_queue is None:
+                answered = 0  # outside every shift: nobody to take the call
+            else:
+                on_duty = by_queue[queue_id]
+
+        wait_seconds = 0
+        talk_seconds = 0
+        hold_seconds = 0
+        agent = ""
+        transferred_to_agent = ""
+        wrap_code = ""
+        disposition = ""
+        recording_path = ""
+        survey_id = ""
+        survey_rating = ""
+
+        if answered:
+            agent_id = choice(agent_ids) if on_duty is None else choice(on_duty)
+            agent = ids[agent_id]
+            wait_seconds = max(0, int(rng.expovariate(1/20)))
+            talk_seconds = randint(20, 3600)
+            hold_seconds = int(talk_seconds * rand() * 0.2) if rand() < 0.25 else 0
+            if rand() < 0.08:
+                if on_duty is None:
+                    # same draw as choice([a for a in agent_ids if a != agent_id]), without building the list
+                    to_agent = choice(other_agent_slots)
+                    transferred_to_agent = ids[to_agent + 1 if to_agent >= agent_id else to_agent]
+                elif on_duty[0] != on_duty[-1]:
+                    # another agent on the same shift: redraw while it is the answering agent
+                    to_agent = agent_id
+                    while to_agent == agent_id:
+                        to_agent = choice(on_duty)
+                    transferred_to_agent = ids[to_agent]
+            wrap_code = ids[choice(wrap_code_ids)]
+            disposition = ids[choice(disposition_ids)]
+            if rand() < 0.18:
+                survey_id = randint(1, 20000000)
+                survey_rating = ids[randint(1,5)]
+
+            # Recordings (sampled)
+            if rand() < RECORDING_PROB:
+                recording_path = f"{rec_prefix}{cid}.wav"
+                file_size_kb = int(talk_seconds * rng.uniform(8,20))
+                rec_rows([cid, cid, recording_path, file_size_kb, talk_seconds, choice(TRANSCRIPTION_STATUSES)])
+
+            # IVR paths (sampled)
+            if ivr_draws is None and rand() < IVR_PATH_PROB:
+                ivr_rows([ivr_base + 1, cid, 1, choice(DTMF_KEYS), call_ts])
+                if rand() < 0.6:
+                    ivr_rows([ivr_base + 2, cid, choice(IVR_SECOND_NODES), choice(DTMF_KEYS), iso(sec + 4)])
+
+            # Call events (sampled)
+            if rand() < CALL_EVENTS_PROB:
+                answered_at = sec + wait_seconds
+                ev_rows([event_base + 1, cid, call_ts, "queued", "", "", ""])
+                ev_rows([event_base + 2, cid, iso(answered_at), "answered", agent, "", ""])
+                if hold_seconds > 0:
+                    hold_at = answered_at + int(talk_seconds*0.2)
+                    ev_rows([event_base + 3, cid, iso(hold_at), "hold", agent, "", ""])
+                    ev_rows([event_base + 4, cid, iso(hold_at + hold_seconds), "resumed", agent, "", ""])
+                ev_rows([event_base + 5, cid, iso(answered_at + talk_seconds), "ended", agent, "", ""])
+
+        # prepare call row
+        call_rows([
+            cid,
+            call_ts,
+            ids[queue_id],
+            ids[campaign_id] if campaign_id is not None else "",
+            customer_id,
+            answered,
+            wait_seconds,
+            talk_seconds,
+            hold_seconds,
+            agent,
+            transferred_to_agent,
+            wrap_code,
+            disposition,
+            recording_path,
+            survey_id,
+            survey_rating
+        ])
+
+        # ticket one per call
+        t_status = choice(TICKET_STATUSES)
+        t_priority = choice(TICKET_PRIORITIES) if answered and talk_seconds > 600 else choice(LOW_TICKET_PRIORITIES)
+        ticket_rows([
+            cid,
+            cid,
+            customer_id,
+            call_ts,
+            t_status,
+            t_priority,
+            f"Ticket for call {cid}",
+            f"Auto ticket for call {cid} created on {call_ts}."
+        ])
+
+    if TIME_ORDERED:
+        # IVR hops and events of different calls interleave in time: order them by timestamp and
+        # number them consecutively inside the day's id range, so ids stay globally unique
+        renumber_in_time_order(ivr_paths, 4, (first_call_id - 1) * ivr_id_slots + 1)
+        renumber_in_time_order(call_events, 2, (first_call_id - 1) * EVENT_ID_SLOTS + 1)
+
+    return {"calls": calls, "tickets": tickets, "recordings": recordings,
+            "ivr_paths": ivr_paths, "call_events": call_events}
+
+def generate_day(current_day, first_call_id):
+    if ENGINE == "numpy":
+        # imported lazily so the default engine does not need NumPy installed
+        from numpy_engine import generate_day_numpy
+        return generate_day_numpy(current_day, first_call_id, day_seed(current_day), generation_params())
+    return generate_day_python(current_day, first_call_id)
 
 # -------------------------
 # Function to generate a single month (worker)
 # -------------------------
+def open_fact_sink(paths, offsets=None):
+    return open_month_sink(OUTPUT_FORMAT, paths, COMPRESSION, COMPRESSION_LEVEL, COMPRESSION_THREADS, offsets,
+                           WRITER_QUEUE_DEPTH)
+
+def profiled(label):
+    if not PROFILE_INTERVAL:
+        return nullcontext()
+    return SamplingProfiler(os.path.join(out_dir, PROFILE_DIR, f"{label}.folded"), PROFILE_INTERVAL)
+
+def generate_days(sink, days, aggregates=None, checkpoint=None):
+    """
+    Generate (day, first_call_id) pairs into sink, folding the calls into aggregates and
+    recording the days on disk in checkpoint if given; returns the per-day stats (see metrics.day_stats).
+    """
+    timed = []
+    for current_day, first_call_id in days:
+        t0 = perf_counter()
+        tables = generate_day(current_day, first_call_id)
+        if aggregates is not None:
+            aggregates.add_calls(current_day, tables["calls"])
+        generated = perf_counter() - t0
+        format0, write0 = sink.timings["format"], sink.timings["write"]
+        wait0 = sink.timings.get("queue_wait", 0.0)
+        sink.write_day(tables)
+        if checkpoint is not None:
+            written = {t: tables[t] for t in sink.tables}
+            checkpoint.add_day(day_entry(current_day, first_call_id, CALLS_PER_DAY, written), sink.checkpoint())
+        rows = {t: len(tables[t]) for t in sink.tables}
+        emit("day", rows=rows)
+        timed.append([current_day, rows, generated, sink.timings["format"] - format0,
+                      sink.timings["write"] - write0, sink.timings.get("queue_wait", 0.0) - wait0])
+    if hasattr(sink, "drain") and timed:
+        # writer thread (sinks.AsyncSink): a day is formatted and written after write_day has
+        # returned; wait for the last days and credit every day with its own format / write time
+        wait0 = sink.timings["queue_wait"]
+        day_timings = sink.drain()[-len(timed):]
+        timed[-1][5] += sink.timings["queue_wait"] - wait0
+        for entry, (formatted, written) in zip(timed, day_timings):
+            entry[3], entry[4] = formatted, written
+    return [day_stats(*entry) for entry in timed]
+
 def generate_month_worker(info):
     m = info["month"]
     name = info["month_name"]
-    days_in_month = info["days_in_month"]
     calls_in_month = info["calls_in_month"]
     start_call_id = info["start_call_id"]
 
     print(f"[START] Month {name}: calls={calls_in_month}, start_id={start_call_id}")
 
-    # File paths
-    calls_file = os.path.join(calls_month_dir, f"{name}_calls.csv")
-    tickets_file = os.path.join(tickets_month_dir, f"{name}_tickets.csv")
-    rec_file = os.path.join(aux_month_dir, f"{name}_recordings.csv")
-    ivr_file = os.path.join(aux_month_dir, f"{name}_ivr_paths.csv")
-    events_file = os.path.join(aux_month_dir, f"{name}_call_events.csv")
-
-    # Open files (each month worker writes its own files -> thread-safe)
-    with open(calls_file, "w", newline='', encoding='utf-8') as cf, \
-         open(tickets_file, "w", newline='', encoding='utf-8') as tf, \
-         open(rec_file, "w", newline='', encoding='utf-8') as rf, \
-         open(ivr_file, "w", newline='', encoding='utf-8') as ivf, \
-         open(events_file, "w", newline='', encoding='utf-8') as ef:
-
-        call_writer = csv.writer(cf)
-        ticket_writer = csv.writer(tf)
-        rec_writer = csv.writer(rf)
-        ivr_writer = csv.writer(ivf)
-        ev_writer = csv.writer(ef)
-
-        # Headers
-        call_writer.writerow([
-            "call_id","call_timestamp","queue_id","campaign_id","customer_id","answered",
-            "wait_seconds","talk_seconds","hold_seconds","agent_id","transferred_to_agent_id",
-            "wrap_code_id","disposition_id","recording_path","survey_id","survey_rating"
-        ])
-        ticket_writer.writerow([
-            "ticket_id","call_id","customer_id","created_at","status","priority","subject","description"
-        ])
-        rec_writer.writerow(["recording_id","call_id","file_path","file_size_kb","duration_seconds","transcription_status"])
-        ivr_writer.writerow(["path_id","call_id","node_id","dtmf_input","timestamp"])
-        ev_writer.writerow(["event_id","call_id","event_time","event_type","agent_id","from_agent_id","to_agent_id"])
-
-        # counters local to month
-        call_local_id = start_call_id - 1
-        ticket_local_id = 0
-        recording_local_id = 0
-        ivr_local_id = 0
-        event_local_id = 0
-
-        # generate day by day for consistent per-day CALLS_PER_DAY
-        for d in range(1, days_in_month + 1):
-            current_day = date(YEAR, m, d)
-            for i in range(CALLS_PER_DAY):
-                call_local_id += 1
-                ticket_local_id += 1
-
-                # timestamp (biased hours)
-                hour = random.choice(hour_choices)
-                minute = random.randint(0,59)
-                second = random.randint(0,59)
-                call_ts = datetime.combine(current_day, time(hour, minute, second))
-
-                queue_id = random.choice(queue_ids)
-                campaign_id = random.choice(campaign_ids + [None]*3)  # some calls not from campaigns
-                customer_id = random.choice(customer_ids)
-
-                answered_prob = 0.88 if queue_id % 2 == 0 else 0.82
-                answered = 1 if random.random() < answered_prob else 0
-
-                wait_seconds = 0
-                talk_seconds = 0
-                hold_seconds = 0
-                agent_id = ""
-                transferred_to_agent = ""
-                wrap_code = ""
-                disposition = ""
-                recording_path = ""
-                survey_id = ""
-                survey_rating = ""
-
-                if answered:
-                    agent_id = random.choice(agent_ids)
-                    wait_seconds = max(0, int(random.expovariate(1/20)))
-                    talk_seconds = random.randint(20, 3600)
-                    hold_seconds = int(talk_seconds * random.random() * 0.2) if random.random() < 0.25 else 0
-                    if random.random() < 0.08:
-                        transferred_to_agent = random.choice([a for a in agent_ids if a != agent_id])
-                    wrap_code = random.choice(wrap_code_ids)
-                    disposition = random.choice(disposition_ids)
-                    if random.random() < 0.18:
-                        survey_id = random.randint(1, 20000000)
-                        survey_rating = random.randint(1,5)
-
-                    # Recordings (sampled)
-                    if random.random() < RECORDING_PROB:
-                        recording_local_id += 1
-                        recording_path = f"/recordings/{call_ts.date().isoformat()}/call_{call_local_id}.wav"
-                        file_size_kb = int(talk_seconds * random.uniform(8,20))
-                        rec_writer.writerow([recording_local_id, call_local_id, recording_path, file_size_kb, talk_seconds, random.choice(["Pending","Completed","Failed"])])
-
-                    # IVR paths (sampled)
-                    if random.random() < IVR_PATH_PROB:
-                        ivr_local_id += 1
-                        ivr_writer.writerow([ivr_local_id, call_local_id, 1, str(random.choice([1,2])), call_ts.isoformat()])
-                        if random.random() < 0.6:
-                            ivr_local_id += 1
-                            ivr_writer.writerow([ivr_local_id, call_local_id, random.choice([2,3]), str(random.choice([1,2])), (call_ts + timedelta(seconds=4)).isoformat()])
-
-                    # Call events (sampled)
-                    if random.random() < CALL_EVENTS_PROB:
-                        event_local_id += 1
-                        ev_writer.writerow([event_local_id, call_local_id, call_ts.isoformat(), "queued", "", "", ""])
-                        event_local_id += 1
-                        ev_writer.writerow([event_local_id, call_local_id, (call_ts + timedelta(seconds=wait_seconds)).isoformat(), "answered", agent_id, "", ""])
-                        if hold_seconds > 0:
-                            event_local_id += 1
-                            ev_writer.writerow([event_local_id, call_local_id, (call_ts + timedelta(seconds=wait_seconds + int(talk_seconds*0.2))).isoformat(), "hold", agent_id, "", ""])
-                            event_local_id += 1
-                            ev_writer.writerow([event_local_id, call_local_id, (call_ts + timedelta(seconds=wait_seconds + int(talk_seconds*0.2) + hold_seconds)).isoformat(), "resumed", agent_id, "", ""])
-                        event_local_id += 1
-                        ev_writer.writerow([event_local_id, call_local_id, (call_ts + timedelta(seconds=wait_seconds + talk_seconds)).isoformat(), "ended", agent_id, "", ""])
-
-                # prepare call row and write
-                call_writer.writerow([
-                    call_local_id,
-                    call_ts.isoformat(),
-                    queue_id,
-                    campaign_id if campaign_id is not None else "",
-                    customer_id,
-                    answered,
-                    wait_seconds,
-                    talk_seconds,
-                    hold_seconds,
-                    agent_id if agent_id != "" else "",
-                    transferred_to_agent if transferred_to_agent != "" else "",
-                    wrap_code if wrap_code != "" else "",
-                    disposition if disposition != "" else "",
-                    recording_path if recording_path != "" else "",
-                    survey_id if survey_id != "" else "",
-                    survey_rating if survey_rating != "" else ""
-                ])
-
-                # ticket one per call
-                t_status = random.choice(["Open","In Progress","Resolved","Closed","Escalated"])
-                t_priority = random.choice(["Low","Medium","High","Critical"]) if answered and talk_seconds > 600 else random.choice(["Low","Medium"])
-                t_subject = f"Ticket for call {call_local_id}"
-                t_desc = f"Auto ticket for call {call_local_id} created on {call_ts.isoformat()}."
-                ticket_writer.writerow([
-                    ticket_local_id,
-                    call_local_id,
-                    customer_id,
-                    call_ts.isoformat(),
-                    t_status,
-                    t_priority,
-                    t_subject,
-                    t_desc
-                ])
-
-            # optional flush per day to reduce memory buffer
-            cf.flush()
-            tf.flush()
-            rf.flush()
-            ivf.flush()
-            ef.flush()
+    paths = {t: p for t, p in month_paths(out_dir, name, OUTPUT_FORMAT, COMPRESSION).items() if t in TABLES}
+    # call ids continue from the month's planned start; other ids derive from call_id
+    # generate day by day for consistent per-day CALLS_PER_DAY
+    days = [(d, start_call_id + i * CALLS_PER_DAY) for i, d in enumerate(daterange(info["first_day"], info["last_day"]))]
+    call_local_id = start_call_id + len(days) * CALLS_PER_DAY - 1
+    result = {"month": m, "month_name": name, "start": start_call_id, "end": call_local_id, "label": f"Month {name}"}
+    aggregates = Aggregates() if AGGREGATES else None
+
+    # full runs keep a checkpoint per month (the estimator's calibration run does not)
+    checkpoint = None
+    offsets = None
+    if info.get("config_hash"):
+        checkpoint = MonthCheckpoint.open(checkpoint_path(name), name, info["config_hash"], info.get("resume"))
+        if checkpoint.is_complete(paths):
+            print(f"[SKIP ] Month {name}: files match the checkpoint")
+            if aggregates is not None:
+                aggregates = checkpoint.load_aggregates() or fold_days(aggregates, days)
+            return dict(result, days=[], aggregates=aggregates, checkpoint=checkpoint.summary())
+        offsets = checkpoint.resume_sizes(paths)
+        if offsets:
+            done = len(checkpoint.days)
+            if aggregates is not None:
+                fold_days(aggregates, days[:done])
+            days = days[done:]
+            print(f"[RESUME] Month {name}: {done} day(s) on disk, files cut back to the end of the last one")
+        else:
+            checkpoint.restart()
+
+    # each month worker writes its own files -> thread/process-safe
+    with open_fact_sink(paths, offsets) as sink, profiled(name):
+        stats = generate_days(sink, days, aggregates, checkpoint)
+    if checkpoint is not None:
+        checkpoint.finish(paths, aggregates)
 
     # done for month
     print(f"[DONE ] Month {name}: generated calls {start_call_id}..{call_local_id} (count={call_local_id - start_call_id + 1})")
-    return {"month": m, "month_name": name, "start": start_call_id, "end": call_local_id}
+    return dict(result, days=stats, aggregates=aggregates,
+                checkpoint=checkpoint.summary() if checkpoint is not None else None)
+
+def fold_days(aggregates, days):
+    """Aggregates of days already on disk, regenerated in memory (output is deterministic)."""
+    for current_day, first_call_id in days:
+        aggregates.add_calls(current_day, generate_day(current_day, first_call_id)["calls"])
+    return aggregates
 
 # -------------------------
-# Run monthly workers in thread pool
+# Run monthly workers in a process (or thread) pool
 # -------------------------
-print(f"Starting multithreaded generation with max_workers={MAX_WORKERS} ...")
-results = []
-with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-    future_to_month = {executor.submit(generate_month_worker, mi): mi for mi in months_info}
-    for future in as_completed(future_to_month):
-        mi = future_to_month[future]
-        try:
-            res = future.result()
-            results.append(res)
-        except Exception as exc:
-            print(f"[ERROR] Month {mi['month_name']} generated exception: {exc}")
+def run_pool(worker, tasks, label, report=None, num_days=None):
+    print(f"Starting {EXECUTION_MODE} pool generation with max_workers={MAX_WORKERS} ...")
+    if EXECUTION_MODE == "process":
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        events = multiprocessing.Queue()
+        # spawned workers start from the module defaults; hand them this run's config
+        pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=init_worker,
+                                   initargs=(current_config(), events))
+    else:
+        import queue
+        events = queue.Queue()
+        set_event_queue(events)
+        pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    monitor = None
+    if PROGRESS_INTERVAL:
+        monitor = ProgressMonitor(events, num_days or len(tasks), len(tasks), MAX_WORKERS, PROGRESS_INTERVAL).start()
+    started = datetime.now().timestamp()
+    results, timed, failures = [], [], []
+    try:
+        with pool as executor:
+            future_to_task = {executor.submit(run_task, worker, task): task for task in tasks}
+            for future in as_completed(future_to_task):
+                task = future_to_task[future]
+                if monitor:
+                    monitor.task_finished()
+                try:
+                    res = future.result()
+                    results.append(res["result"])
+                    timed.append(res)
+                except Exception as exc:
+                    print(f"[ERROR] {label(task)} generated exception: {exc}")
+                    failures.append({"task": label(task), "error": repr(exc)})
+    finally:
+        if monitor:
+            monitor.stop()
+        if EXECUTION_MODE != "process":
+            set_event_queue(None)
+    if report is not None:
+        report.add_pool(worker.__name__, MAX_WORKERS, started, datetime.now().timestamp(), timed, failures)
+    return results
+
+def run_month_workers(months_info, report=None, manifest=None, resume=False):
+    tasks = months_info
+    if manifest is not None:
+        tasks = [dict(mi, config_hash=manifest["config_hash"], resume=resume) for mi in months_info]
+    return run_pool(generate_month_worker, tasks, lambda mi: f"Month {mi['month_name']}", report,
+                    num_days=sum(mi["days_in_month"] for mi in months_info))
+
+# -------------------------
+# Checkpoints and --resume (see checkpoints.py)
+# -------------------------
+def manifest_path():
+    return os.path.join(out_dir, MANIFEST_FILE)
+
+def checkpoint_path(month_name):
+    return os.path.join(out_dir, CHECKPOINT_DIR, f"{month_name}.json")
+
+def open_manifest(resume=False, shard=None, months_info=None):
+    """
+    The stored manifest to resume (same config and shard only), or a new one with the old
+    checkpoints removed. Shard runs also record their shard and the whole run's month plan.
+    """
+    run_hash = config_hash(current_config())
+    shard_info = {"index": shard[0], "count": shard[1]} if shard else None
+    if resume:
+        manifest = read_json(manifest_path())
+        if manifest is None:
+            raise SystemExit(f"No {MANIFEST_FILE} in {out_dir}: nothing to resume")
+        if manifest["config_hash"] != run_hash or manifest.get("shard") != shard_info:
+            raise SystemExit(f"{manifest_path()} was written with a different config or shard; "
+                             f"resume with the same settings or start a new run without --resume")
+        manifest["status"] = "running"
+    else:
+        shutil.rmtree(os.path.join(out_dir, CHECKPOINT_DIR), ignore_errors=True)
+        manifest = new_manifest(run_hash, RANDOM_SEED, current_config())
+        if shard_info:
+            manifest["shard"] = shard_info
+            manifest["plan"] = [plan_entry(mi) for mi in months_info]
+    os.makedirs(os.path.join(out_dir, CHECKPOINT_DIR), exist_ok=True)
+    write_json(manifest_path(), manifest)
+    return manifest
+
+def finish_manifest(manifest, results):
+    for r in results:
+        if r.get("checkpoint") is not None:
+            manifest["months"][r["month_name"]] = r["checkpoint"]
+    manifest["status"] = "complete"
+    write_json(manifest_path(), manifest)
+
+# -------------------------
+# Incremental daily deltas (--append)
+# -------------------------
+# out_dir/generator_state.json records which call ids every generated day owns, as
+# segments {start_date, end_date, first_call_id, calls_per_day}, plus the settings
+# that shape the rows. Appending continues from the high-water mark; re-running a day
+# that is already recorded reuses its ids, so the day's files come out byte-identical.
+STATE_FILE = "generator_state.json"
+STATE_CONFIG_KEYS = ("RANDOM_SEED", "CALLS_PER_DAY", "NUM_CUSTOMERS", "NUM_AGENTS", "ENGINE", "TIME_ORDERED",
+                     "AGENT_ASSIGNMENT", "IVR_MODEL", "IVR_PATH_PROB")
+
+def state_path():
+    return os.path.join(out_dir, STATE_FILE)
+
+def load_state():
+    if not os.path.exists(state_path()):
+        return None
+    with open(state_path(), encoding="utf-8") as f:
+        return json.load(f)
+
+def save_state(state):
+    tmp = state_path() + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, state_path())
+
+def full_run_state(months_info):
+    # a full run owns call ids 1.. from START_DATE to END_DATE; a shard, those of its months
+    return {
+        "config": {k: globals()[k] for k in STATE_CONFIG_KEYS},
+        "segments": [{"start_date": months_info[0]["first_day"].isoformat(),
+                      "end_date": months_info[-1]["last_day"].isoformat(),
+                      "first_call_id": months_info[0]["start_call_id"], "calls_per_day": CALLS_PER_DAY}],
+    }
+
+def high_water_mark(state):
+    """(last generated date, next free call_id)."""
+    last = max(state["segments"], key=lambda s: s["end_date"])
+    start, end = date.fromisoformat(last["start_date"]), date.fromisoformat(last["end_date"])
+    return end, last["first_call_id"] + ((end - start).days + 1) * last["calls_per_day"]
+
+def recorded_first_call_id(state, d):
+    for seg in state["segments"]:
+        start, end = date.fromisoformat(seg["start_date"]), date.fromisoformat(seg["end_date"])
+        if start <= d <= end:
+            return seg["first_call_id"] + (d - start).days * seg["calls_per_day"]
+    return None
+
+def generate_day_worker(task):
+    current_day = task["day"]
+    paths = {t: p for t, p in day_paths(out_dir, current_day, OUTPUT_FORMAT, COMPRESSION).items() if t in TABLES}
+    day_dir = os.path.dirname(next(iter(paths.values())))
+    os.makedirs(day_dir, exist_ok=True)
+    aggregates = Aggregates() if AGGREGATES else None
+    with open_fact_sink(paths) as sink, profiled(current_day.isoformat()):
+        stats = generate_days(sink, [(current_day, task["first_call_id"])], aggregates)
+    if aggregates is not None:
+        # a day is one worker's whole output: its summaries go next to its files
+        aggregates.write(day_dir)
+    print(f"[DONE ] Day {current_day}: calls {task['first_call_id']}..{task['first_call_id'] + CALLS_PER_DAY - 1}")
+    return dict(task, label=f"Day {current_day}", days=stats)
+
+def run_append(start_date=None, end_date=None, days=1, report=None):
+    """Generate only the given days of facts into daily/<date>/ and advance the high-water mark."""
+    state = load_state()
+    if state is None:
+        raise SystemExit(f"No {STATE_FILE} in {out_dir}: run a full generation first")
+    apply_config(dict(current_config(), **state["config"]))
+    last_date, next_call_id = high_water_mark(state)
+    if start_date is None:
+        start_date = last_date + timedelta(days=1)
+    if end_date is None:
+        end_date = start_date + timedelta(days=days - 1)
+    if start_date > last_date + timedelta(days=1):
+        raise SystemExit(f"Gap in call ids: last generated day is {last_date}, cannot start at {start_date}")
+
+    tasks = []
+    for d in daterange(start_date, end_date):
+        first_id = recorded_first_call_id(state, d)
+        if first_id is None:
+            if d <= last_date:
+                raise SystemExit(f"{d} is before the first generated day; no call ids recorded for it")
+            first_id = next_call_id + (d - last_date - timedelta(days=1)).days * CALLS_PER_DAY
+        tasks.append({"day": d, "first_call_id": first_id})
+
+    print(f"Appending {len(tasks)} day(s) {start_date}..{end_date} (high-water mark {last_date}, next call_id {next_call_id})")
+    done = run_pool(generate_day_worker, tasks, lambda t: f"Day {t['day']}", report)
+    if len(done) != len(tasks):
+        raise SystemExit("Some days failed; high-water mark not advanced")
+
+    new_days = [t for t in tasks if t["day"] > last_date]
+    if new_days:
+        state["segments"].append({"start_date": new_days[0]["day"].isoformat(), "end_date": end_date.isoformat(),
+                                  "first_call_id": new_days[0]["first_call_id"], "calls_per_day": CALLS_PER_DAY})
+        save_state(state)
+    return tasks
+
+# -------------------------
+# Library API: rows in memory, no files
+# -------------------------
+# import data_generator as dg
+# dg.apply_config(dict(dg.current_config(), **dg.scale_config(0.1)))
+# for row in dg.iter_calls(month=3): ...            # March of the configured year
+# for day, rows in dg.iter_batches("tickets", day="2025-03-14"): ...
+#
+# Rows are the lists the file sinks write (columns: sinks.TABLE_LAYOUT) and call ids follow
+# the same plan as a full run of the configured START_DATE..END_DATE, so they match its files.
+def day_first_call_id(d):
+    return 1 + (d - START_DATE).days * CALLS_PER_DAY
+
+def period(month=None, day=None, start=None, end=None):
+    """(first, last) day for a month (1-12 of YEAR, or "YYYY-MM"), a day, or start/end; clipped to the run."""
+    if day is not None:
+        start = end = day if isinstance(day, date) else date.fromisoformat(day)
+    elif month is not None:
+        year, m = (YEAR, month) if isinstance(month, int) else map(int, month.split("-"))
+        start = date(year, m, 1)
+        end = date(year, m, calendar.monthrange(year, m)[1])
+    start = max(start or START_DATE, START_DATE)
+    end = min(end or END_DATE, END_DATE)
+    if end < start:
+        raise ValueError(f"{month or day or (start, end)} is outside the configured dates {START_DATE}..{END_DATE}")
+    return start, end
+
+def _day_task(task):
+    current_day, first_call_id = task
+    return generate_day(current_day, first_call_id)
+
+def iter_days(start=None, end=None, workers=1):
+    """
+    Yield (day, {table: rows}) in date order. workers > 1 generates days ahead in a
+    MAX_WORKERS-style pool (EXECUTION_MODE) with at most 2 * workers days in flight.
+    """
+    start, end = period(start=start, end=end)
+    tasks = iter([(d, day_first_call_id(d)) for d in daterange(start, end)])
+    if workers <= 1:
+        for task in tasks:
+            yield task[0], _day_task(task)
+        return
+    if EXECUTION_MODE == "process":
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(current_config(), None))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool as executor:
+        pending = deque((task[0], executor.submit(_day_task, task)) for task in islice(tasks, 2 * workers))
+        while pending:
+            current_day, future = pending.popleft()
+            task = next(tasks, None)
+            if task is not None:
+                pending.append((task[0], executor.submit(_day_task, task)))
+            yield current_day, future.result()
+
+def iter_batches(table, month=None, day=None, start=None, end=None, workers=1):
+    """Yield (day, rows) of one fact table, one batch per day."""
+    if table not in FACT_TABLES:
+        raise ValueError(f"Unknown fact table {table!r}, expected one of {FACT_TABLES}")
+    for current_day, tables in iter_days(*period(month, day, start, end), workers=workers):
+        yield current_day, tables[table]
+
+def iter_rows(table, month=None, day=None, start=None, end=None, workers=1):
+    for _, rows in iter_batches(table, month, day, start, end, workers):
+        yield from rows
+
+def iter_calls(month=None, day=None, **kwargs):
+    return iter_rows("calls", month, day, **kwargs)
+
+def iter_tickets(month=None, day=None, **kwargs):
+    return iter_rows("tickets", month, day, **kwargs)
+
+def iter_recordings(month=None, day=None, **kwargs):
+    return iter_rows("recordings", month, day, **kwargs)
+
+def iter_ivr_paths(month=None, day=None, **kwargs):
+    return iter_rows("ivr_paths", month, day, **kwargs)
+
+def iter_call_events(month=None, day=None, **kwargs):
+    return iter_rows("call_events", month, day, **kwargs)
+
+def run_stream(targets):
+    """
+    Stream fact tables to pipes / stdout ({table: path or "-"}) while they are generated,
+    days in order, without writing the per-month files.
+    """
+    stdout = None
+    if "-" in targets.values():
+        # rows own the real stdout; everything printed (also by worker processes) goes to stderr
+        sys.stdout.flush()
+        data_fd = os.dup(1)
+        os.dup2(2, 1)
+        stdout = io.TextIOWrapper(os.fdopen(data_fd, "wb"), newline='', encoding='utf-8')
+    print(f"Streaming {', '.join(f'{t} -> {p}' for t, p in targets.items())} ({START_DATE}..{END_DATE})")
+    try:
+        with open_stream_sink(targets, stdout) as sink:
+            for current_day, tables in iter_days(workers=MAX_WORKERS):
+                sink.write_day(tables)
+    except BrokenPipeError:
+        print("[STREAM] reader closed the pipe, stopping")
+    finally:
+        if stdout is not None:
+            try:
+                stdout.close()
+            except BrokenPipeError:
+                pass
 
 # -------------------------
 # Finalize: small summaries & finish
 # -------------------------
-print("Writing calls_summary_by_month.csv ...")
-summary_csv = os.path.join(out_dir, "calls_summary_by_month.csv")
-with open(summary_csv, "w", newline='', encoding='utf-8') as f:
-    w = csv.writer(f)
-    w.writerow(["month","calls_generated"])
-    for mi in months_info:
-        w.writerow([mi["month_name"], mi["calls_in_month"]])
-
-print("Generator finished. Output directory:", out_dir)
-print("Calls by month:", os.path.join(out_dir, "calls_by_month"))
-print("Tickets by month:", os.path.join(out_dir, "tickets_by_month"))
-print("Auxiliary per-month files (recordings/ivr/events):", os.path.join(out_dir, "aux_by_month"))
+def write_summary(months_info):
+    print("Writing calls_summary_by_month.csv ...")
+    summary_csv = os.path.join(out_dir, "calls_summary_by_month.csv")
+    with open(summary_csv, "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["month","calls_generated"])
+        for mi in months_info:
+            w.writerow([mi["month_name"], mi["calls_in_month"]])
+
+def write_aggregates(results):
+    """Merge the month workers' aggregates into the day x hour x queue / day x agent summaries."""
+    print("Writing call summaries (day x hour x queue, day x agent) ...")
+    merge_all(r.get("aggregates") for r in results).write(out_dir)
+
+# -------------------------
+# Size / time estimator (--estimate)
+# -------------------------
+CALIBRATION_CUSTOMERS = 2000
+CALIBRATION_AGENTS = 50
+CALIBRATION_CALLS = 20000  # at tiny scale factors, calibrate on more than one day
+
+def estimate(calibration_days=1):
+    """
+    Predict rows, bytes and wall-clock per table for the current config from a short
+    calibration run (a few days of facts, a slice of the dimensions) in a temp dir.
+    """
+    import tempfile
+
+    target = current_config()
+    n_days = (END_DATE - START_DATE).days + 1
+    months = build_months_info()
+    drivers = {"agents": NUM_AGENTS, "customers": NUM_CUSTOMERS, "agent_days": NUM_AGENTS * n_days}
+    if EXECUTION_MODE == "process":
+        parallel = max(1, min(MAX_WORKERS, len(months), os.cpu_count() or 1))
+    else:
+        parallel = 1
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # stay inside the first month so one month worker covers the calibration
+        first_month_days = months[0]["days_in_month"]
+        cal_days = min(first_month_days, max(calibration_days, -(-CALIBRATION_CALLS // CALLS_PER_DAY)))
+        apply_config(dict(target, out_dir=tmp, END_DATE=START_DATE + timedelta(days=cal_days - 1),
+                          NUM_CUSTOMERS=min(NUM_CUSTOMERS, CALIBRATION_CUSTOMERS),
+                          NUM_AGENTS=min(NUM_AGENTS, CALIBRATION_AGENTS)))
+        try:
+            cal_drivers = {"agents": NUM_AGENTS, "customers": NUM_CUSTOMERS, "agent_days": NUM_AGENTS * cal_days}
+            for name, (writer, driver) in REFERENCE_TABLES.items():
+                if name not in TABLES:
+                    continue
+                t0 = perf_counter()
+                writer()
+                elapsed = perf_counter() - t0
+                path = table_path(name)
+                with open(path, encoding="utf-8") as f:
+                    rows = sum(1 for _ in f) - 1
+                ratio = drivers[driver] / cal_drivers[driver] if driver else 1
+                report[name] = {"rows": round(rows * ratio), "bytes": round(os.path.getsize(path) * ratio),
+                                "seconds": elapsed * ratio}
+
+            first_month = build_months_info()[0]
+            paths = month_paths(tmp, first_month["month_name"], OUTPUT_FORMAT, COMPRESSION)
+            fact_tables = [t for t in FACT_TABLES if t in TABLES and t in paths]
+            if fact_tables:
+                ensure_output_dirs(tmp)
+                generate_day(START_DATE, 1)  # warm-up: lazy imports, caches
+                t0 = perf_counter()
+                generate_month_worker(first_month)
+                elapsed = perf_counter() - t0
+                sizes = {t: os.path.getsize(paths[t]) for t in fact_tables}
+                ratio = n_days / cal_days
+                for t in fact_tables:
+                    rows = 0
+                    if OUTPUT_FORMAT != "parquet":
+                        with open_text(paths[t]) as f:
+                            rows = sum(1 for _ in f) - 1
+                    else:
+                        import pyarrow.parquet as pq
+                        rows = pq.ParquetFile(paths[t]).metadata.num_rows
+                    # the fact tables are generated together: split the time by output bytes
+                    share = sizes[t] / max(1, sum(sizes.values()))
+                    report[t] = {"rows": round(rows * ratio), "bytes": round(sizes[t] * ratio),
+                                 "seconds": elapsed * ratio * share / parallel}
+        finally:
+            apply_config(target)
+    return report
+
+def print_estimate(report):
+    print(f"Estimate for scale factor {SCALE_FACTOR} ({START_DATE} .. {END_DATE}, "
+          f"engine={ENGINE}, format={OUTPUT_FORMAT}, workers={MAX_WORKERS} {EXECUTION_MODE}):")
+    print(f"{'table':<16}{'rows':>16}{'MB':>12}{'seconds':>12}")
+    for name, r in report.items():
+        print(f"{name:<16}{r['rows']:>16,}{r['bytes'] / 1e6:>12,.1f}{r['seconds']:>12,.1f}")
+    print(f"{'TOTAL':<16}{sum(r['rows'] for r in report.values()):>16,}"
+          f"{sum(r['bytes'] for r in report.values()) / 1e6:>12,.1f}"
+          f"{sum(r['seconds'] for r in report.values()):>12,.1f}")
+
+# -------------------------
+# Command line
+# -------------------------
+def parse_args(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(description="Generate the call-center dataset.")
+    p.add_argument("-o", "--out-dir", default=out_dir, help="output directory (default: %(default)s)")
+    p.add_argument("-s", "--scale-factor", type=float, default=SCALE_FACTOR,
+                   help="1 = 37,500 calls/day, 5,000 customers, 150 agents (default: %(default)s)")
+    p.add_argument("--tiny", action="store_true", help="CI-sized dataset, same as --scale-factor 0.001")
+    p.add_argument("--start-date", type=date.fromisoformat, help=f"first call date (default: {START_DATE})")
+    p.add_argument("--end-date", type=date.fromisoformat, help=f"last call date (default: {END_DATE})")
+    p.add_argument("--tables", default=",".join(TABLES),
+                   help="comma separated tables to write (default: all): " + ",".join(ALL_TABLES))
+    p.add_argument("--seed", type=int, default=RANDOM_SEED)
+    p.add_argument("--workers", type=int, default=MAX_WORKERS)
+    p.add_argument("--execution-mode", choices=("process", "thread"), default=EXECUTION_MODE)
+    p.add_argument("--engine", choices=("python", "numpy"), default=ENGINE)
+    p.add_argument("--time-ordered", action="store_true",
+                   help="arrivals in time order: call/ticket/IVR/event ids and rows follow the timestamps")
+    p.add_argument("--agent-assignment", choices=("uniform", "roster"), default=AGENT_ASSIGNMENT,
+                   help="roster: calls go to agents on shift (shifts.csv pattern), weighted by skill for the "
+                        "queue; calls outside every shift are unanswered (default: %(default)s)")
+    p.add_argument("--ivr-model", choices=("sampled", "tree"), default=IVR_MODEL,
+                   help="tree: every call with an IVR path walks the menu tree (ivr.py) to a leaf that picks "
+                        "its queue (default: %(default)s)")
+    p.add_argument("--ivr-path-prob", type=float, default=IVR_PATH_PROB,
+                   help="share of calls with IVR path rows (default: %(default)s; answered calls only "
+                        "with --ivr-model sampled)")
+    p.add_argument("--dimension-engine", choices=("faker", "pools"), default=DIMENSION_ENGINE,
+                   help="customers/agents: Faker per row, or vectorized name pools for 10M+ customers")
+    p.add_argument("--format", choices=OUTPUT_FORMATS, default=OUTPUT_FORMAT,
+                   help="load: DDL column order for bulk_insert.sql, without call_events (no DDL table) "
+                        "(default: %(default)s)")
+    p.add_argument("--compression", choices=COMPRESSIONS, default=COMPRESSION,
+                   help="csv only: write .csv.gz / .csv.zst streams (default: %(default)s)")
+    p.add_argument("--compression-level", type=int, default=COMPRESSION_LEVEL)
+    p.add_argument("--compression-threads", type=int, default=COMPRESSION_THREADS,
+                   help="compression threads per month worker (default: %(default)s)")
+    p.add_argument("--writer-queue", type=int, default=WRITER_QUEUE_DEPTH, metavar="DAYS",
+                   help="days of rows queued for each worker's writer thread; 0 = write on the generating "
+                        "thread (default: %(default)s)")
+    p.add_argument("--estimate", action="store_true",
+                   help="predict rows / bytes / wall-clock per table from a short calibration run, write nothing")
+    p.add_argument("--append", action="store_true",
+                   help="daily delta: generate only the given dates (default: the day after the high-water mark) "
+                        "into daily/<date>/, continuing ids from generator_state.json")
+    p.add_argument("--no-aggregates", action="store_true",
+                   help="skip the day x hour x queue / day x agent call summaries")
+    p.add_argument("--progress-interval", type=float, default=PROGRESS_INTERVAL,
+                   help="seconds between live [PROGRESS] lines, 0 = off (default: %(default)s)")
+    p.add_argument("--profile", type=float, nargs="?", const=0.005, default=PROFILE_INTERVAL, metavar="INTERVAL",
+                   help=f"sample each worker's day loop every INTERVAL seconds (default 0.005) into "
+                        f"<out-dir>/{PROFILE_DIR}/<month>.folded")
+    p.add_argument("--stream", action="append", default=[], metavar="TABLE=PATH",
+                   help="stream a fact table as CSV into a named pipe or '-' (stdout) instead of "
+                        "per-month files; repeatable")
+    p.add_argument("--resume", action="store_true",
+                   help=f"continue an interrupted run in --out-dir from its {MANIFEST_FILE} and month checkpoints "
+                        "(same settings): finished files are kept, partial months continue after their last day")
+    p.add_argument("--shard", type=parse_shard, metavar="I/N",
+                   help="generate only shard I of N (contiguous whole months, same ids as a single-node run); "
+                        "merge the shard directories with shards.py")
+    p.add_argument("--days", type=int, default=1, help="with --append and no --end-date: number of days (default: 1)")
+    args = p.parse_args(argv)
+    if not args.append:
+        args.start_date = args.start_date or START_DATE
+        args.end_date = args.end_date or END_DATE
+
+    tables = tuple(t.strip() for t in args.tables.split(",") if t.strip())
+    unknown = set(tables) - set(ALL_TABLES)
+    if unknown:
+        p.error(f"unknown tables: {', '.join(sorted(unknown))}")
+    if args.start_date and args.end_date and args.end_date < args.start_date:
+        p.error("--end-date is before --start-date")
+    args.stream = dict(s.split("=", 1) for s in args.stream)
+    if set(args.stream) - set(FACT_TABLES):
+        p.error(f"--stream takes fact tables: {', '.join(FACT_TABLES)}")
+    if not 0 <= args.ivr_path_prob <= 1:
+        p.error("--ivr-path-prob is a probability between 0 and 1")
+    if args.writer_queue < 0:
+        p.error("--writer-queue is a number of days, 0 or more")
+    if args.compression != "none" and args.format != "csv":
+        p.error("--compression applies to --format csv only")
+    if args.resume and (args.append or args.stream or args.estimate):
+        p.error("--resume continues a full run; it does not combine with --append, --stream or --estimate")
+    if args.shard and (args.append or args.stream or args.estimate):
+        p.error("--shard splits a full run; it does not combine with --append, --stream or --estimate")
+    if args.format == "load" and "call_events" in tables and not args.stream:
+        # SQL Script/DDL Code.sql has no table for call events, so the load layout has no file for them
+        print("[WARN ] --format load writes no call_events: the DDL has no table for them "
+              "(use --format csv or --stream call_events=PATH for them)")
+        tables = tuple(t for t in tables if t != "call_events")
+
+    cfg = scale_config(0.001 if args.tiny else args.scale_factor)
+    cfg.update({
+        "out_dir": args.out_dir,
+        "YEAR": (args.start_date or START_DATE).year,
+        "START_DATE": args.start_date or START_DATE,
+        "END_DATE": args.end_date or END_DATE,
+        "TABLES": tables,
+        "RANDOM_SEED": args.seed,
+        "MAX_WORKERS": args.workers,
+        "EXECUTION_MODE": args.execution_mode,
+        "ENGINE": args.engine,
+        "TIME_ORDERED": args.time_ordered,
+        "AGENT_ASSIGNMENT": args.agent_assignment,
+        "IVR_MODEL": args.ivr_model,
+        "IVR_PATH_PROB": args.ivr_path_prob,
+        "DIMENSION_ENGINE": args.dimension_engine,
+        "OUTPUT_FORMAT": args.format,
+        "COMPRESSION": args.compression,
+        "COMPRESSION_LEVEL": args.compression_level,
+        "COMPRESSION_THREADS": args.compression_threads,
+        "WRITER_QUEUE_DEPTH": args.writer_queue,
+        "PROGRESS_INTERVAL": args.progress_interval,
+        "PROFILE_INTERVAL": args.profile,
+        "AGGREGATES": not args.no_aggregates,
+    })
+    return cfg, args
+
+
+def main(argv=None):
+    cfg, args = parse_args(argv)
+    apply_config(cfg)
+    if args.estimate:
+        print_estimate(estimate())
+        return
+    if args.stream:
+        run_stream(args.stream)
+        return
+    report = RunReport(current_config())
+    if args.append:
+        run_append(args.start_date, args.end_date, args.days, report)
+        report.write(os.path.join(out_dir, RUN_REPORT))
+        report.print_summary()
+        return
+
+    os.makedirs(out_dir, exist_ok=True)
+    months_info = build_months_info()
+    manifest = open_manifest(args.resume, args.shard, months_info)
+    if args.shard is None or args.shard[0] == 1:
+        # identical on every shard: the first one writes them
+        write_reference_tables(report, manifest)
+    print("Preparing monthly generation plan...")
+    if args.shard:
+        months_info = shard_months(months_info, *args.shard)
+        if not months_info:
+            raise SystemExit(f"Shard {args.shard[0]}/{args.shard[1]} has no months: "
+                             f"the run has {len(build_months_info())}, use at most that many shards")
+        print(f"Shard {args.shard[0]}/{args.shard[1]}: months {months_info[0]['month_name']}.."
+              f"{months_info[-1]['month_name']}, call ids {months_info[0]['start_call_id']}.."
+              f"{months_info[-1]['end_call_id']}")
+    results = []
+    if any(t in TABLES for t in FACT_TABLES):
+        ensure_output_dirs(out_dir)
+        results = run_month_workers(months_info, report, manifest, args.resume)
+        failed = len(months_info) - len(results)
+        if failed:
+            report.write(os.path.join(out_dir, RUN_REPORT))
+            report.print_summary()
+            raise SystemExit(f"{failed} month(s) failed; their files are kept up to the last finished day. "
+                             f"Run again with --resume to continue.")
+        save_state(full_run_state(months_info))
+        if AGGREGATES:
+            write_aggregates(results)
+    write_summary(months_info)
+    finish_manifest(manifest, results)
+    report.write(os.path.join(out_dir, RUN_REPORT))
+    report.print_summary()
+    if OUTPUT_FORMAT == "load":
+        from bulk_load import write_load_layout
+        print("Writing bulk-load layout (format files + bulk_insert.sql) ...")
+        write_load_layout(out_dir)
+
+    print("Generator finished. Output directory:", out_dir)
+    print("Calls by month:", os.path.join(out_dir, "calls_by_month"))
+    print("Tickets by month:", os.path.join(out_dir, "tickets_by_month"))
+    print("Auxiliary per-month files (recordings/ivr/events):", os.path.join(out_dir, "aux_by_month"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Pool-based dimension engine for customers and agents (DIMENSION_ENGINE = "pools").
+
+Faker is called a few thousand times up front to build name / email-domain pools;
+rows are then drawn from those pools in NumPy batches, one chunk of ids at a time,
+and the chunks are generated in parallel and written in id order. Each chunk is
+seeded from (seed, chunk index) with a fixed chunk size, so the output depends on
+the seed only, not on the worker count.
+
+Emails and agent usernames carry the row id, which keeps them unique at any size.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+CHUNK_ROWS = 250000
+POOL_DRAWS = 20000
+
+# Faker en_US phone layouts: (area, exchange, line, extension)
+PHONE_FORMATS = [
+    "{0}-{1}-{2:04d}",
+    "({0}){1}-{2:04d}",
+    "{0}.{1}.{2:04d}",
+    "{0}{1}{2:04d}",
+    "+1-{0}-{1}-{2:04d}",
+    "{0}-{1}-{2:04d}x{3}",
+    "001-{0}-{1}-{2:04d}x{3}",
+    "+1-{0}-{1}-{2:04d}x{3}",
+]
+COUNTRIES = ["US","CA","GB","AU","EG","FR","ES","DE"]
+AGENT_STATUSES = ["Active","On Leave","Training","Inactive"]
+AGENT_STATUS_WEIGHTS = [0.8,0.05,0.1,0.05]
+
+
+def build_pools(seed):
+    """Distinct Faker names and free-mail domains, sorted so the pools are seed-deterministic."""
+    from faker import Faker
+    fk = Faker()
+    fk.seed_instance(seed)
+    # alphabetic only: no CSV quoting needed and "<name><id>" stays unique
+    first = sorted({n for n in (fk.first_name() for _ in range(POOL_DRAWS)) if n.isalpha()})
+    last = sorted({n for n in (fk.last_name() for _ in range(POOL_DRAWS)) if n.isalpha()})
+    domains = sorted({fk.free_email_domain() for _ in range(POOL_DRAWS // 20)})
+    return {"first": first, "last": last, "domains": domains}
+
+
+def _phones(rng, n):
+    area = rng.integers(201, 990, n).tolist()
+    exchange = rng.integers(200, 1000, n).tolist()
+    line = rng.integers(0, 10000, n).tolist()
+    ext = rng.integers(10, 100000, n).tolist()
+    fmt = [PHONE_FORMATS[i].format for i in rng.integers(0, len(PHONE_FORMATS), n).tolist()]
+    return [f(a, b, c, e) for f, a, b, c, e in zip(fmt, area, exchange, line, ext)]
+
+
+def _date_table(start, days):
+    return [(start + timedelta(days=i)).isoformat() for i in range(days + 1)]
+
+
+def _customer_chunk(task):
+    import numpy as np
+    start_id, end_id, seed, pools, year = task
+    rng = np.random.default_rng(seed)
+    n = end_id - start_id + 1
+    first, last, domains = pools["first"], pools["last"], pools["domains"]
+    first_l = [s.lower() for s in first]
+    last_l = [s.lower() for s in last]
+    dates = _date_table(date(year - 5, 1, 1), 365 * 5)
+
+    fi = rng.integers(0, len(first), n).tolist()
+    li = rng.integers(0, len(last), n).tolist()
+    di = rng.integers(0, len(domains), n).tolist()
+    created = rng.integers(0, len(dates), n).tolist()
+    country = rng.integers(0, len(COUNTRIES), n).tolist()
+    phones = _phones(rng, n)
+
+    lines = [
+        f"{cid},{first[a]},{last[b]},{first_l[a]}.{last_l[b]}{cid}@{domains[c]},{ph},{dates[d]},{COUNTRIES[e]}"
+        for cid, a, b, c, ph, d, e in zip(range(start_id, end_id + 1), fi, li, di, phones, created, country)
+    ]
+    # csv.writer line endings, like the Faker engine
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def _agent_chunk(task):
+    import numpy as np
+    start_id, end_id, seed, pools, _ = task
+    rng = np.random.default_rng(seed)
+    n = end_id - start_id + 1
+    first, last = pools["first"], pools["last"]
+    first_l = [s.lower() for s in first]
+    last_l = [s.lower() for s in last]
+    dates = _date_table(date(2016, 1, 1), 365 * 9)
+
+    fi = rng.integers(0, len(first), n).tolist()
+    li = rng.integers(0, len(last), n).tolist()
+    hired = rng.integers(0, len(dates), n).tolist()
+    status = rng.choice(len(AGENT_STATUSES), n, p=AGENT_STATUS_WEIGHTS).tolist()
+    phones = _phones(rng, n)
+
+    lines = [
+        f"{aid},{first[a]},{last[b]},{first_l[a][0]}{last_l[b]}{aid},{ph},"
+        f"{first_l[a]}.{last_l[b]}{aid}@example.com,{dates[h]},{AGENT_STATUSES[s]}"
+        for aid, a, b, ph, h, s in zip(range(start_id, end_id + 1), fi, li, phones, hired, status)
+    ]
+    return ("\r\n".join(lines) + "\r\n").encode("utf-8")
+
+
+def write_chunked(path, header, chunk_fn, num_rows, seed, year, workers, pool_seed):
+    pools = build_pools(pool_seed)
+    tasks = [
+        (start, min(num_rows, start + CHUNK_ROWS - 1), (seed, i), pools, year)
+        for i, start in enumerate(range(1, num_rows + 1, CHUNK_ROWS))
+    ]
+    with open(path, "wb") as f:
+        f.write((",".join(header) + "\r\n").encode("utf-8"))
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                # map() yields in submission order, so chunks land in id order
+                for chunk in executor.map(chunk_fn, tasks):
+                    f.write(chunk)
+        else:
+            for task in tasks:
+                f.write(chunk_fn(task))
+
+
+def write_customers_pools(path, num_customers, seed, year, workers=os.cpu_count()):
+    write_chunked(path, ["customer_id", "first_name", "last_name", "email", "phone", "created_date", "country"],
+                  _customer_chunk, num_customers, seed, year, workers, pool_seed=seed)
+
+
+def write_agents_pools(path, num_agents, seed, workers=os.cpu_count()):
+    write_chunked(path, ["agent_id", "first_name", "last_name", "username", "phone", "email", "hire_date", "status"],
+                  _agent_chunk, num_agents, seed, None, workers, pool_seed=seed)
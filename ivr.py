@@ -0,0 +1,131 @@
+"""
+IVR menu tree and path tables for data_generator.py (IVR_MODEL = "tree").
+
+IVR_NODES is the menu hierarchy (written as ivr_menu_nodes.csv). IvrTree loads it
+once and precomputes:
+- per menu node, its options in menu order: DTMF digit ("1", "2", ...) -> child, with
+  the transition weights of TRANSITION_WEIGHTS
+- per menu node, a dwell-time table: the seconds from entering the node to the next
+  hop (its prompt and its options read out, then the caller's reaction)
+- the queues each leaf routes to: its action ("transfer_<line>_...") names a skill, see
+  LEAF_SKILLS, and the call goes to a queue with that primary skill
+- every root-to-leaf path with every combination of dwell times and every queue of the
+  leaf, with its probability, so a call's complete path and queue are one weighted draw
+  (in batches: a whole day at once)
+
+A path gives one ivr_paths row per visited node: node_id, the digit pressed there
+(blank on the leaf, which transfers the call) and the seconds after the call's start
+at which the node was entered.
+"""
+import csv
+
+NODE_COLUMNS = ["node_id", "parent_node_id", "menu_text", "action_"]
+
+# Define IVR Menu Nodes (hierarchy)
+IVR_NODES = [
+    {"node_id": 1, "parent_node_id": None, "menu_text": "Welcome to our call center. Please choose an option.", "action_": "play_menu"},
+    {"node_id": 2, "parent_node_id": 1, "menu_text": "For Sales, press 1", "action_": "goto_sales"},
+    {"node_id": 3, "parent_node_id": 1, "menu_text": "For Support, press 2", "action_": "goto_support"},
+    {"node_id": 4, "parent_node_id": 1, "menu_text": "For Billing, press 3", "action_": "goto_billing"},
+
+    # Sales submenu
+    {"node_id": 5, "parent_node_id": 2, "menu_text": "New Orders", "action_": "transfer_sales_new"},
+    {"node_id": 6, "parent_node_id": 2, "menu_text": "Existing Orders", "action_": "transfer_sales_existing"},
+
+    # Support submenu
+    {"node_id": 7, "parent_node_id": 3, "menu_text": "Technical Issues", "action_": "transfer_support_tech"},
+    {"node_id": 8, "parent_node_id": 3, "menu_text": "Account Issues", "action_": "transfer_support_account"},
+
+    # Billing submenu
+    {"node_id": 9, "parent_node_id": 4, "menu_text": "Invoice Questions", "action_": "transfer_billing_invoice"},
+    {"node_id": 10, "parent_node_id": 4, "menu_text": "Payment Issues", "action_": "transfer_billing_payment"},
+]
+
+# node_id -> relative weight among its siblings (default 1): support is the busiest line
+TRANSITION_WEIGHTS = {2: 3, 3: 5, 4: 2, 5: 2, 6: 3, 7: 3, 8: 2}
+WORDS_PER_SECOND = 2.5           # prompt speech rate
+REACTION_SECONDS = range(1, 7)   # caller's reaction after the options, uniform
+# line in a leaf's action ("transfer_<line>_...") -> skill_name of the queues it transfers to
+LEAF_SKILLS = {"sales": "Sales", "support": "Technical Support", "billing": "Billing"}
+
+
+def write_nodes(path, nodes=IVR_NODES):
+    with open(path, "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(NODE_COLUMNS)
+        for node in nodes:
+            w.writerow(["" if node[c] is None else node[c] for c in NODE_COLUMNS])
+
+
+def _prompt_seconds(*texts):
+    return round(sum(len(t.split()) for t in texts) / WORDS_PER_SECOND)
+
+
+def leaf_skill(action, skills):
+    """skill_id (1-based position in skills) that a leaf action transfers to, or None."""
+    parts = action.split("_")
+    name = LEAF_SKILLS.get(parts[1]) if parts[0] == "transfer" and len(parts) > 1 else None
+    return skills.index(name) + 1 if name in skills else None
+
+
+class IvrTree:
+    """
+    Transition, dwell and path tables of a menu tree. queue_skills is {queue_id: primary_skill_id}
+    and skills the skill names by id - 1; a leaf routes to the queues of its action's skill,
+    equally likely, or to any queue when none has that skill.
+    """
+
+    def __init__(self, nodes, queue_skills, skills, weights=TRANSITION_WEIGHTS):
+        by_id = {n["node_id"]: n for n in nodes}
+        roots = [n["node_id"] for n in nodes if n["parent_node_id"] is None]
+        if len(roots) != 1:
+            raise ValueError(f"IVR tree needs exactly one root node, found {len(roots)}")
+        self.root = roots[0]
+        children = {nid: [] for nid in by_id}
+        for n in nodes:
+            if n["parent_node_id"] is not None:
+                children[n["parent_node_id"]].append(n["node_id"])
+
+        # node -> [(digit, child, probability)], in menu order
+        self.options = {}
+        # node -> dwell seconds, equally likely
+        self.dwell = {}
+        for nid, kids in children.items():
+            if not kids:
+                continue
+            total = sum(weights.get(k, 1) for k in kids)
+            self.options[nid] = [(str(d), k, weights.get(k, 1) / total) for d, k in enumerate(kids, 1)]
+            prompt = _prompt_seconds(by_id[nid]["menu_text"], *(by_id[k]["menu_text"] for k in kids))
+            self.dwell[nid] = [prompt + r for r in REACTION_SECONDS]
+        # leaf -> the queues it transfers to
+        self.queues = {}
+        for nid in by_id:
+            if not children[nid]:
+                skill = leaf_skill(by_id[nid]["action_"], skills)
+                self.queues[nid] = [q for q, s in queue_skills.items() if s == skill] or list(queue_skills)
+
+        # every path with every dwell combination and queue: (queue_id, ((node_id, digit, offset), ...))
+        self.paths, probs = [], []
+        self._expand(self.root, (), 0, 1.0, probs)
+        self.cum_weights = []
+        acc = 0.0
+        for p in probs:
+            acc += p
+            self.cum_weights.append(acc)
+        self.depth = max(len(hops) for _, hops in self.paths)
+
+    def _expand(self, node, hops, offset, prob, probs):
+        if node not in self.options:
+            queues = self.queues[node]
+            for queue_id in queues:
+                self.paths.append((queue_id, hops + ((node, "", offset),)))
+                probs.append(prob / len(queues))
+            return
+        dwell = self.dwell[node]
+        for digit, child, p in self.options[node]:
+            for seconds in dwell:
+                self._expand(child, hops + ((node, digit, offset),), offset + seconds, prob * p / len(dwell), probs)
+
+    def draw(self, rng, k):
+        """k complete paths from a random.Random, as (queue_id, hops) entries of self.paths."""
+        return rng.choices(self.paths, cum_weights=self.cum_weights, k=k)
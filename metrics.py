@@ -0,0 +1,265 @@
+"""
+Run metrics for data_generator.py.
+
+- per-day stats from the month / day workers: rows per table, rows/sec and the time
+  split between generating rows, formatting them (CSV text / Arrow arrays) and
+  writing them (see the sinks' `timings`)
+- live progress: workers send their day stats over an event queue; ProgressMonitor
+  prints done days, throughput, busy workers, queued tasks and an ETA every few seconds
+- RunReport: reference-table stage timings, pool utilization, per-month / per-day
+  numbers, stragglers and failures, written as run_report.json
+- SamplingProfiler: optional sampling profiler for the hot loop of a worker;
+  writes collapsed stacks (<out_dir>/profile/<label>.folded) for flamegraph.pl / speedscope
+"""
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from statistics import median
+
+PROGRESS_INTERVAL = 5.0  # seconds between live progress lines
+STRAGGLER_FACTOR = 1.5  # tasks slower than this times the median are reported as stragglers
+PROFILE_DIR = "profile"
+
+# queue the workers report to (multiprocessing or queue.Queue); None = no live progress
+_events = None
+
+
+def set_event_queue(events):
+    global _events
+    _events = events
+
+
+def emit(kind, **fields):
+    if _events is not None:
+        _events.put(dict(fields, kind=kind, pid=os.getpid()))
+
+
+def count_lines(path):
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+
+
+def day_stats(day, rows, generate_seconds, format_seconds, write_seconds, writer_queue_wait_seconds=0.0):
+    """
+    rows: {table: row count}. With a writer thread (sinks.AsyncSink) format / write are its
+    time on the day and writer_queue_wait_seconds the generating thread's wait for room in
+    the queue; "seconds" counts the work (generate + format + write), not the wait.
+    """
+    seconds = generate_seconds + format_seconds + write_seconds
+    return {"day": day.isoformat(), "rows": rows, "seconds": seconds,
+            "rows_per_sec": sum(rows.values()) / seconds if seconds else 0.0,
+            "generate_seconds": generate_seconds, "format_seconds": format_seconds, "write_seconds": write_seconds,
+            "writer_queue_wait_seconds": writer_queue_wait_seconds}
+
+
+def summarize(days):
+    """Totals over a list of day stats."""
+    rows = Counter()
+    for d in days:
+        rows.update(d["rows"])
+    out = {"days": len(days), "rows": dict(rows)}
+    for key in ("seconds", "generate_seconds", "format_seconds", "write_seconds", "writer_queue_wait_seconds"):
+        out[key] = sum(d[key] for d in days)
+    out["rows_per_sec"] = sum(rows.values()) / out["seconds"] if out["seconds"] else 0.0
+    return out
+
+
+def run_task(worker, task):
+    """Pool entry point: runs worker(task) and adds when / where it ran."""
+    started = time.time()
+    emit("task_start")
+    result = worker(task)
+    return {"result": result, "started": started, "finished": time.time(), "pid": os.getpid(),
+            "thread": threading.current_thread().name}
+
+
+class ProgressMonitor:
+    """Consumes worker events in a background thread and prints live progress."""
+
+    def __init__(self, events, total_days, total_tasks, workers, interval=PROGRESS_INTERVAL):
+        self.events = events
+        self.total_days = total_days
+        self.total_tasks = total_tasks
+        self.workers = workers
+        self.interval = interval
+        self.days = 0
+        self.rows = 0
+        self.started_tasks = 0
+        self.finished_tasks = 0
+        self.t0 = time.perf_counter()
+        self._last = (self.t0, 0)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def task_finished(self):
+        self.finished_tasks += 1
+
+    def _run(self):
+        next_print = time.perf_counter() + self.interval
+        while not self._stop.is_set():
+            try:
+                event = self.events.get(timeout=0.2)
+            except Exception:  # queue.Empty for both queue kinds
+                event = None
+            if event is None:
+                pass
+            elif event["kind"] == "task_start":
+                self.started_tasks += 1
+            elif event["kind"] == "day":
+                self.days += 1
+                self.rows += sum(event["rows"].values())
+            if time.perf_counter() >= next_print:
+                self.print_line()
+                next_print = time.perf_counter() + self.interval
+
+    def print_line(self):
+        now = time.perf_counter()
+        elapsed = now - self.t0
+        last_t, last_rows = self._last
+        recent = (self.rows - last_rows) / (now - last_t) if now > last_t else 0.0
+        self._last = (now, self.rows)
+        rate = self.rows / elapsed if elapsed else 0.0
+        eta = elapsed / self.days * (self.total_days - self.days) if self.days else None
+        busy = self.started_tasks - self.finished_tasks
+        queued = self.total_tasks - self.started_tasks
+        print(f"[PROGRESS] days {self.days}/{self.total_days} ({self.days / max(1, self.total_days):.0%}) | "
+              f"{self.rows:,} rows | {rate:,.0f} rows/s (last {now - last_t:.0f}s: {recent:,.0f}) | "
+              f"busy workers {busy}/{self.workers}, queued {queued} | "
+              f"ETA {'?' if eta is None else time.strftime('%H:%M:%S', time.gmtime(eta))}", flush=True)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        # drain what arrived after the last poll
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except Exception:
+                break
+            if event["kind"] == "day":
+                self.days += 1
+                self.rows += sum(event["rows"].values())
+
+
+class RunReport:
+    """Collects the metrics of one data_generator run and writes them as JSON."""
+
+    def __init__(self, config):
+        self.config = {k: v if isinstance(v, (int, float, str, bool, type(None))) else str(v)
+                       for k, v in config.items()}
+        self.started = time.time()
+        self.t0 = time.perf_counter()
+        self.stages = {}
+        self.pools = {}
+        self.failures = []
+
+    @contextmanager
+    def stage(self, name, path):
+        """Times one reference-table writer that produces path."""
+        t0 = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - t0
+        rows = max(0, count_lines(path) - 1)
+        self.stages[name] = {"seconds": seconds, "rows": rows, "bytes": os.path.getsize(path),
+                             "rows_per_sec": rows / seconds if seconds else 0.0}
+
+    def add_pool(self, name, workers, started, finished, tasks, failures):
+        """tasks: run_task() results whose "result" holds a "days" list of day_stats."""
+        wall = finished - started
+        busy = sum(t["finished"] - t["started"] for t in tasks)
+        task_entries = []
+        for t in sorted(tasks, key=lambda t: t["started"]):
+            res = t["result"]
+            entry = {"task": res.get("label"), "worker": f"{t['pid']}/{t['thread']}",
+                     "queue_wait_seconds": t["started"] - started, "wall_seconds": t["finished"] - t["started"]}
+            # "seconds" here: time inside the day loop (generate + format + write)
+            entry.update(summarize(res.get("days", [])))
+            entry["days"] = res.get("days", [])
+            task_entries.append(entry)
+        seconds = [e["wall_seconds"] for e in task_entries]
+        cut = median(seconds) * STRAGGLER_FACTOR if seconds else 0
+        all_days = [d for e in task_entries for d in e["days"]]
+        self.pools[name] = {
+            "wall_seconds": wall,
+            "workers": workers,
+            "tasks": len(task_entries) + len(failures),
+            # share of worker slots busy with a task over the pool's wall time
+            "worker_utilization": busy / (wall * min(workers, max(1, len(task_entries)))) if wall else 0.0,
+            "totals": summarize(all_days),
+            "stragglers": [e["task"] for e in task_entries if len(seconds) > 1 and e["wall_seconds"] > cut],
+            "tasks_detail": task_entries,
+        }
+        self.failures.extend(failures)
+
+    def as_dict(self):
+        return {"started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "wall_seconds": time.perf_counter() - self.t0, "config": self.config,
+                "reference_stages": self.stages, "pools": self.pools, "failures": self.failures}
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def print_summary(self):
+        for name, pool in self.pools.items():
+            totals = pool["totals"]
+            busy = totals["seconds"] or 1.0
+            print(f"[METRICS] {name}: {sum(totals['rows'].values()):,} rows in {pool['wall_seconds']:.1f}s "
+                  f"({sum(totals['rows'].values()) / max(pool['wall_seconds'], 1e-9):,.0f} rows/s), "
+                  f"generate {totals['generate_seconds'] / busy:.0%} / format {totals['format_seconds'] / busy:.0%} "
+                  f"/ write {totals['write_seconds'] / busy:.0%}"
+                  + (f" (+ writer queue wait {totals['writer_queue_wait_seconds'] / busy:.0%})"
+                     if totals["writer_queue_wait_seconds"] else "") + ", "
+                  f"worker utilization {pool['worker_utilization']:.0%}")
+            if pool["stragglers"]:
+                print(f"[METRICS] {name} stragglers: {', '.join(map(str, pool['stragglers']))}")
+        for f in self.failures:
+            print(f"[METRICS] failed: {f['task']}: {f['error']}")
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread every `interval` seconds from a background thread
+    and writes the counts as collapsed stacks ("a;b;c <count>" lines).
+    """
+
+    def __init__(self, path, interval=0.005):
+        self.path = path
+        self.interval = interval
+        self.samples = Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            for stack, n in self.samples.most_common():
+                f.write(f"{stack} {n}\n")
+        return False
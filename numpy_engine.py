@@ -0,0 +1,290 @@
+"""
+Vectorized (NumPy) day engine for data_generator.py.
+
+Draws a whole day of calls at once as arrays instead of ~15 random.* calls per row
+and hands every table to the sinks as a sinks.Columns batch: the columns are formatted
+as a whole (CSV text, Arrow arrays) and no per-row tuples are built. Iterated, a batch
+gives the same rows the Python engine produces: calls, tickets, recordings, ivr_paths
+and call_events keep identical schemas.
+
+The draws come from numpy.random.default_rng(day_seed), so output is deterministic
+per seed but is a different (equally distributed) stream than ENGINE = "python".
+"""
+import numpy as np
+
+from sinks import Columns
+
+TICKET_STATUSES = np.array(["Open", "In Progress", "Resolved", "Closed", "Escalated"])
+PRIORITIES_ALL = np.array(["Low", "Medium", "High", "Critical"])
+TRANSCRIPTION_STATUSES = np.array(["Pending", "Completed", "Failed"])
+# integer columns where 0 is a blank cell (no campaign, unanswered, not transferred, ...), see sinks.Columns
+CALL_BLANKS = (3, 9, 10, 11, 12, 14, 15)
+EVENT_BLANKS = (4, 5, 6)
+
+
+def _iso(base, seconds):
+    return np.datetime_as_string(base + seconds.astype("timedelta64[s]"), unit="s")
+
+
+def _sorted_arrivals(rng, n, hour_cdf):
+    # ascending call times from the hourly rate without a sort (see data_generator.sorted_arrivals)
+    gaps = rng.exponential(1.0, n + 1)
+    u = np.cumsum(gaps)[:n] / gaps.sum()
+    cdf = np.asarray(hour_cdf)
+    hours = np.minimum(np.searchsorted(cdf, u, side="right") - 1, 23)
+    frac = (u - cdf[hours]) / (cdf[hours + 1] - cdf[hours])
+    return hours * 3600 + np.minimum(3599, (frac * 3600).astype(np.int64))
+
+
+def _roster_groups(day_roster, hours, queue_id):
+    """
+    Per call, the index of its on-duty list in the returned arrays (-1: nobody on shift);
+    day_roster is one day class of data_generator.build_roster. Hours of one shift share a
+    list, so each list becomes one group.
+    """
+    keys, inverse = np.unique(hours * 1000 + queue_id, return_inverse=True)
+    arrays, group_of_key, seen = [], [], {}
+    for k in keys.tolist():
+        by_queue = day_roster[k // 1000]
+        if by_queue is None:
+            group_of_key.append(-1)
+            continue
+        lst = by_queue[k % 1000]
+        if id(lst) not in seen:
+            seen[id(lst)] = len(arrays)
+            arrays.append(np.asarray(lst, dtype=np.int64))
+        group_of_key.append(seen[id(lst)])
+    return np.asarray(group_of_key, dtype=np.int64)[inverse.reshape(-1)], arrays
+
+
+_IVR_TABLES = {}
+
+
+def _ivr_table(tree):
+    """ivr.IvrTree paths as arrays: cumulative weights, queue and depth per path, hop tables (path x slot)."""
+    entry = _IVR_TABLES.get(id(tree))
+    if entry is None or entry[0] is not tree:
+        width = tree.depth
+        hops = [h + ((0, "", 0),) * (width - len(h)) for _, h in tree.paths]
+        entry = _IVR_TABLES[id(tree)] = (tree, {
+            "cum": np.asarray(tree.cum_weights),
+            "queue": np.asarray([q for q, _ in tree.paths], dtype=np.int64),
+            "depth": np.asarray([len(h) for _, h in tree.paths], dtype=np.int64),
+            "node": np.asarray([[hop[0] for hop in h] for h in hops], dtype=np.int64),
+            "digit": np.asarray([[hop[1] for hop in h] for h in hops], dtype=object),
+            "offset": np.asarray([[hop[2] for hop in h] for h in hops], dtype=np.int64),
+        })
+    return entry[1]
+
+
+def _tree_hops(table, path, has_ivr, call_ids, secs):
+    # one row per visited node of every call with a path, slot by slot
+    idx = np.flatnonzero(has_ivr)
+    v = path[idx]
+    depth = table["depth"][v]
+    parts = []
+    for j in range(len(table["node"][0])):
+        sel = depth > j
+        c, vj = idx[sel], v[sel]
+        parts.append((call_ids[c], table["node"][vj, j], table["digit"][vj, j], secs[c] + table["offset"][vj, j],
+                      np.full(len(c), j, dtype=np.int64)))
+    return [np.concatenate(col) for col in zip(*parts)]
+
+
+def generate_day_numpy(current_day, first_call_id, seed, p):
+    rng = np.random.default_rng(seed)
+    n = p["calls_per_day"]
+    num_agents = p["num_agents"]
+    base = np.datetime64(current_day.isoformat(), "s")
+    day_str = current_day.isoformat()
+
+    call_ids = np.arange(first_call_id, first_call_id + n, dtype=np.int64)
+
+    if p["time_ordered"]:
+        secs = _sorted_arrivals(rng, n, p["hour_cdf"])
+    else:
+        # timestamp (biased hours)
+        hour_choices = np.asarray(p["hour_choices"], dtype=np.int64)
+        hours = hour_choices[rng.integers(0, len(hour_choices), n)]
+        secs = hours * 3600 + rng.integers(0, 60, n) * 60 + rng.integers(0, 60, n)
+    ts_str = _iso(base, secs)
+
+    tree = p["ivr_tree"]
+    if tree is None:
+        queue_id = rng.integers(1, p["num_queues"] + 1, n)
+    else:
+        # IVR_MODEL = "tree": every call's complete menu path in one weighted draw; the leaf picks the queue
+        ivr = _ivr_table(tree)
+        has_ivr = rng.random(n) < p["ivr_path_prob"]
+        path = np.minimum(np.searchsorted(ivr["cum"], rng.random(n) * ivr["cum"][-1], side="right"),
+                          len(ivr["cum"]) - 1)
+        queue_id = np.where(has_ivr, ivr["queue"][path], rng.integers(1, p["num_queues"] + 1, n))
+    # campaign_ids + [None]*3 -> indexes past the last campaign mean "no campaign"
+    campaign_idx = rng.integers(0, p["num_campaigns"] + 3, n)
+    customer_id = rng.integers(1, p["num_customers"] + 1, n)
+
+    answered = rng.random(n) < np.where(queue_id % 2 == 0, 0.88, 0.82)
+
+    agent_id = rng.integers(1, num_agents + 1, n)
+    if p["roster"] is not None:
+        # only agents on shift answer, weighted by skill; calls outside every shift go unanswered
+        group, on_duty = _roster_groups(p["roster"][current_day.toordinal() % 7], secs // 3600, queue_id)
+        answered &= group >= 0
+        for g, agents in enumerate(on_duty):
+            idx = np.flatnonzero(answered & (group == g))
+            agent_id[idx] = agents[rng.integers(0, len(agents), len(idx))]
+    wait = np.where(answered, rng.exponential(20, n).astype(np.int64), 0)
+    talk = np.where(answered, rng.integers(20, 3601, n), 0)
+    hold = np.where(answered & (rng.random(n) < 0.25), (talk * rng.random(n) * 0.2).astype(np.int64), 0)
+    # uniform over the other agents: draw from num_agents-1 slots and skip over agent_id
+    transfer_to = rng.integers(1, num_agents, n)
+    transfer_to += transfer_to >= agent_id
+    transferred = answered & (rng.random(n) < 0.08)
+    if p["roster"] is not None:
+        # to another agent on the same shift; a list with a single agent has nobody to transfer to
+        for g, agents in enumerate(on_duty):
+            idx = np.flatnonzero(transferred & (group == g))
+            if agents[0] == agents[-1]:
+                transferred[idx] = False
+                continue
+            to = agents[rng.integers(0, len(agents), len(idx))]
+            same = np.flatnonzero(to == agent_id[idx])
+            while len(same):
+                to[same] = agents[rng.integers(0, len(agents), len(same))]
+                same = same[to[same] == agent_id[idx[same]]]
+            transfer_to[idx] = to
+    wrap_code = rng.integers(1, p["num_wrap_codes"] + 1, n)
+    disposition = rng.integers(1, p["num_dispositions"] + 1, n)
+    surveyed = answered & (rng.random(n) < 0.18)
+    survey_id = rng.integers(1, 20000001, n)
+    survey_rating = rng.integers(1, 6, n)
+
+    recorded = answered & (rng.random(n) < p["recording_prob"])
+    if tree is None:
+        has_ivr = answered & (rng.random(n) < p["ivr_path_prob"])
+    has_events = answered & (rng.random(n) < p["call_events_prob"])
+
+    # -------- calls
+    ids_str = call_ids.astype(str)
+    rec_paths = np.where(recorded, np.char.add(np.char.add(f"/recordings/{day_str}/call_", ids_str), ".wav"), "")
+    calls = Columns([
+        ids_str,
+        ts_str,
+        queue_id,
+        np.where(campaign_idx < p["num_campaigns"], campaign_idx + 1, 0),
+        customer_id,
+        answered.astype(np.int64),
+        wait,
+        talk,
+        hold,
+        np.where(answered, agent_id, 0),
+        np.where(transferred, transfer_to, 0),
+        np.where(answered, wrap_code, 0),
+        np.where(answered, disposition, 0),
+        rec_paths,
+        np.where(surveyed, survey_id, 0),
+        np.where(surveyed, survey_rating, 0),
+    ], blanks=CALL_BLANKS)
+
+    # -------- tickets (one per call)
+    t_status = TICKET_STATUSES[rng.integers(0, 5, n)]
+    long_call = answered & (talk > 600)
+    t_priority = PRIORITIES_ALL[np.where(long_call, rng.integers(0, 4, n), rng.integers(0, 2, n))]
+    ts_list = ts_str.tolist()
+    id_list = ids_str.tolist()
+    tickets = Columns([
+        id_list,
+        id_list,
+        customer_id,
+        ts_list,
+        t_status,
+        t_priority,
+        [f"Ticket for call {c}" for c in id_list],
+        [f"Auto ticket for call {c} created on {t}." for c, t in zip(id_list, ts_list)],
+    ])
+
+    # -------- recordings (sampled)
+    r_idx = np.flatnonzero(recorded)
+    r_talk = talk[r_idx]
+    r_size = (r_talk * rng.uniform(8, 20, len(r_idx))).astype(np.int64)
+    r_call_ids = call_ids[r_idx]
+    recordings = Columns([
+        r_call_ids,
+        r_call_ids,
+        rec_paths[r_idx],
+        r_size,
+        r_talk,
+        TRANSCRIPTION_STATUSES[rng.integers(0, 3, len(r_idx))],
+    ])
+
+    # -------- IVR paths: the drawn menu paths (tree), or sampled: node 1, then node 2/3 four seconds later for 60%
+    if tree is not None:
+        i_call, i_node, i_dtmf, i_secs, i_seq = _tree_hops(ivr, path, has_ivr, call_ids, secs)
+    else:
+        i_idx = np.flatnonzero(has_ivr)
+        k = len(i_idx)
+        second_hop = rng.random(k) < 0.6
+        hop_nodes = rng.integers(2, 4, k)
+        dtmf = rng.integers(1, 3, (k, 2))
+        i_call = np.concatenate([call_ids[i_idx], call_ids[i_idx][second_hop]])
+        i_node = np.concatenate([np.ones(k, dtype=np.int64), hop_nodes[second_hop]])
+        i_dtmf = np.concatenate([dtmf[:, 0], dtmf[second_hop, 1]]).astype(str)
+        i_secs = np.concatenate([secs[i_idx], secs[i_idx][second_hop] + 4])
+        i_seq = np.concatenate([np.zeros(k, dtype=np.int64), np.ones(int(second_hop.sum()), dtype=np.int64)])
+    if p["time_ordered"]:
+        # by timestamp, numbered consecutively inside the day's id range (see data_generator.TIME_ORDERED)
+        order = np.lexsort((i_seq, i_call, i_secs))
+        i_ids = (first_call_id - 1) * p["ivr_id_slots"] + 1 + np.arange(len(order))
+    else:
+        order = np.lexsort((i_seq, i_call))
+        i_ids = (i_call[order] - 1) * p["ivr_id_slots"] + i_seq[order] + 1
+    ivr_paths = Columns([
+        i_ids,
+        i_call[order],
+        i_node[order],
+        i_dtmf[order],
+        _iso(base, i_secs[order]),
+    ])
+
+    # -------- call events (sampled): queued, answered, [hold, resumed], ended
+    e_idx = np.flatnonzero(has_events)
+    e_held = hold[e_idx] > 0
+    e_secs0 = secs[e_idx]
+    e_wait = wait[e_idx]
+    e_talk = talk[e_idx]
+    e_hold = hold[e_idx]
+    hold_at = e_secs0 + e_wait + (e_talk * 0.2).astype(np.int64)
+    parts = [
+        (e_idx, e_secs0, 0, "queued"),
+        (e_idx, e_secs0 + e_wait, 1, "answered"),
+        (e_idx[e_held], hold_at[e_held], 2, "hold"),
+        (e_idx[e_held], (hold_at + e_hold)[e_held], 3, "resumed"),
+        (e_idx, e_secs0 + e_wait + e_talk, 4, "ended"),
+    ]
+    ev_call = np.concatenate([pp[0] for pp in parts])
+    ev_secs = np.concatenate([pp[1] for pp in parts])
+    ev_seq = np.concatenate([np.full(len(pp[0]), pp[2]) for pp in parts])
+    ev_type = np.concatenate([np.full(len(pp[0]), pp[3]) for pp in parts])
+    if p["time_ordered"]:
+        order = np.lexsort((ev_seq, ev_call, ev_secs))
+    else:
+        order = np.lexsort((ev_seq, ev_call))
+    ev_call = ev_call[order]
+    ev_agent = np.where(ev_seq[order] != 0, agent_id[ev_call], 0)
+    if p["time_ordered"]:
+        ev_ids = (first_call_id - 1) * p["event_id_slots"] + 1 + np.arange(len(order))
+    else:
+        ev_ids = (call_ids[ev_call] - 1) * p["event_id_slots"] + ev_seq[order] + 1
+    blanks = np.zeros(len(order), dtype=np.int64)
+    call_events = Columns([
+        ev_ids,
+        call_ids[ev_call],
+        _iso(base, ev_secs[order]),
+        ev_type[order],
+        ev_agent,
+        blanks,
+        blanks,
+    ], blanks=EVENT_BLANKS)
+
+    return {"calls": calls, "tickets": tickets, "recordings": recordings,
+            "ivr_paths": ivr_paths, "call_events": call_events}
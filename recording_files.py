@@ -0,0 +1,141 @@
+"""
+Placeholder recording files for load-testing the recording ingest / transcription side.
+
+Every recordings row has a file_path (/recordings/<date>/call_<id>.wav), file_size_kb
+and duration_seconds. This creates a file at each of those paths (under --root) of
+exactly file_size_kb * 1024 bytes: a valid 16-bit mono PCM WAV header whose sample
+rate makes the data last duration_seconds, followed by silence. The silence is
+never written, the file is only extended (truncate), so it is a hole on file
+systems with sparse files (ext4, xfs, btrfs, APFS, ...): millions of recordings take
+a few KB of real disk each. On NTFS files are allocated unless marked sparse.
+
+The date directories of a recordings file are created in bulk before its rows are
+written by a process pool in batches. --fraction keeps a deterministic share of the
+recordings (by call id, the same calls every run) and --start-date / --end-date a
+date range.
+
+Reads the csv, csv.gz / csv.zst and "load" layouts (month files and daily/).
+
+Usage:
+    python recording_files.py <out_dir> [--root <out_dir>/recordings] [--fraction 0.01]
+                              [--start-date 2025-03-01] [--end-date 2025-03-31] [--workers 8]
+"""
+import os
+import sys
+import csv
+import struct
+from collections import deque
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+
+from sinks import open_text
+from validator import fact_files
+
+PATH_PREFIX = "/recordings/"
+WAV_HEADER_BYTES = 44
+BATCH_ROWS = 2000
+
+
+def wav_header(size, duration):
+    """RIFF / fmt / data header of a size-byte 16-bit mono PCM file that plays for duration seconds."""
+    data = (size - WAV_HEADER_BYTES) & ~1
+    rate = max(1, data // (2 * max(1, duration)))
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", data + 36, b"WAVE", b"fmt ", 16, 1, 1,
+                       rate, rate * 2, 2, 16, b"data", data)
+
+
+def selected(call_id, fraction):
+    # multiplicative hash of the call id: a stable, evenly spread share of the calls
+    return (call_id * 2654435761) % 2**32 < fraction * 2**32
+
+
+def relative_path(file_path):
+    return file_path[len(PATH_PREFIX):] if file_path.startswith(PATH_PREFIX) else file_path.lstrip("/")
+
+
+def write_batch(root, batch):
+    """Create the files of one batch of (relative path, bytes, seconds); returns (files, bytes, bytes on disk)."""
+    declared = on_disk = 0
+    for rel, size, duration in batch:
+        path = os.path.join(root, rel)
+        size = max(size, WAV_HEADER_BYTES)
+        with open(path, "wb") as f:
+            f.write(wav_header(size, duration))
+            f.truncate(size)
+        declared += size
+        st = os.stat(path)
+        on_disk += st.st_blocks * 512 if hasattr(st, "st_blocks") else size
+    return len(batch), declared, on_disk
+
+
+def iter_recordings(path, fraction=1.0, start_date=None, end_date=None):
+    """(relative path, bytes, seconds) of the selected rows of one recordings file."""
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        header = [h.lower() for h in next(reader)]
+        call_col, path_col, size_col, dur_col = (header.index(c) for c in
+                                                 ("call_id", "file_path", "file_size_kb", "duration_seconds"))
+        for row in reader:
+            if not row[path_col] or (fraction < 1 and not selected(int(row[call_col]), fraction)):
+                continue
+            rel = relative_path(row[path_col])
+            if start_date or end_date:
+                day = date.fromisoformat(os.path.dirname(rel)[-10:])
+                if (start_date and day < start_date) or (end_date and day > end_date):
+                    continue
+            yield rel, int(row[size_col]) * 1024, int(row[dur_col])
+
+
+def materialize(out_dir, root=None, fraction=1.0, start_date=None, end_date=None, workers=None):
+    root = root or os.path.join(out_dir, "recordings")
+    files = fact_files(out_dir, "recordings")
+    if not files:
+        raise SystemExit(f"No recordings files in {out_dir}")
+    workers = workers or os.cpu_count() or 1
+    totals = [0, 0, 0]
+    made_dirs = set()
+
+    def collect(future):
+        for i, v in enumerate(future.result()):
+            totals[i] += v
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for path in files:
+            rows = list(iter_recordings(path, fraction, start_date, end_date))
+            # the file's date directories first, in one pass
+            for d in sorted({os.path.dirname(rel) for rel, _, _ in rows} - made_dirs):
+                os.makedirs(os.path.join(root, d), exist_ok=True)
+                made_dirs.add(d)
+            for i in range(0, len(rows), BATCH_ROWS):
+                pending.append(executor.submit(write_batch, root, rows[i:i + BATCH_ROWS]))
+                while len(pending) > workers * 4:
+                    collect(pending.popleft())
+            print(f"[RECORDINGS] {path}: {len(rows):,} files")
+        while pending:
+            collect(pending.popleft())
+    count, declared, on_disk = totals
+    print(f"[RECORDINGS] {count:,} files in {len(made_dirs):,} date directories under {root}: "
+          f"{declared / 1e9:,.2f} GB declared, {on_disk / 1e6:,.1f} MB on disk")
+    return totals
+
+
+def main(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(description="Create sparse placeholder WAV files at the recordings' file paths.")
+    p.add_argument("out_dir", help="generated dataset (reads its recordings files)")
+    p.add_argument("--root", help="directory that stands for /recordings (default: <out_dir>/recordings)")
+    p.add_argument("--fraction", type=float, default=1.0,
+                   help="share of the recordings to create, chosen by call id (default: %(default)s)")
+    p.add_argument("--start-date", type=date.fromisoformat, help="first recording date to create")
+    p.add_argument("--end-date", type=date.fromisoformat, help="last recording date to create")
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    args = p.parse_args(argv)
+    if not 0 < args.fraction <= 1:
+        p.error("--fraction is a share between 0 (exclusive) and 1")
+    materialize(args.out_dir, args.root, args.fraction, args.start_date, args.end_date, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Multi-node runs of data_generator.py: shard i of N, and the merge of the shards.
+
+    python data_generator.py -o /data/shard1 --shard 1/4      # on node 1 (2/4, 3/4, 4/4 elsewhere)
+    python shards.py -o /data/merged /data/shard1 /data/shard2 /data/shard3 /data/shard4
+
+Every shard plans the whole run and generates a contiguous range of whole months,
+balanced by days. Call ids (and the ids derived from them) come from that shared
+plan and every day has its own RNG, so a shard's month files are byte-identical to
+the same months of a single-node run with the same seed. Shard 1 also writes the
+reference tables.
+
+Each shard writes its run_manifest.json (see checkpoints.py) with its shard number
+and the full month plan. The merge reads the shard directories' manifests and
+checks that:
+- all shards ran the same config and seed, each of 1..N exactly once, to completion
+- together they cover every planned month exactly once
+- rows and call ids are continuous: every month has its planned calls and call id
+  range, and the ids of every table increase from one month to the next
+It then writes the combined calls_summary_by_month.csv, the day summaries (see
+aggregates.py), generator_state.json and merge_manifest.json into the output
+directory. The month files stay where the shards wrote them.
+"""
+import os
+import sys
+import csv
+from datetime import date
+
+from aggregates import AGENT_FILE, HOUR_QUEUE_FILE
+from checkpoints import MANIFEST_FILE, file_matches, read_json, write_json
+from sinks import month_paths
+
+MERGE_MANIFEST_FILE = "merge_manifest.json"
+STATE_FILE = "generator_state.json"
+SUMMARY_FILE = "calls_summary_by_month.csv"
+
+
+def parse_shard(text):
+    """"i/N" -> (i, N), 1 <= i <= N."""
+    index, _, count = text.partition("/")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {text!r}: expected i/N with 1 <= i <= N")
+    return index, count
+
+
+def shard_months(months_info, index, count):
+    """The contiguous whole months of shard index of count: a month goes to the shard its middle day falls in."""
+    total = sum(mi["days_in_month"] for mi in months_info)
+    out = []
+    before = 0
+    for mi in months_info:
+        middle = before + mi["days_in_month"] / 2
+        if (index - 1) * total <= middle * count < index * total:
+            out.append(mi)
+        before += mi["days_in_month"]
+    return out
+
+
+def plan_entry(mi):
+    return {k: mi[k].isoformat() if k in ("first_day", "last_day") else mi[k]
+            for k in ("month_name", "first_day", "last_day", "days_in_month", "calls_in_month",
+                      "start_call_id", "end_call_id")}
+
+
+# -------------------------
+# Merge
+# -------------------------
+def load_shards(dirs):
+    shards = []
+    for d in dirs:
+        manifest = read_json(os.path.join(d, MANIFEST_FILE))
+        if manifest is None:
+            raise SystemExit(f"No {MANIFEST_FILE} in {d}")
+        if "shard" not in manifest:
+            raise SystemExit(f"{d} is not a shard run (no --shard)")
+        shards.append((d, manifest))
+    return sorted(shards, key=lambda s: s[1]["shard"]["index"])
+
+
+def check_shards(shards, verify=False):
+    """Coverage and continuity errors of the shards (empty list = mergeable)."""
+    errors = []
+    first = shards[0][1]
+    count = first["shard"]["count"]
+    for d, m in shards:
+        if m["config_hash"] != first["config_hash"] or m["seed"] != first["seed"]:
+            errors.append(f"{d}: config or seed differs from {shards[0][0]}")
+        if m["shard"]["count"] != count:
+            errors.append(f"{d}: shard of {m['shard']['count']}, expected of {count}")
+        if m["status"] != "complete":
+            errors.append(f"{d}: run is {m['status']}, not complete (resume it with --resume)")
+    indexes = [m["shard"]["index"] for _, m in shards]
+    missing = sorted(set(range(1, count + 1)) - set(indexes))
+    dupes = sorted({i for i in indexes if indexes.count(i) > 1})
+    if missing:
+        errors.append(f"missing shards: {', '.join(map(str, missing))} of {count}")
+    if dupes:
+        errors.append(f"shards given more than once: {', '.join(map(str, dupes))}")
+
+    plan = first["plan"]
+    owner = {}
+    for d, m in shards:
+        for name, month in m["months"].items():
+            if name in owner:
+                errors.append(f"month {name} generated by both {owner[name][0]} and {d}")
+            owner[name] = (d, month)
+    last_ids = {}
+    for p in plan:
+        name = p["month_name"]
+        if name not in owner:
+            errors.append(f"month {name} is not covered by any shard")
+            continue
+        d, month = owner[name]
+        if (month["first_call_id"], month["last_call_id"]) != (p["start_call_id"], p["end_call_id"]):
+            errors.append(f"{d}: month {name} has call ids {month['first_call_id']}..{month['last_call_id']}, "
+                          f"planned {p['start_call_id']}..{p['end_call_id']}")
+        calls = month["tables"].get("calls")
+        if calls is not None and calls["rows"] != p["calls_in_month"]:
+            errors.append(f"{d}: month {name} has {calls['rows']} calls, planned {p['calls_in_month']}")
+        for table, t in month["tables"].items():
+            if t.get("first_id") is None:
+                continue
+            prev = last_ids.get(table)
+            if prev is not None and t["first_id"] <= prev:
+                errors.append(f"{d}: {table} ids of {name} start at {t['first_id']}, not after {prev}")
+            last_ids[table] = t["last_id"]
+        if verify:
+            paths = month_paths(d, name, first["config"]["OUTPUT_FORMAT"], first["config"]["COMPRESSION"])
+            errors.extend(f"{paths[t]}: size or checksum differs from the manifest"
+                          for t, entry in month["tables"].items() if not file_matches(paths[t], entry))
+    extra = sorted(set(owner) - {p["month_name"] for p in plan})
+    if extra:
+        errors.append(f"months outside the plan: {', '.join(extra)}")
+    return errors
+
+
+def merged_state(shards):
+    """generator_state.json of the whole run: the shards' segments, adjacent ones joined."""
+    config, segments = None, []
+    for d, _ in shards:
+        state = read_json(os.path.join(d, STATE_FILE))
+        if state is None:
+            raise SystemExit(f"No {STATE_FILE} in {d}")
+        config = config or state["config"]
+        segments.extend(state["segments"])
+    joined = []
+    for seg in sorted(segments, key=lambda s: s["start_date"]):
+        prev = joined[-1] if joined else None
+        if prev is not None and prev["calls_per_day"] == seg["calls_per_day"]:
+            prev_end = date.fromisoformat(prev["end_date"])
+            days = (prev_end - date.fromisoformat(prev["start_date"])).days + 1
+            if (date.fromisoformat(seg["start_date"]) - prev_end).days == 1 \
+                    and prev["first_call_id"] + days * prev["calls_per_day"] == seg["first_call_id"]:
+                prev["end_date"] = seg["end_date"]
+                continue
+        joined.append(dict(seg))
+    return {"config": config, "segments": joined}
+
+
+def concat_csv(out_path, in_paths):
+    """Header of the first file, then the rows of all of them (the shards' day ranges are in order)."""
+    with open(out_path, "w", newline='', encoding='utf-8') as out:
+        for i, path in enumerate(in_paths):
+            with open(path, newline='', encoding='utf-8') as f:
+                header = f.readline()
+                if i == 0:
+                    out.write(header)
+                for chunk in iter(lambda: f.read(1 << 20), ""):
+                    out.write(chunk)
+
+
+def merge(out_dir, dirs, verify=False):
+    shards = load_shards(dirs)
+    errors = check_shards(shards, verify)
+    if errors:
+        for e in errors:
+            print(f"[MERGE] {e}")
+        raise SystemExit(f"{len(errors)} problem(s); nothing merged")
+    os.makedirs(out_dir, exist_ok=True)
+    plan = shards[0][1]["plan"]
+    months = {name: month for _, m in shards for name, month in m["months"].items()}
+
+    summary = os.path.join(out_dir, SUMMARY_FILE)
+    with open(summary, "w", newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["month", "calls_generated"])
+        for p in plan:
+            calls = months[p["month_name"]]["tables"].get("calls")
+            w.writerow([p["month_name"], calls["rows"] if calls else p["calls_in_month"]])
+    written = [summary]
+    for name in (HOUR_QUEUE_FILE, AGENT_FILE):
+        parts = [os.path.join(d, name) for d, _ in shards]
+        if all(os.path.exists(p) for p in parts):
+            concat_csv(os.path.join(out_dir, name), parts)
+            written.append(os.path.join(out_dir, name))
+    write_json(os.path.join(out_dir, STATE_FILE), merged_state(shards))
+    written.append(os.path.join(out_dir, STATE_FILE))
+
+    write_json(os.path.join(out_dir, MERGE_MANIFEST_FILE), {
+        "config_hash": shards[0][1]["config_hash"],
+        "seed": shards[0][1]["seed"],
+        "config": shards[0][1]["config"],
+        "shards": [{"index": m["shard"]["index"], "dir": os.path.abspath(d), "months": list(m["months"])}
+                   for d, m in shards],
+        "months": {p["month_name"]: dict(months[p["month_name"]], shard=next(
+            m["shard"]["index"] for _, m in shards if p["month_name"] in m["months"])) for p in plan},
+        "reference_tables": {name: dict(entry, shard=m["shard"]["index"])
+                             for _, m in shards for name, entry in m["reference_tables"].items()},
+    })
+    for path in written:
+        print(f"[MERGE] {path}")
+    print(f"[MERGE] {len(shards)} shards, {len(plan)} months, "
+          f"{sum(m['tables'].get('calls', {}).get('rows', 0) for m in months.values()):,} calls: OK")
+
+
+def main(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(description="Check and merge the shard directories of a data_generator.py --shard run.")
+    p.add_argument("shard_dirs", nargs="+", help="output directories of the shard runs (any order)")
+    p.add_argument("-o", "--out-dir", required=True, help="where the combined summaries and manifests go")
+    p.add_argument("--verify", action="store_true", help="also check the size and sha256 of every month file")
+    args = p.parse_args(argv)
+    merge(args.out_dir, args.shard_dirs, args.verify)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,648 @@
+"""
+Output backends (sinks) for the per-month fact files written by data_generator.py.
+
+A month worker opens one sink per month and hands it a whole day of rows per table
+at a time (the dict returned by data_generator.generate_day). A day of a table is a
+list of row tuples (ENGINE = "python") or a Columns batch (ENGINE = "numpy"): whole
+columns that the sinks turn into CSV text / Arrow arrays without building rows.
+
+- "csv"     : csv.writer text files, flushed after every day (the default)
+- "parquet" : typed, zstd-compressed Parquet via pyarrow, one row group per day,
+              dictionary-encoded low-cardinality columns (status, priority, ...)
+- "load"    : CSV in exact DDL column order under load/<Table>/ (see bulk_load.py)
+
+StreamSink is not a per-month file: it writes one table per text stream (a named
+pipe, stdout) for a whole run, header once, rows day by day in date order, so a
+bulk loader can consume the rows while they are generated.
+
+Every sink keeps `timings` = {"format": seconds, "write": seconds}: time spent turning
+rows into CSV text / Arrow arrays vs. time spent compressing and writing them out.
+
+csv and parquet keep the same layout: calls_by_month/, tickets_by_month/ and
+aux_by_month/ with one <Month>_<table> file per month.
+
+CSV can also be written as compressed streams (COMPRESSION = "gzip" or "zstd",
+<Month>_<table>.csv.gz / .csv.zst). Every day of a table is compressed as its own
+gzip member / zstd frame on a small thread pool, so compression runs off the
+generating thread and on several cores; the frames are appended in order and the
+files stream-decompress with zcat / zstdcat / open_text().
+
+Writer thread: with queue_depth > 0, open_month_sink wraps the sink in an AsyncSink.
+write_day then only hands the day's rows to a dedicated writer thread through a queue
+of queue_depth days; the thread formats, writes and flushes them (and fsyncs for
+checkpoints) while the next day is generated. A full queue blocks the generating
+thread, so at most queue_depth + 2 days of rows are held (queued, being written,
+being generated). The files are the same bytes either way.
+
+Checkpoints: the file sinks count the days they have written and checkpoint() returns
+(days on disk, {table: file size}) after an fsync. A sink opened with those sizes as
+`offsets` cuts its files back to them and appends, so a month interrupted after day k
+continues at day k + 1 (see checkpoints.py). Parquet files are only valid once closed
+and cannot be resumed that way.
+"""
+import io
+import os
+import csv
+import zlib
+import queue
+import calendar
+import threading
+from time import perf_counter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# table -> (sub directory, columns); also the CSV header row
+TABLE_LAYOUT = {
+    "calls": ("calls_by_month", [
+        "call_id","call_timestamp","queue_id","campaign_id","customer_id","answered",
+        "wait_seconds","talk_seconds","hold_seconds","agent_id","transferred_to_agent_id",
+        "wrap_code_id","disposition_id","recording_path","survey_id","survey_rating"
+    ]),
+    "tickets": ("tickets_by_month", [
+        "ticket_id","call_id","customer_id","created_at","status","priority","subject","description"
+    ]),
+    "recordings": ("aux_by_month", ["recording_id","call_id","file_path","file_size_kb","duration_seconds","transcription_status"]),
+    "ivr_paths": ("aux_by_month", ["path_id","call_id","node_id","dtmf_input","timestamp"]),
+    "call_events": ("aux_by_month", ["event_id","call_id","event_time","event_type","agent_id","from_agent_id","to_agent_id"]),
+}
+TABLES = list(TABLE_LAYOUT)
+
+# Parquet column types ("int", "int32", "ts", "str") and dictionary-encoded columns
+PARQUET_TYPES = {
+    "calls": ["int", "ts", "int32", "int32", "int32", "int32", "int32", "int32", "int32",
+              "int32", "int32", "int32", "int32", "str", "int32", "int32"],
+    "tickets": ["int", "int", "int32", "ts", "str", "str", "str", "str"],
+    "recordings": ["int", "int", "str", "int32", "int32", "str"],
+    "ivr_paths": ["int", "int", "int32", "int32", "ts"],
+    "call_events": ["int", "int", "ts", "str", "int32", "int32", "int32"],
+}
+PARQUET_DICTIONARY_COLUMNS = {
+    "calls": [],
+    "tickets": ["status", "priority"],
+    "recordings": ["transcription_status"],
+    "ivr_paths": [],
+    "call_events": ["event_type"],
+}
+
+OUTPUT_FORMATS = ("csv", "parquet", "load")
+FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "load": ".csv"}
+DAILY_DIR = "daily"
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3}
+# compressed day chunks allowed in flight per compression thread before the writer waits
+PENDING_CHUNKS_PER_THREAD = 2
+
+
+def _extension(output_format, compression):
+    return FILE_EXTENSIONS[output_format] + COMPRESSION_EXTENSIONS[compression]
+
+
+def month_paths(base_dir, month_name, output_format="csv", compression="none"):
+    if output_format == "load":
+        from bulk_load import load_month_paths
+        return load_month_paths(base_dir, month_name)
+    ext = _extension(output_format, compression)
+    return {t: os.path.join(base_dir, sub, f"{month_name}_{t}{ext}") for t, (sub, _) in TABLE_LAYOUT.items()}
+
+
+def day_paths(base_dir, day, output_format="csv", compression="none"):
+    """Files of one day generated in append (delta) mode: daily/<YYYY-MM-DD>/<table>.<ext>."""
+    tables = TABLES
+    ext = FILE_EXTENSIONS[output_format]
+    if output_format == "load":
+        from bulk_load import FACT_TABLES
+        tables = [t for t in TABLES if t in FACT_TABLES]
+    else:
+        ext = _extension(output_format, compression)
+    day_dir = os.path.join(base_dir, DAILY_DIR, day.isoformat())
+    return {t: os.path.join(day_dir, f"{t}{ext}") for t in tables}
+
+
+def month_sort_key(month_label):
+    # "March" or "2026_March" -> (year, month) for chronological ordering
+    year, _, name = month_label.rpartition("_")
+    return (int(year) if year else 0, list(calendar.month_name).index(name))
+
+
+def month_files(base_dir, table, output_format="csv", compression="none"):
+    """Existing per-month files of one table, in chronological order."""
+    sub = os.path.join(base_dir, TABLE_LAYOUT[table][0])
+    suffix = f"_{table}{_extension(output_format, compression)}"
+    if not os.path.isdir(sub):
+        return []
+    labels = [f[:-len(suffix)] for f in os.listdir(sub) if f.endswith(suffix)]
+    return [os.path.join(sub, f"{label}{suffix}") for label in sorted(labels, key=month_sort_key)]
+
+
+def ensure_output_dirs(base_dir):
+    for sub in {sub for sub, _ in TABLE_LAYOUT.values()}:
+        os.makedirs(os.path.join(base_dir, sub), exist_ok=True)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImportError("COMPRESSION = 'zstd' needs zstandard (pip install zstandard)") from exc
+    return zstandard
+
+
+def open_text(path):
+    """Open a (possibly .gz / .zst compressed) CSV file for reading as text."""
+    if path.endswith(".gz"):
+        import gzip
+        return gzip.open(path, "rt", newline='', encoding='utf-8')
+    if path.endswith(".zst"):
+        # read_across_frames: the file is one frame per day
+        reader = _zstandard().ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True,
+                                                                closefd=True)
+        return io.TextIOWrapper(reader, newline='', encoding='utf-8')
+    return open(path, newline='', encoding='utf-8')
+
+
+def open_for_append(path, offset, binary=False):
+    """Open an output file: new (offset None) or cut back to offset bytes and appended to."""
+    mode = "w"
+    if offset is not None:
+        os.truncate(path, offset)
+        mode = "a"
+    if binary:
+        return open(path, mode + "b")
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+def sync_sizes(files):
+    """fsync open files; {table: size on disk}."""
+    sizes = {}
+    for t, f in files.items():
+        f.flush()
+        os.fsync(f.fileno())
+        sizes[t] = os.fstat(f.fileno()).st_size
+    return sizes
+
+
+_CSV_SPECIAL = (",", '"', "\r", "\n")
+# str(i) for small non-negative ints, grown on demand (replaced, never mutated: writer threads share them);
+# the blank table has "" for 0
+_INT_CELLS = {False: [], True: []}
+MAX_INT_CELLS = 1 << 16
+
+
+def _int_cells(values, top, blank):
+    cells = _INT_CELLS[blank]
+    if top >= len(cells):
+        cells = [str(i) for i in range(max(top + 1, 2 * len(cells)))]
+        if blank:
+            cells[0] = ""
+        _INT_CELLS[blank] = cells
+    return list(map(cells.__getitem__, values))
+
+
+def _csv_cells(column, blank=False):
+    """
+    A column as CSV cell strings, quoted where csv.writer (QUOTE_MINIMAL) would quote them;
+    blank: 0 in an integer column is a blank cell ("").
+    """
+    if not isinstance(column, list):
+        if column.dtype.kind in "iu" and len(column):
+            top = int(column.max())
+            if 0 <= column.min() and top < MAX_INT_CELLS:
+                return _int_cells(column.tolist(), top, blank)
+        column = column.tolist()
+    if column and not isinstance(column[0], str):
+        if blank:
+            return [str(v) if v else "" for v in column]
+        return list(map(str, column))
+    joined = "\0".join(column)
+    if not any(c in joined for c in _CSV_SPECIAL):
+        return column
+    return ['"' + v.replace('"', '""') + '"' if any(c in v for c in _CSV_SPECIAL) else v for v in column]
+
+
+class Columns:
+    """
+    One day of a table as columns: lists of cells or NumPy arrays, all of the same length.
+    Integer columns listed in blanks use 0 for a blank cell (as "" in a row, null in Parquet).
+    len(), indexing and iteration give the row tuples a row list would hold, so code that
+    reads rows works unchanged; the sinks format the columns as a whole (csv(), Arrow).
+    """
+
+    __slots__ = ("columns", "blanks")
+
+    def __init__(self, columns, blanks=()):
+        self.columns = columns
+        self.blanks = frozenset(blanks)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def _values(self, i):
+        column = self.columns[i]
+        if i in self.blanks:
+            return _csv_cells(column, blank=True)
+        return column if isinstance(column, list) else column.tolist()
+
+    def __iter__(self):
+        return zip(*(self._values(i) for i in range(len(self.columns))))
+
+    def __getitem__(self, index):
+        row = []
+        for i, column in enumerate(self.columns):
+            v = column[index]
+            v = v.item() if hasattr(v, "item") else v
+            row.append((str(v) if v else "") if i in self.blanks else v)
+        return tuple(row)
+
+    def select(self, indexes):
+        """The columns at indexes, in that order (e.g. the DDL column order of bulk_load.py)."""
+        return Columns([self.columns[i] for i in indexes], [j for j, i in enumerate(indexes) if i in self.blanks])
+
+    def csv(self):
+        """The rows as csv.writer writes them: comma separated, CRLF terminated."""
+        if not len(self):
+            return ""
+        cells = [_csv_cells(c, i in self.blanks) for i, c in enumerate(self.columns)]
+        return "\r\n".join(map(",".join, zip(*cells))) + "\r\n"
+
+
+def write_rows(writer, stream, rows):
+    """Write a day of rows (a row list or Columns) as CSV; writer is a csv.writer on stream."""
+    if isinstance(rows, Columns):
+        stream.write(rows.csv())
+    else:
+        writer.writerows(rows)
+
+
+def compress_chunk(data, compression, level):
+    """One self-contained gzip member / zstd frame; concatenated chunks form a valid stream."""
+    if compression == "gzip":
+        c = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip header and trailer
+        return c.compress(data) + c.flush()
+    return _zstandard().ZstdCompressor(level=level).compress(data)
+
+
+class CsvMonthSink:
+    def __init__(self, paths, offsets=None):
+        # only the tables present in paths are written
+        self.tables = [t for t in TABLES if t in paths]
+        self.timings = {"format": 0.0, "write": 0.0}
+        self.days = 0
+        # a day is rendered in memory first, then written with one call per file
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.files = {}
+        for t in self.tables:
+            f = open_for_append(paths[t], offsets[t] if offsets else None)
+            self.files[t] = f
+            if not offsets:
+                csv.writer(f).writerow(TABLE_LAYOUT[t][1])
+
+    def write_day(self, tables):
+        for t in self.tables:
+            t0 = perf_counter()
+            write_rows(self.writer, self.buffer, tables[t])
+            text = self.buffer.getvalue()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            t1 = perf_counter()
+            self.files[t].write(text)
+            self.timings["format"] += t1 - t0
+            self.timings["write"] += perf_counter() - t1
+        # flush per day to reduce memory buffer
+        t0 = perf_counter()
+        for f in self.files.values():
+            f.flush()
+        self.days += 1
+        self.timings["write"] += perf_counter() - t0
+
+    def checkpoint(self):
+        t0 = perf_counter()
+        sizes = sync_sizes(self.files)
+        self.timings["write"] += perf_counter() - t0
+        return self.days, sizes
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CompressedCsvMonthSink:
+    """
+    CSV rows rendered per day into memory, compressed as one chunk per table per day
+    on a thread pool (zlib and zstandard release the GIL) and appended in order.
+    """
+
+    def __init__(self, paths, compression="gzip", level=None, threads=2, offsets=None):
+        if compression == "zstd":
+            _zstandard()  # fail before any file is opened
+        self.compression = compression
+        self.level = DEFAULT_COMPRESSION_LEVELS[compression] if level is None else level
+        self.tables = [t for t in TABLES if t in paths]
+        self.timings = {"format": 0.0, "write": 0.0}
+        self.days = 0
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.files = {t: open_for_append(paths[t], offsets[t] if offsets else None, binary=True) for t in self.tables}
+        # (days, sizes) as of the last day whose chunks have all been written
+        self.synced = (0, {t: f.tell() for t, f in self.files.items()})
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        self.max_pending = threads * PENDING_CHUNKS_PER_THREAD
+        self.pending = deque()
+        if not offsets:
+            for t in self.tables:
+                self.writer.writerow(TABLE_LAYOUT[t][1])
+                self._submit(t)
+
+    def _submit(self, table):
+        data = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        if data:
+            self.pending.append((table, self.pool.submit(compress_chunk, data, self.compression, self.level)))
+        while len(self.pending) > self.max_pending:
+            self._write_next()
+
+    def _write_next(self):
+        # waiting for the compressor counts as write time
+        t0 = perf_counter()
+        table, item = self.pending.popleft()
+        if table is None:
+            # end-of-day marker: every chunk of day `item` is written
+            self.synced = (item, sync_sizes(self.files))
+        else:
+            self.files[table].write(item.result())
+        self.timings["write"] += perf_counter() - t0
+
+    def write_day(self, tables):
+        for t in self.tables:
+            t0 = perf_counter()
+            write_rows(self.writer, self.buffer, tables[t])
+            self.timings["format"] += perf_counter() - t0
+            self._submit(t)
+        self.days += 1
+        self.pending.append((None, self.days))
+
+    def checkpoint(self):
+        # lags the generated days by the chunks still being compressed
+        return self.synced
+
+    def close(self):
+        try:
+            while self.pending:
+                self._write_next()
+        finally:
+            self.pool.shutdown()
+            for f in self.files.values():
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetMonthSink:
+    def __init__(self, paths):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("OUTPUT_FORMAT = 'parquet' needs pyarrow (pip install pyarrow)") from exc
+        self.pa = pa
+        self.tables = [t for t in TABLES if t in paths]
+        self.timings = {"format": 0.0, "write": 0.0}
+        self.days = 0
+        self.schemas = {t: self._schema(t) for t in self.tables}
+        self.writers = {
+            t: pq.ParquetWriter(paths[t], self.schemas[t], compression="zstd",
+                                use_dictionary=PARQUET_DICTIONARY_COLUMNS[t] or False)
+            for t in self.tables
+        }
+
+    def _schema(self, table):
+        pa = self.pa
+        arrow = {"int": pa.int64(), "int32": pa.int32(), "ts": pa.timestamp("s"), "str": pa.string()}
+        cols = TABLE_LAYOUT[table][1]
+        return pa.schema([(c, arrow[k]) for c, k in zip(cols, PARQUET_TYPES[table])])
+
+    def _column(self, values, kind, arrow_type, blank=False):
+        pa = self.pa
+        if not isinstance(values, (list, tuple)):
+            # a NumPy column of a Columns batch: integer arrays convert without a copy per cell
+            if values.dtype.kind in "iu":
+                return pa.array(values, arrow_type, mask=values == 0 if blank else None)
+            values = values.tolist()
+        # CSV writes "" for missing values; in Parquet they become nulls
+        if kind == "str":
+            return pa.array([v if v != "" else None for v in values], arrow_type)
+        if kind == "ts":
+            return pa.array(values, pa.string()).cast(arrow_type)
+        return pa.array([int(v) if v != "" else None for v in values], arrow_type)
+
+    def write_day(self, tables):
+        for t in self.tables:
+            rows = tables[t]
+            if not rows:
+                continue
+            t0 = perf_counter()
+            schema = self.schemas[t]
+            if isinstance(rows, Columns):
+                columns, blanks = rows.columns, rows.blanks
+            else:
+                columns, blanks = list(zip(*rows)), ()
+            arrays = [self._column(col, kind, field.type, i in blanks)
+                      for i, (col, kind, field) in enumerate(zip(columns, PARQUET_TYPES[t], schema))]
+            table = self.pa.Table.from_arrays(arrays, schema=schema)
+            t1 = perf_counter()
+            # one row group per day
+            self.writers[t].write_table(table)
+            self.timings["format"] += t1 - t0
+            self.timings["write"] += perf_counter() - t1
+        self.days += 1
+
+    def checkpoint(self):
+        # the footer is written by close(): an unclosed file cannot be resumed
+        return self.days, None
+
+    def close(self):
+        for w in self.writers.values():
+            w.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StreamSink:
+    """CSV rows of whole runs into text streams, one per table (see open_stream_sink)."""
+
+    def __init__(self, streams, owned=()):
+        self.tables = [t for t in TABLES if t in streams]
+        self.timings = {"format": 0.0, "write": 0.0}
+        self.streams = streams
+        self.owned = owned
+        self.writers = {t: csv.writer(streams[t]) for t in self.tables}
+        for t in self.tables:
+            self.writers[t].writerow(TABLE_LAYOUT[t][1])
+
+    def write_day(self, tables):
+        for t in self.tables:
+            t0 = perf_counter()
+            write_rows(self.writers[t], self.streams[t], tables[t])
+            # consumers should see every finished day
+            self.streams[t].flush()
+            self.timings["write"] += perf_counter() - t0
+
+    def close(self):
+        for t in self.tables:
+            if t in self.owned:
+                self.streams[t].close()
+            else:
+                self.streams[t].flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_stream_sink(targets, stdout=None):
+    """
+    targets: {table: path}; a path may be a named pipe (opening it blocks until a
+    reader connects) or "-" for stdout (the binary stdout buffer, CRLF rows like csv files).
+    """
+    streams, owned = {}, []
+    for t, path in targets.items():
+        if t not in TABLE_LAYOUT:
+            raise ValueError(f"Only fact tables can be streamed, not {t!r}")
+        if path == "-":
+            stdout = stdout or io.TextIOWrapper(os.fdopen(os.dup(1), "wb"), newline='', encoding='utf-8')
+            streams[t] = stdout
+        else:
+            streams[t] = open(path, "w", newline='', encoding='utf-8')
+            owned.append(t)
+    return StreamSink(streams, owned)
+
+
+class AsyncSink:
+    """
+    Runs another sink's write_day on a writer thread behind a bounded queue (see the module
+    docstring). timings: "format" / "write" are the wrapped sink's, for the days the thread
+    has finished; "queue_wait" is the generating thread's wait for room in the queue (and
+    for the thread in drain / close). day_timings: (format, write) seconds of every written day.
+    """
+
+    def __init__(self, sink, depth=2):
+        self.sink = sink
+        self.tables = sink.tables
+        self.timings = {"format": 0.0, "write": 0.0, "queue_wait": 0.0}
+        self.day_timings = []
+        self.queue = queue.Queue(maxsize=depth)
+        self.error = None
+        # (days, sizes) as of the last day the thread wrote and synced; the thread only
+        # syncs once checkpoint() has been called, i.e. for checkpointed runs
+        self.sync = False
+        self.synced = (0, None)
+        self.thread = threading.Thread(target=self._run, name="sink-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            tables = self.queue.get()
+            try:
+                if tables is None:
+                    return
+                if self.error is not None:
+                    continue  # keep draining so the generating thread never blocks on a dead writer
+                inner = self.sink.timings
+                format0, write0 = inner["format"], inner["write"]
+                self.sink.write_day(tables)
+                if self.sync:
+                    self.synced = self.sink.checkpoint()
+                day = (inner["format"] - format0, inner["write"] - write0)
+                self.day_timings.append(day)
+                self.timings["format"] += day[0]
+                self.timings["write"] += day[1]
+            except BaseException as exc:
+                self.error = exc
+            finally:
+                self.queue.task_done()
+
+    def _raise(self):
+        if self.error is not None:
+            raise self.error
+
+    def write_day(self, tables):
+        self._raise()
+        t0 = perf_counter()
+        self.queue.put(tables)
+        self.timings["queue_wait"] += perf_counter() - t0
+
+    def drain(self):
+        """Wait until every queued day is written; returns day_timings."""
+        t0 = perf_counter()
+        self.queue.join()
+        self.timings["queue_wait"] += perf_counter() - t0
+        self._raise()
+        return self.day_timings
+
+    def checkpoint(self):
+        # lags the generated days by the days still queued
+        self.sync = True
+        return self.synced
+
+    def close(self):
+        t0 = perf_counter()
+        self.queue.put(None)
+        self.thread.join()
+        self.timings["queue_wait"] += perf_counter() - t0
+        self.sink.close()
+        self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_month_sink(output_format, paths, compression="none", compression_level=None, compression_threads=2,
+                    offsets=None, queue_depth=0):
+    """
+    offsets: {table: size} from a sink's checkpoint() to continue those files (not parquet).
+    queue_depth > 0: write on a writer thread with that many days queued (AsyncSink).
+    """
+    sink = _open_month_sink(output_format, paths, compression, compression_level, compression_threads, offsets)
+    return AsyncSink(sink, queue_depth) if queue_depth > 0 else sink
+
+
+def _open_month_sink(output_format, paths, compression, compression_level, compression_threads, offsets):
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of {COMPRESSIONS}")
+    if compression != "none" and output_format != "csv":
+        # parquet compresses its own pages (zstd); BULK INSERT cannot read compressed files
+        raise ValueError(f"compression {compression!r} applies to the csv format only, not {output_format!r}")
+    if output_format == "parquet":
+        if offsets:
+            raise ValueError("parquet files cannot be resumed, only rewritten")
+        return ParquetMonthSink(paths)
+    if output_format == "csv":
+        if compression != "none":
+            return CompressedCsvMonthSink(paths, compression, compression_level, compression_threads, offsets)
+        return CsvMonthSink(paths, offsets)
+    if output_format == "load":
+        from bulk_load import LoadMonthSink
+        return LoadMonthSink(paths, offsets=offsets)
+    raise ValueError(f"Unknown output format {output_format!r}, expected one of {OUTPUT_FORMATS}")
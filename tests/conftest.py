@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# the modules are top-level scripts in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_generator  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def run_config():
+    """Restore data_generator's module config (apply_config / main change it) after every test."""
+    saved = data_generator.current_config()
+    yield saved
+    data_generator.apply_config(saved)
+
+
+@pytest.fixture(scope="session")
+def dataset(tmp_path_factory):
+    """A 0.01-scale run over January to March, three months generated in parallel worker processes."""
+    out = str(tmp_path_factory.mktemp("dataset"))
+    saved = data_generator.current_config()
+    data_generator.main(["-o", out, "-s", "0.01", "--start-date", "2025-01-01", "--end-date", "2025-03-31",
+                         "--execution-mode", "process", "--workers", "3", "--ivr-model", "tree",
+                         "--ivr-path-prob", "1", "--progress-interval", "0"])
+    data_generator.apply_config(saved)
+    return out
@@ -0,0 +1,47 @@
+import csv
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import data_generator  # noqa: E402
+from aggregates import Aggregates  # noqa: E402
+from sinks import Columns  # noqa: E402
+
+
+def writer_text(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def test_csv_quotes_and_blanks_like_csv_writer():
+    batch = Columns([
+        np.array([1, 70000, 3]),
+        ["plain", 'say "hi"', "a,b"],
+        np.array([0, 5, 0]),
+        np.array([0, 20000000, 7]),
+        ["line\nbreak", "", "x"],
+    ], blanks=(2, 3))
+    rows = list(batch)
+    assert rows[0] == (1, "plain", "", "", "line\nbreak")
+    assert batch[-1] == (3, "a,b", "", "7", "x")
+    assert batch.csv() == writer_text(rows)
+    assert batch.select([4, 2, 0]).csv() == writer_text([(r[4], r[2], r[0]) for r in rows])
+
+
+@pytest.mark.parametrize("options", [{}, {"IVR_MODEL": "tree", "IVR_PATH_PROB": 1.0, "TIME_ORDERED": True,
+                                          "AGENT_ASSIGNMENT": "roster"}])
+def test_numpy_engine_batches_format_and_aggregate_like_their_rows(options):
+    data_generator.apply_config(dict(data_generator.current_config(), **data_generator.scale_config(0.01),
+                                     ENGINE="numpy", **options))
+    by_columns, by_rows = Aggregates(), Aggregates()
+    for current_day, tables in data_generator.iter_days(end=data_generator.START_DATE.replace(day=3)):
+        for table, batch in tables.items():
+            assert isinstance(batch, Columns)
+            assert batch.csv() == writer_text(list(batch)), table
+        by_columns.add_calls(current_day, tables["calls"])
+        by_rows.add_calls(current_day, list(tables["calls"]))
+    assert by_columns.by_hour_queue == by_rows.by_hour_queue
+    assert by_columns.by_agent == by_rows.by_agent
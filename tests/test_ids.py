@@ -0,0 +1,36 @@
+import csv
+
+import data_generator
+from ivr import IVR_NODES, IvrTree
+from sinks import TABLES, month_paths
+
+MONTHS = ("January", "February", "March")
+
+
+def column(dataset, table, name):
+    values = []
+    for month in MONTHS:
+        with open(month_paths(dataset, month)[table], newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            col = next(reader).index(name)
+            values.extend(int(row[col]) for row in reader)
+    return values
+
+
+def test_ids_are_unique_across_month_workers(dataset):
+    for table in TABLES:
+        ids = column(dataset, table, {"calls": "call_id", "tickets": "ticket_id", "recordings": "recording_id",
+                                      "ivr_paths": "path_id", "call_events": "event_id"}[table])
+        assert ids, table
+        assert len(set(ids)) == len(ids), table
+        assert ids == sorted(ids), table
+
+
+def test_per_call_ids_come_from_the_calls_id_block(dataset):
+    assert column(dataset, "tickets", "ticket_id") == column(dataset, "tickets", "call_id")
+    assert column(dataset, "recordings", "recording_id") == column(dataset, "recordings", "call_id")
+    ivr_slots = IvrTree(IVR_NODES, data_generator.queue_primary_skills(), data_generator.SKILLS).depth
+    for table, pk, slots in (("ivr_paths", "path_id", ivr_slots),
+                             ("call_events", "event_id", data_generator.EVENT_ID_SLOTS)):
+        for row_id, call_id in zip(column(dataset, table, pk), column(dataset, table, "call_id")):
+            assert (call_id - 1) * slots < row_id <= call_id * slots, (table, row_id, call_id)
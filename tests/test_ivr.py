@@ -0,0 +1,40 @@
+import pytest
+
+import data_generator
+from ivr import IVR_NODES, IvrTree, leaf_skill
+from sinks import TABLE_LAYOUT
+
+QUEUE_COL = TABLE_LAYOUT["calls"][1].index("queue_id")
+
+
+def test_leaf_actions_name_their_skill():
+    skills = data_generator.SKILLS
+    assert leaf_skill("transfer_support_tech", skills) == skills.index("Technical Support") + 1
+    assert leaf_skill("transfer_sales_new", skills) == skills.index("Sales") + 1
+    assert leaf_skill("transfer_billing_invoice", skills) == skills.index("Billing") + 1
+    assert leaf_skill("goto_sales", skills) is None
+
+
+def test_leaf_without_a_matching_queue_routes_to_any_queue():
+    tree = IvrTree(IVR_NODES, {1: 4, 2: 5}, data_generator.SKILLS)
+    assert all(queues == [1, 2] for queues in tree.queues.values())
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_calls_go_to_a_queue_with_their_ivr_leafs_skill(engine):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    data_generator.apply_config(dict(data_generator.current_config(), **data_generator.scale_config(0.01),
+                                     ENGINE=engine, IVR_MODEL="tree", IVR_PATH_PROB=1.0))
+    primary = data_generator.queue_primary_skills()
+    actions = {n["node_id"]: n["action_"] for n in IVR_NODES}
+    _, tables = next(data_generator.iter_days())
+    leaf = {}
+    for _, call_id, node_id, digit, _ in tables["ivr_paths"]:
+        if digit == "":
+            leaf[str(call_id)] = node_id
+    calls = tables["calls"]
+    assert len(leaf) == len(calls)
+    for row in calls:
+        skill = leaf_skill(actions[int(leaf[str(row[0])])], data_generator.SKILLS)
+        assert primary[int(row[QUEUE_COL])] == skill
@@ -0,0 +1,14 @@
+import data_generator
+
+
+def test_load_format_warns_and_drops_call_events(capsys):
+    cfg, _ = data_generator.parse_args(["--format", "load"])
+    assert "call_events" not in cfg["TABLES"]
+    assert "calls" in cfg["TABLES"]
+    assert "[WARN ] --format load writes no call_events" in capsys.readouterr().out
+
+
+def test_csv_format_keeps_call_events(capsys):
+    cfg, _ = data_generator.parse_args(["--format", "csv"])
+    assert "call_events" in cfg["TABLES"]
+    assert "[WARN ]" not in capsys.readouterr().out
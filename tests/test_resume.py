@@ -0,0 +1,49 @@
+import os
+from datetime import date
+
+import pytest
+
+import data_generator
+from sinks import month_paths
+
+ARGS = ["-s", "0.01", "--start-date", "2025-01-01", "--end-date", "2025-02-15", "--execution-mode", "thread",
+        "--progress-interval", "0"]
+CRASH_DAY = date(2025, 1, 20)
+
+
+def fact_files(out_dir):
+    return sorted(p for name in ("January", "February") for p in month_paths(out_dir, name).values())
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_resume_after_a_crash_matches_an_uninterrupted_run(tmp_path, monkeypatch):
+    clean, crashed = str(tmp_path / "clean"), str(tmp_path / "crashed")
+    data_generator.main(["-o", clean] + ARGS)
+
+    generate_day = data_generator.generate_day
+
+    def crash_on(current_day, first_call_id):
+        if current_day == CRASH_DAY:
+            raise OSError("simulated crash")
+        return generate_day(current_day, first_call_id)
+
+    monkeypatch.setattr(data_generator, "generate_day", crash_on)
+    with pytest.raises(SystemExit, match="--resume"):
+        data_generator.main(["-o", crashed] + ARGS)
+    monkeypatch.setattr(data_generator, "generate_day", generate_day)
+
+    january = month_paths(crashed, "January")["calls"]
+    assert 0 < os.path.getsize(january) < os.path.getsize(month_paths(clean, "January")["calls"])
+    # a torn write after the last checkpoint is cut back on resume
+    with open(january, "ab") as f:
+        f.write(b"99999999,2025-01-")
+
+    data_generator.main(["-o", crashed, "--resume"] + ARGS)
+    for expected, actual in zip(fact_files(clean), fact_files(crashed)):
+        assert read(actual) == read(expected), actual
+    for name in ("calls_summary_by_month.csv", "summary_by_day_hour_queue.csv", "summary_by_day_agent.csv"):
+        assert read(os.path.join(crashed, name)) == read(os.path.join(clean, name)), name
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+import data_generator
+import shards
+from aggregates import AGENT_FILE, HOUR_QUEUE_FILE
+from checkpoints import read_json
+from sinks import month_paths
+
+ARGS = ["-s", "0.01", "--start-date", "2025-01-01", "--end-date", "2025-03-31", "--execution-mode", "thread",
+        "--progress-interval", "0"]
+MONTHS = ("January", "February", "March")
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def runs(tmp_path_factory):
+    """A single-node run and the two shards of the same run (module scope: restores the config itself)."""
+    base = tmp_path_factory.mktemp("runs")
+    saved = data_generator.current_config()
+    single = str(base / "single")
+    data_generator.main(["-o", single] + ARGS)
+    parts = [str(base / f"shard{i}") for i in (1, 2)]
+    for i, out in enumerate(parts, 1):
+        data_generator.main(["-o", out, "--shard", f"{i}/2"] + ARGS)
+    data_generator.apply_config(saved)
+    return single, parts
+
+
+def test_shard_merge_matches_a_single_run(tmp_path, runs):
+    single, parts = runs
+    merged = str(tmp_path / "merged")
+    shards.merge(merged, parts, verify=True)
+
+    manifest = read_json(os.path.join(merged, shards.MERGE_MANIFEST_FILE))
+    assert sorted(manifest["months"]) == sorted(MONTHS)
+    for name in MONTHS:
+        shard_dir = parts[manifest["months"][name]["shard"] - 1]
+        for table, path in month_paths(single, name).items():
+            assert read(month_paths(shard_dir, name)[table]) == read(path), (name, table)
+    for name in (shards.SUMMARY_FILE, HOUR_QUEUE_FILE, AGENT_FILE):
+        assert read(os.path.join(merged, name)) == read(os.path.join(single, name)), name
+    assert read_json(os.path.join(merged, shards.STATE_FILE))["segments"] == \
+        read_json(os.path.join(single, shards.STATE_FILE))["segments"]
+
+
+def test_shard_merge_refuses_a_missing_shard(tmp_path, runs):
+    _, parts = runs
+    with pytest.raises(SystemExit, match="nothing merged"):
+        shards.merge(str(tmp_path / "merged"), parts[:1])
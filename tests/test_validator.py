@@ -0,0 +1,36 @@
+import os
+import shutil
+
+import validator
+from sinks import month_paths
+
+
+def counts(findings):
+    return {(f["table"], check): n for f in findings for check, n in f["counts"].items()}
+
+
+def test_generated_dataset_is_clean(dataset):
+    findings = validator.validate(dataset, workers=2)
+    assert counts(findings) == {}
+    assert {f["table"] for f in findings} >= {"customers", "calls", "tickets", "ivr_paths", "call_events"}
+
+
+def test_duplicate_keys_and_dangling_references_are_found(tmp_path, dataset):
+    out = str(tmp_path / "broken")
+    shutil.copytree(dataset, out)
+    with open(month_paths(out, "January")["tickets"], encoding="utf-8") as f:
+        first_ticket = f.readlines()[1]
+    march = month_paths(out, "March")["tickets"]
+    with open(march, "a", encoding="utf-8") as f:
+        f.write(first_ticket)
+    with open(month_paths(out, "February")["calls"], encoding="utf-8") as f:
+        lines = f.readlines()
+    fields = lines[1].split(",")
+    fields[4] = "999999"  # customer_id
+    lines[1] = ",".join(fields)
+    with open(month_paths(out, "February")["calls"], "w", encoding="utf-8") as f:
+        f.writelines(lines)
+
+    found = counts(validator.validate(out, workers=1))
+    assert found[("tickets", "pk ticket_id duplicate across files")] == 1
+    assert found[("calls", "fk customer_id -> customers")] == 1
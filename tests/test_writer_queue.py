@@ -0,0 +1,32 @@
+import json
+import os
+
+import data_generator
+from sinks import AsyncSink, CsvMonthSink, month_paths
+
+
+def test_async_sink_reports_the_wrapped_sinks_timings(tmp_path):
+    paths = {t: p for t, p in month_paths(str(tmp_path), "January").items() if t in ("calls", "tickets")}
+    for p in paths.values():
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+    data_generator.apply_config(dict(data_generator.current_config(), **data_generator.scale_config(0.01)))
+    days = [(data_generator.START_DATE, 1)]
+    with AsyncSink(CsvMonthSink(paths), depth=2) as sink:
+        stats = data_generator.generate_days(sink, days)
+    assert stats[0]["format_seconds"] > 0
+    assert stats[0]["write_seconds"] > 0
+    assert "writer_queue_wait_seconds" in stats[0]
+    assert sink.timings["format"] == sink.day_timings[0][0]
+
+
+def test_run_report_has_format_time_with_writer_queue(tmp_path):
+    out = str(tmp_path / "out")
+    data_generator.main(["--tiny", "-o", out, "--start-date", "2025-01-01", "--end-date", "2025-01-05",
+                         "--tables", "calls,tickets", "--execution-mode", "thread", "--writer-queue", "2",
+                         "--progress-interval", "0"])
+    with open(os.path.join(out, "run_report.json"), encoding="utf-8") as f:
+        report = json.load(f)
+    totals = report["pools"]["generate_month_worker"]["totals"]
+    assert totals["format_seconds"] > 0
+    assert totals["write_seconds"] > 0
+    assert totals["writer_queue_wait_seconds"] >= 0
@@ -0,0 +1,349 @@
+"""
+Streaming referential-integrity and schema validator for a generated dataset.
+
+Checks, without a database:
+- primary keys: integer, unique and ascending, within every file and across the
+  month (and daily/) files of a table
+- foreign keys: calls -> customers, agents, queues, campaigns, wrap_codes, dispositions;
+  tickets / recordings / ivr_paths / call_events -> calls (and agents, ivr_menu_nodes)
+- types: every column of a file against its table in SQL Script/DDL Code.sql
+  (INT / BIGINT range, DATE / DATETIME / TIME format, VARCHAR(n) length, NOT NULL)
+
+Dimension ids go into byte-per-id arrays (bytearray); the call ids of all months go
+into one such array too, so memory stays at about one byte per call however many
+rows are read. Files are checked in parallel, one file per task: first the calls,
+then the tables that reference them.
+
+Reads csv, csv.gz / csv.zst and the "load" layout; parquet output is typed already
+and not read here.
+
+Usage:
+    python validator.py <out_dir> [--workers 8] [--json findings.json]
+"""
+import os
+import csv
+import sys
+import json
+from array import array
+from collections import Counter
+from datetime import date, datetime, time
+from concurrent.futures import ProcessPoolExecutor
+
+from bulk_load import FACT_TABLES as LOAD_TABLES, SOURCES, column_indexes, parse_ddl, source_files
+from sinks import COMPRESSIONS, DAILY_DIR, month_files, open_text
+
+# dimension file -> id column
+DIMENSIONS = {
+    "customers": "customer_id",
+    "agents": "agent_id",
+    "queues": "queue_id",
+    "campaigns": "campaign_id",
+    "wrap_codes": "wrap_code_id",
+    "dispositions": "disposition_id",
+    "ivr_menu_nodes": "node_id",
+}
+
+# fact table -> primary key and {column: referenced dimension or "calls"}
+FACT_CHECKS = {
+    "calls": ("call_id", {"customer_id": "customers", "agent_id": "agents", "queue_id": "queues",
+                          "campaign_id": "campaigns", "wrap_code_id": "wrap_codes",
+                          "disposition_id": "dispositions", "transferred_to_agent_id": "agents"}),
+    "tickets": ("ticket_id", {"call_id": "calls", "customer_id": "customers"}),
+    "recordings": ("recording_id", {"call_id": "calls"}),
+    "ivr_paths": ("path_id", {"call_id": "calls", "node_id": "ivr_menu_nodes"}),
+    "call_events": ("event_id", {"call_id": "calls", "agent_id": "agents",
+                                 "from_agent_id": "agents", "to_agent_id": "agents"}),
+}
+
+MAX_SAMPLES = 5  # offending rows kept per file and check
+INT_RANGE = {"INT": 2**31 - 1, "BIGINT": 2**63 - 1}
+
+# worker state, installed by _init_worker
+_indexes = {}
+_ddl = {}
+
+
+# -------------------------
+# Type checks from the DDL
+# -------------------------
+def _is_int(v, limit):
+    digits = v[1:] if v[:1] == "-" else v
+    return digits.isdigit() and abs(int(v)) <= limit
+
+
+def _parses(parse):
+    def check(v):
+        try:
+            parse(v)
+            return True
+        except ValueError:
+            return False
+    return check
+
+
+def _is_decimal(v):
+    try:
+        float(v)
+        return True
+    except ValueError:
+        return False
+
+
+def type_checker(sql_type):
+    """str -> bool for one DDL column type (non-empty values only)."""
+    base, _, size = sql_type.upper().partition("(")
+    if base in INT_RANGE:
+        limit = INT_RANGE[base]
+        return lambda v: _is_int(v, limit)
+    if base in ("DATETIME", "DATETIME2"):
+        return _parses(datetime.fromisoformat)
+    if base == "DATE":
+        return _parses(date.fromisoformat)
+    if base == "TIME":
+        return _parses(time.fromisoformat)
+    if base in ("DECIMAL", "NUMERIC", "FLOAT", "REAL"):
+        return _is_decimal
+    if base in ("VARCHAR", "NVARCHAR", "CHAR", "NCHAR") and size.rstrip(")") != "MAX":
+        n = int(size.rstrip(")"))
+        return lambda v: len(v) <= n
+    return None
+
+
+def column_checks(ddl_table, header):
+    """[(position, column, checker or None, not_null)] for the DDL columns of ddl_table found in header."""
+    if ddl_table not in _ddl:
+        return []
+    info = _ddl[ddl_table]
+    cols = [c for c, _ in info["columns"]]
+    idx = column_indexes(ddl_table, cols, header)
+    return [(i, c, type_checker(t), c in info["not_null"]) for i, (c, t) in zip(idx, info["columns"])]
+
+
+# -------------------------
+# Per-file check (worker)
+# -------------------------
+class Findings:
+    def __init__(self, table, path):
+        self.table = table
+        self.path = path
+        self.counts = Counter()
+        self.samples = {}
+
+    def add(self, check, line, value):
+        self.counts[check] += 1
+        s = self.samples.setdefault(check, [])
+        if len(s) < MAX_SAMPLES:
+            s.append({"line": line, "value": value})
+
+    def as_dict(self):
+        return {"table": self.table, "path": self.path, "counts": dict(self.counts), "samples": self.samples}
+
+
+def _init_worker(indexes, ddl):
+    _indexes.update(indexes)
+    _ddl.update(ddl)
+
+
+def check_file(task):
+    """Stream one file; returns findings plus the key range (and the keys when they are not a dense run)."""
+    table, path, ddl_table = task
+    pk, fks = FACT_CHECKS[table] if table in FACT_CHECKS else (DIMENSIONS[table], {})
+    found = Findings(table, path)
+    ids = array("q")
+    ascending = True
+    prev = None
+    with open_text(path) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            found.add("empty file", 1, "")
+            return {"findings": found.as_dict(), "rows": 0, "min": None, "max": None, "ascending": True}
+        lookup = {h.lower(): i for i, h in enumerate(header)}
+        pk_i = lookup[pk]
+        ncols = len(header)
+        fk_checks = [(lookup[c], f"fk {c} -> {ref}", _indexes[ref]) for c, ref in fks.items()
+                     if c in lookup and ref in _indexes]
+        checks = [(i, f"type {c}", check, f"null {c}", not_null)
+                  for i, c, check, not_null in column_checks(ddl_table, header) if check or not_null]
+        for line, row in enumerate(reader, 2):
+            if len(row) != ncols:
+                found.add("column count", line, len(row))
+                continue
+            v = row[pk_i]
+            if not v.isdigit():
+                found.add(f"pk {pk} not an integer", line, v)
+                continue
+            key = int(v)
+            if prev is not None and key <= prev:
+                ascending = False
+                found.add(f"pk {pk} not ascending", line, v)
+            prev = key
+            ids.append(key)
+            for i, check, index in fk_checks:
+                v = row[i]
+                if v and not (v.isdigit() and int(v) < len(index) and index[int(v)]):
+                    found.add(check, line, v)
+            for i, type_name, check, null_name, not_null in checks:
+                v = row[i]
+                if not v:
+                    if not_null:
+                        found.add(null_name, line, v)
+                elif check and not check(v):
+                    found.add(type_name, line, v)
+    result = {"rows": len(ids), "min": min(ids) if ids else None, "max": max(ids) if ids else None,
+              "ascending": ascending}
+    if not ascending:
+        ordered = sorted(ids)
+        dups = [a for a, b in zip(ordered, ordered[1:]) if a == b]
+        if dups:
+            found.counts[f"pk {pk} duplicate"] += len(dups)
+            found.samples[f"pk {pk} duplicate"] = [{"line": None, "value": d} for d in dups[:MAX_SAMPLES]]
+        ids = array("q", ordered)
+    # a dense ascending run is described by its range; anything else ships its keys
+    dense = ids and ascending and result["max"] - result["min"] + 1 == len(ids)
+    result["ids"] = None if dense else ids.tobytes()
+    result["findings"] = found.as_dict()
+    return result
+
+
+# -------------------------
+# Orchestration
+# -------------------------
+def index_of(results):
+    """Byte-per-id array (1 = id exists) from check_file results."""
+    top = max((r["max"] for r in results if r["max"] is not None), default=0)
+    index = bytearray(top + 1)
+    for r in results:
+        if r["ids"] is None:
+            if r["max"] is not None:
+                index[r["min"]:r["max"] + 1] = b"\x01" * (r["max"] - r["min"] + 1)
+        else:
+            for k in array("q", r["ids"]):
+                index[k] = 1
+    return index
+
+
+def fact_files(base_dir, table):
+    """Month files (any compression or the load layout) followed by daily/<date>/ files, in date order."""
+    if table in LOAD_TABLES:
+        files = source_files(base_dir, LOAD_TABLES[table])
+    else:
+        files = next((fs for fs in (month_files(base_dir, table, compression=c) for c in COMPRESSIONS) if fs), [])
+    daily = os.path.join(base_dir, DAILY_DIR)
+    if os.path.isdir(daily):
+        for day in sorted(os.listdir(daily)):
+            for ext in (".csv", ".csv.gz", ".csv.zst"):
+                path = os.path.join(daily, day, table + ext)
+                if os.path.exists(path):
+                    files.append(path)
+    return files
+
+
+def cross_file_findings(table, results):
+    """Key overlaps and ordering between the files of one table (each already checked on its own)."""
+    pk = FACT_CHECKS[table][0]
+    found = Findings(table, "(all files)")
+    ranges = [(r["min"], r["max"], r) for r in results if r["min"] is not None]
+    for (lo1, hi1, r1), (lo2, hi2, r2) in zip(ranges, ranges[1:]):
+        if lo2 <= hi1:
+            found.add(f"pk {pk} not ascending across files", None,
+                      f"{r1['findings']['path']} ends at {hi1}, {r2['findings']['path']} starts at {lo2}")
+    # keys shared by files whose ranges overlap
+    ranges.sort(key=lambda x: x[0])
+    for i, (lo1, hi1, r1) in enumerate(ranges):
+        for lo2, hi2, r2 in ranges[i + 1:]:
+            if lo2 > hi1:
+                break
+            shared = _keys(r1) & _keys(r2)
+            if shared:
+                found.counts[f"pk {pk} duplicate across files"] += len(shared)
+                found.samples.setdefault(f"pk {pk} duplicate across files", []).extend(
+                    {"line": None, "value": k} for k in sorted(shared)[:MAX_SAMPLES])
+    return found.as_dict()
+
+
+def _keys(result):
+    if result["ids"] is None:
+        return set(range(result["min"], result["max"] + 1))
+    return set(array("q", result["ids"]))
+
+
+def run_checks(tasks, indexes, ddl, workers):
+    if workers <= 1:
+        _init_worker(indexes, ddl)
+        return [check_file(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(indexes, ddl)) as executor:
+        return list(executor.map(check_file, tasks))
+
+
+def validate(base_dir, workers=os.cpu_count()):
+    """Validate the dataset under base_dir; returns a list of findings dicts (empty counts = clean)."""
+    ddl = parse_ddl()
+    ddl_of = {src[:-len(".csv")] if src.endswith(".csv") else src: table for table, src in SOURCES.items()}
+    findings = []
+
+    # dimensions: ids into byte arrays (small, checked in this process)
+    dim_tasks = [(name, os.path.join(base_dir, f"{name}.csv"), ddl_of.get(name)) for name in DIMENSIONS
+                 if os.path.exists(os.path.join(base_dir, f"{name}.csv"))]
+    missing = [n for n in DIMENSIONS if n not in {t[0] for t in dim_tasks}]
+    if missing:
+        print(f"[validate] no {', '.join(f'{n}.csv' for n in missing)}: foreign keys to them are not checked")
+    _init_worker({}, ddl)
+    indexes = {}
+    for task in dim_tasks:
+        res = check_file(task)
+        findings.append(res["findings"])
+        indexes[task[0]] = index_of([res])
+        print(f"[validate] {task[0]}: {res['rows']:,} rows")
+
+    # calls first: their keys are the index the other fact tables are checked against
+    for stage in (["calls"], [t for t in FACT_CHECKS if t != "calls"]):
+        tasks = [(t, path, LOAD_TABLES.get(t)) for t in stage for path in fact_files(base_dir, t)]
+        results = run_checks(tasks, indexes, ddl, workers)
+        for t in stage:
+            table_results = [r for task, r in zip(tasks, results) if task[0] == t]
+            if not table_results:
+                print(f"[validate] {t}: no files")
+                continue
+            findings.extend(r["findings"] for r in table_results)
+            findings.append(cross_file_findings(t, table_results))
+            print(f"[validate] {t}: {sum(r['rows'] for r in table_results):,} rows in {len(table_results)} files")
+            if t == "calls":
+                indexes["calls"] = index_of(table_results)
+    return findings
+
+
+def print_findings(findings):
+    total = Counter()
+    for f in findings:
+        for check, n in f["counts"].items():
+            total[(f["table"], check)] += n
+    if not total:
+        print("[validate] OK: no integrity or schema errors")
+        return 0
+    print(f"{'table':<14} {'check':<48} {'count':>12}")
+    for (table, check), n in sorted(total.items()):
+        print(f"{table:<14} {check:<48} {n:>12,}")
+    for f in findings:
+        for check, samples in f["samples"].items():
+            print(f"  {f['path']}: {check}: " + ", ".join(
+                repr(s["value"]) if s["line"] is None else f"line {s['line']}: {s['value']!r}" for s in samples))
+    return sum(total.values())
+
+
+def main(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(description="Validate keys, foreign keys and column types of a generated dataset.")
+    p.add_argument("out_dir")
+    p.add_argument("--workers", type=int, default=os.cpu_count())
+    p.add_argument("--json", metavar="PATH", help="also write the findings as JSON")
+    args = p.parse_args(argv)
+    findings = validate(args.out_dir, args.workers)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([f for f in findings if f["counts"]], f, indent=2)
+    return 1 if print_findings(findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())